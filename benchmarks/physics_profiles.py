@@ -0,0 +1,136 @@
+"""
+Time space.step for every physics profile in physics.PROFILES across world sizes, headless.
+Each world is the starting shaft three chunks wide and some chunk rows deep, with the pickaxe
+mining and a superchat of TNTs falling on it. Worlds are generated from a fixed seed.
+
+    python ./benchmarks/physics_profiles.py --frames 300 --rows 2 4 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pygame
+import chunk as world
+from atlas import create_texture_atlas
+from chunk import generate_chunk, generate_side_chunk
+from collision import register_collision_handlers
+from constants import BLOCK_SCALE_FACTOR, CHUNK_PIXEL_HEIGHT, FRAMERATE, INTERNAL_HEIGHT, INTERNAL_WIDTH
+from entities import EntityStore
+from hud import Hud
+from physics import PROFILES, create_space, add_walls
+from pickaxe import Pickaxe
+from sound import SoundManager
+from spawn_placement import SpawnPlacer
+from textures import TextureRegistry
+from tnt import Tnt, TntPool
+
+WORLD_SEED = 1
+WORLD_ROWS = (2, 4, 8)  # Chunk rows, three chunks wide
+TNTS = 10
+
+def load_textures():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    assets_dir = Path(__file__).parent.parent / "src/assets"
+    texture_atlas, atlas_items = create_texture_atlas(assets_dir, BLOCK_SCALE_FACTOR)
+    return TextureRegistry(texture_atlas, atlas_items)
+
+def run_world(profile_name, chunk_rows, textures, frames):
+    """
+    Step one world for frames frames.
+
+    :return: Dict with "step_ms" (mean), "max_step_ms", "reindex_ms" (one reindex of every static shape) and "shapes".
+    """
+    world.set_world_seed(WORLD_SEED)
+    random.seed(WORLD_SEED)  # Pickaxe jiggle and TNT sounds
+
+    space = create_space(profile_name)
+    register_collision_handlers(space)
+    add_walls(space, (chunk_rows + 1) * CHUNK_PIXEL_HEIGHT)
+
+    blocks = []
+    for chunk_y in range(chunk_rows):
+        for chunk_x in (-1, 0, 1):
+            if chunk_x == 0:
+                chunk = generate_chunk(chunk_x, chunk_y, textures, space)
+            else:
+                chunk = generate_side_chunk(chunk_x, chunk_y, textures, space)
+            blocks.extend(block for row in chunk for block in row if block is not None)
+
+    sound_manager = SoundManager()
+    hud = Hud(textures)
+    pickaxe = Pickaxe(space, INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2, textures, sound_manager)
+    tnt_store = EntityStore()
+    spawn_placer = SpawnPlacer(space, TntPool(space, textures, sound_manager, {Tnt: TNTS}), tnt_store)
+    for _ in range(TNTS):
+        spawn_placer.request(Tnt)
+    shapes = len(space.shapes)
+
+    step_total = 0.0
+    max_step = 0.0
+    for _ in range(frames):
+        spawn_placer.update(pickaxe.body.position.x, pickaxe.body.position.y - 100)
+
+        step_start = time.perf_counter()
+        space.step(1 / FRAMERATE)
+        step_time = time.perf_counter() - step_start
+        step_total += step_time
+        max_step = max(max_step, step_time)
+
+        # Mining goes on as in the game, so the broadphase sees blocks disappear
+        pickaxe.update()
+        for block in blocks:
+            if block.hp <= 0 and not block.destroyed:
+                block.update(space, hud)
+
+    reindex_start = time.perf_counter()
+    space.reindex_static()
+    reindex_time = time.perf_counter() - reindex_start
+
+    return {
+        "step_ms": round(step_total / frames * 1000, 3),
+        "max_step_ms": round(max_step * 1000, 3),
+        "reindex_ms": round(reindex_time * 1000, 3),
+        "shapes": shapes,
+    }
+
+def run(frames=300, world_rows=WORLD_ROWS, runs=3):
+    """
+    Time every profile on every world size, runs times each, taking turns.
+
+    :return: Dict of profile -> chunk rows -> result of the run with the lowest mean step time.
+    """
+    textures = load_textures()
+    results = {profile_name: {} for profile_name in PROFILES}
+    for _ in range(runs):
+        for chunk_rows in world_rows:
+            for profile_name in PROFILES:
+                result = run_world(profile_name, chunk_rows, textures, frames)
+                best = results[profile_name].get(chunk_rows)
+                if best is None or result["step_ms"] < best["step_ms"]:
+                    results[profile_name][chunk_rows] = result
+    return results
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Physics profile benchmark.")
+    arg_parser.add_argument("--frames", type=int, default=300)
+    arg_parser.add_argument("--rows", type=int, nargs="+", default=list(WORLD_ROWS), help="World sizes in chunk rows.")
+    arg_parser.add_argument("--runs", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    results = run(args.frames, args.rows, args.runs)
+    print(f"{'profile':<20}{'rows':>5}{'shapes':>8}{'step ms':>10}{'worst ms':>10}{'reindex ms':>12}")
+    for profile_name, by_rows in results.items():
+        for chunk_rows, result in by_rows.items():
+            print(f"{profile_name:<20}{chunk_rows:>5}{result['shapes']:>8}{result['step_ms']:>10.3f}"
+                  f"{result['max_step_ms']:>10.3f}{result['reindex_ms']:>12.3f}")
+
+if __name__ == "__main__":
+    main()
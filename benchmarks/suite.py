@@ -0,0 +1,304 @@
+"""
+Benchmark suite for catching performance regressions, headless with the SDL dummy drivers.
+
+    python ./benchmarks/suite.py run                      # Print the timings
+    python ./benchmarks/suite.py save --name laptop       # Store them as benchmarks/baselines/laptop.json
+    python ./benchmarks/suite.py compare --name laptop    # Flag cases slower than the baseline
+
+compare exits with 1 when a case is more than --threshold percent slower than its baseline.
+Baselines only compare on the machine that made them.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pygame
+import pymunk
+import chunk as world
+from atlas import create_texture_atlas
+from camera import Camera
+from chunk import chunks, generate_chunk, ensure_chunk, get_block
+from collision import register_collision_handlers
+from commands import CommandScheduler
+from constants import BLOCK_SCALE_FACTOR, CHUNK_HEIGHT, CHUNK_PIXEL_HEIGHT, CHUNK_WIDTH, FRAMERATE, INTERNAL_HEIGHT, INTERNAL_WIDTH
+from entities import EntityStore
+from hud import Hud, render_text_with_outline
+from physics import create_space, add_walls
+from pickaxe import Pickaxe
+from render_queue import RenderQueue
+from sound import SoundManager
+from spawn_placement import SpawnPlacer
+from textures import TextureRegistry, load_background
+from tnt import Tnt, TntPool
+from visibility import Visibility
+
+ASSETS_DIR = Path(__file__).parent.parent / "src/assets"
+BASELINES_DIR = Path(__file__).parent / "baselines"
+
+WORLD_SEED = 1
+EXPLODE_CHUNK_ROWS = 4  # Loaded chunks for tnt_explode: three columns of this many rows
+CHAT_MESSAGES = 200  # Messages per poll for chat_parsing
+
+# Case name -> (setup, calls per repeat). setup(textures) builds fresh state and returns the function to time.
+CASES = {}
+
+def case(name, number):
+    def register(setup):
+        CASES[name] = (setup, number)
+        return setup
+    return register
+
+def new_world():
+    """A space with the walls and an empty chunk store, the way the game starts."""
+    world.set_world_seed(WORLD_SEED)
+    world.origin_chunk_y = 0
+    chunks.clear()
+    space = create_space()
+    register_collision_handlers(space)
+    add_walls(space, 34 * CHUNK_PIXEL_HEIGHT)
+    return space
+
+@case("generate_chunk", 20)
+def setup_generate_chunk(textures):
+    space = new_world()
+    rows = iter(range(1, 1000))
+    return lambda: generate_chunk(0, next(rows), textures, space)
+
+@case("tnt_explode", 50)
+def setup_tnt_explode(textures):
+    space = new_world()
+    for chunk_y in range(EXPLODE_CHUNK_ROWS):
+        for chunk_x in (-1, 0, 1):
+            ensure_chunk(chunk_x, chunk_y, textures, space)
+
+    tnt = TntPool(space, textures, SoundManager(), {Tnt: 1}).spawn(Tnt, INTERNAL_WIDTH // 2, CHUNK_PIXEL_HEIGHT * 1.5)
+    explosions = EntityStore()
+
+    def explode():
+        tnt.explode(explosions)
+        explosions.remove(next(iter(explosions)).entity_id)
+        explosions.flush()
+    return explode
+
+@case("hud_draw", 200)
+def setup_hud_draw(textures):
+    hud = Hud(textures)
+    render_queue = RenderQueue()
+    depth = iter(range(0, 10 ** 9, 20))  # About how far the pickaxe falls per frame
+
+    def draw():
+        hud.draw(render_queue, next(depth), True, "Fast")
+        for items in render_queue.layers.values():
+            items.clear()
+    return draw
+
+@case("render_text_with_outline", 200)
+def setup_render_text_with_outline(textures):
+    font = pygame.font.Font(None, 48)
+    return lambda: render_text_with_outline("Y: -1234", font, (255, 255, 255), (0, 0, 0))
+
+@case("create_texture_atlas", 3)
+def setup_create_texture_atlas(textures):
+    return lambda: create_texture_atlas(ASSETS_DIR, BLOCK_SCALE_FACTOR)
+
+@case("full_frame", 60)
+def setup_full_frame(textures):
+    """
+    One frame the way main.game() runs it without chat: physics, pickaxe, camera, chunks and blocks,
+    TNTs, particles, HUD, then the batched blits and the scale to the window. Starts with a burst of TNTs.
+    """
+    space = new_world()
+    sound_manager = SoundManager()
+    pickaxe = Pickaxe(space, INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2, textures, sound_manager)
+    tnt_store = EntityStore()
+    spawn_placer = SpawnPlacer(space, TntPool(space, textures, sound_manager, {Tnt: 10}), tnt_store)
+    for _ in range(10):
+        spawn_placer.request(Tnt)
+    explosions = EntityStore()
+    camera = Camera()
+    hud = Hud(textures)
+    visibility = Visibility()
+    render_queue = RenderQueue()
+    internal_surface = pygame.Surface((INTERNAL_WIDTH, INTERNAL_HEIGHT))
+    window = pygame.Surface((INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2))
+    background_image = load_background(ASSETS_DIR)
+    background_width, background_height = background_image.get_size()
+
+    def frame():
+        space.step(1 / FRAMERATE)
+        pickaxe.update()
+        camera.update(pickaxe.body.position.y)
+        visibility.update(camera)
+        start_chunk_y, end_chunk_y = visibility.chunk_range()
+
+        internal_surface.blit(background_image, ((INTERNAL_WIDTH - background_width) // 2, (INTERNAL_HEIGHT - background_height) // 2))
+
+        for tnt in tnt_store:
+            tnt.update(tnt_store, explosions, camera)
+        tnt_store.flush()
+        spawn_placer.update(pickaxe.body.position.x, pickaxe.body.position.y - 100)
+
+        for chunk_x in range(-1, 2):
+            for chunk_y in range(start_chunk_y, end_chunk_y):
+                visible_rows = visibility.visible_rows(chunk_x, chunk_y)
+                for y in range(CHUNK_HEIGHT):
+                    visible = y in visible_rows
+                    for x in range(CHUNK_WIDTH):
+                        block = get_block(chunk_x, chunk_y, x, y, textures, space)
+                        if block is None:
+                            continue
+                        block.update(space, hud)
+                        if not block.destroyed and visible:
+                            block.draw(render_queue, camera)
+
+        pickaxe.draw(render_queue, camera)
+        for tnt in tnt_store:
+            if visibility.circle_visible("tnt", tnt.body.position.x, tnt.body.position.y, tnt.cull_radius):
+                tnt.draw(render_queue, camera)
+        for explosion in explosions:
+            explosion.update()
+            explosion.draw(render_queue, camera, visibility)
+            if not explosion.particles:
+                explosions.remove(explosion.entity_id)
+        explosions.flush()
+
+        hud.draw(render_queue, pickaxe.body.position.y, False, None)
+        render_queue.flush(internal_surface)
+        window.blit(pygame.transform.smoothscale(internal_surface, window.get_size()), (0, 0))
+    return frame
+
+@case("chat_parsing", 20)
+def setup_chat_parsing(textures):
+    """What handle_youtube_poll does with one poll worth of messages."""
+    texts = ["tnt", "fast", "slow", "big", "diamond pls", "hello everyone", "TNT TNT", "netherite", "gg", "iron"]
+    messages = [{
+        "timestamp": "2025-03-01 12:00:00",
+        "author": f"viewer{i}",
+        "message": texts[i % len(texts)],
+        "sc_details": {"amountDisplayString": "$5.00"} if i % 50 == 0 else None,
+        "ss_details": None,
+        "is_member": i % 7 == 0,
+    } for i in range(CHAT_MESSAGES)]
+
+    def poll():
+        command_scheduler = CommandScheduler(5)
+        for message in messages:
+            command_scheduler.submit_message(message)
+    return poll
+
+def measure(setup, textures, number, repeat):
+    """Milliseconds per call, the best of repeat runs of number calls each. The garbage collector is off while timing, like timeit."""
+    best = None
+    for _ in range(repeat):
+        function = setup(textures)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            per_call = (time.perf_counter() - start) / number
+        finally:
+            gc.enable()
+        best = per_call if best is None else min(best, per_call)
+    return best * 1000
+
+def run(case_names=None, repeat=5):
+    """
+    Time every case, or only case_names.
+
+    :return: Dict with "environment" and "cases": case name -> {"ms": milliseconds per call}.
+    """
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    texture_atlas, atlas_items = create_texture_atlas(ASSETS_DIR, BLOCK_SCALE_FACTOR)
+    textures = TextureRegistry(texture_atlas, atlas_items)
+
+    results = {}
+    # The game prints on every spawn and chat command, that is not what is being measured
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name, (setup, number) in CASES.items():
+            if case_names and name not in case_names:
+                continue
+            results[name] = {"ms": round(measure(setup, textures, number, repeat), 4)}
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "pymunk": pymunk.version,
+            "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "cases": results,
+    }
+
+def compare(current, baseline, threshold):
+    """
+    :return: List of (case name, baseline ms, current ms, change in percent, regressed), for cases in both.
+    """
+    rows = []
+    for name, result in current["cases"].items():
+        if name not in baseline["cases"]:
+            continue
+        baseline_ms = baseline["cases"][name]["ms"]
+        change = (result["ms"] - baseline_ms) / baseline_ms * 100 if baseline_ms else 0.0
+        rows.append((name, baseline_ms, result["ms"], change, change > threshold))
+    return rows
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Performance regression benchmarks.")
+    arg_parser.add_argument("command", choices=("run", "save", "compare"))
+    arg_parser.add_argument("--name", default="baseline", help="Baseline file in benchmarks/baselines, without .json.")
+    arg_parser.add_argument("--threshold", type=float, default=20.0, help="Percent slower that counts as a regression.")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--cases", nargs="+", choices=list(CASES), help="Only run these cases.")
+    args = arg_parser.parse_args()
+
+    baseline_path = BASELINES_DIR / f"{args.name}.json"
+    baseline = None
+    if args.command == "compare":
+        if not baseline_path.exists():
+            print(f"No baseline at {baseline_path}, create it with: python ./benchmarks/suite.py save --name {args.name}")
+            sys.exit(2)
+        with open(baseline_path, "r") as f:
+            baseline = json.load(f)
+
+    current = run(args.cases, args.repeat)
+
+    if args.command == "run":
+        for name, result in current["cases"].items():
+            print(f"{name:<26}{result['ms']:>10.3f} ms")
+
+    elif args.command == "save":
+        os.makedirs(BASELINES_DIR, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(current, f, indent=4)
+        for name, result in current["cases"].items():
+            print(f"{name:<26}{result['ms']:>10.3f} ms")
+        print(f"Saved baseline to {baseline_path}")
+
+    else:
+        rows = compare(current, baseline, args.threshold)
+        print(f"{'case':<26}{'baseline ms':>12}{'now ms':>10}{'change':>9}")
+        for name, baseline_ms, current_ms, change, regressed in rows:
+            print(f"{name:<26}{baseline_ms:>12.3f}{current_ms:>10.3f}{change:>+8.1f}%" + ("  REGRESSION" if regressed else ""))
+
+        regressions = [row for row in rows if row[4]]
+        if regressions:
+            print(f"{len(regressions)} case(s) more than {args.threshold:g}% slower than {baseline_path.name}")
+            sys.exit(1)
+        print(f"No case more than {args.threshold:g}% slower than {baseline_path.name}")
+
+if __name__ == "__main__":
+    main()
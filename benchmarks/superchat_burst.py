@@ -0,0 +1,126 @@
+"""
+Draw a superchat burst scene (a screen of blocks, 10 named TNTs, 3 explosions and the HUD) headless,
+once with one blit per sprite and once through the batched RenderQueue.
+
+    python ./benchmarks/superchat_burst.py --frames 300
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pygame
+import pymunk
+from atlas import create_texture_atlas
+from camera import Camera
+from chunk import generate_chunk
+from constants import BLOCK_SCALE_FACTOR, CHUNK_HEIGHT, BLOCK_SIZE, INTERNAL_HEIGHT, INTERNAL_WIDTH
+from explosion import Explosion
+from hud import Hud
+from pickaxe import Pickaxe
+from render_queue import RenderQueue, LAYERS
+from sound import SoundManager
+from textures import TextureRegistry
+from tnt import Tnt, TntPool
+from visibility import Visibility
+
+def build_scene():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    assets_dir = Path(__file__).parent.parent / "src/assets"
+    texture_atlas, atlas_items = create_texture_atlas(assets_dir, BLOCK_SCALE_FACTOR)
+    textures = TextureRegistry(texture_atlas, atlas_items)
+
+    space = pymunk.Space()
+    sound_manager = SoundManager()
+    camera = Camera()
+    camera.offset_y = CHUNK_HEIGHT * BLOCK_SIZE + BLOCK_SIZE // 2  # Two chunks partly on screen
+
+    blocks = []
+    for chunk_y in (1, 2):
+        for row in generate_chunk(0, chunk_y, textures, space):
+            blocks.extend(row)
+    for block in blocks[::3]:
+        block.hp = block.max_hp // 2  # Every third block shows a destroy stage
+
+    center_x = INTERNAL_WIDTH // 2
+    center_y = camera.offset_y + INTERNAL_HEIGHT // 2
+    pickaxe = Pickaxe(space, center_x, center_y, textures, sound_manager)
+    tnt_pool = TntPool(space, textures, sound_manager, {Tnt: 10})
+    tnts = [tnt_pool.spawn(Tnt, center_x + (i % 5 - 2) * 150, center_y - 300 - (i // 5) * 150, owner_name="Superchatter")
+            for i in range(10)]
+    explosions = [Explosion(pygame.Vector2(center_x + dx, center_y + 200), textures, particle_count=20) for dx in (-250, 0, 250)]
+    hud = Hud(textures)
+
+    return blocks, pickaxe, tnts, explosions, hud, camera
+
+def one_by_one(render_queue, target):
+    """Blit the queued sprites with one call each, the way the draw methods used to."""
+    for layer in LAYERS:
+        items = render_queue.layers[layer]
+        for surface, position in items:
+            target.blit(surface, position)
+        items.clear()
+
+def run(frames=300):
+    """
+    Time both ways of drawing the scene.
+
+    :return: Dict of mode -> {"frame_ms", "flush_ms", "blits"}, times averaged per frame.
+    """
+    blocks, pickaxe, tnts, explosions, hud, camera = build_scene()
+    target = pygame.Surface((INTERNAL_WIDTH, INTERNAL_HEIGHT))
+    visibility = Visibility()
+    render_queue = RenderQueue()
+
+    # Modes take turns every frame so machine noise hits both alike
+    totals = {mode: {"frame": 0.0, "flush": 0.0, "blits": 0} for mode in ("one_by_one", "batched")}
+    for _ in range(frames):
+        for mode, total in totals.items():
+            frame_start = time.perf_counter()
+            visibility.update(camera)
+            for block in blocks:
+                if visibility.rect_visible("block", block.body.position.x - BLOCK_SIZE // 2, block.body.position.y - BLOCK_SIZE // 2, BLOCK_SIZE, BLOCK_SIZE):
+                    block.draw(render_queue, camera)
+            pickaxe.draw(render_queue, camera)
+            for tnt in tnts:
+                tnt.draw(render_queue, camera)
+            for explosion in explosions:
+                explosion.draw(render_queue, camera, visibility)
+            hud.draw(render_queue, pickaxe.body.position.y, False, None)
+            total["blits"] = sum(len(items) for items in render_queue.layers.values())
+
+            flush_start = time.perf_counter()
+            if mode == "batched":
+                render_queue.flush(target)
+            else:
+                one_by_one(render_queue, target)
+            frame_end = time.perf_counter()
+
+            total["frame"] += frame_end - frame_start
+            total["flush"] += frame_end - flush_start
+
+    results = {}
+    for mode, total in totals.items():
+        results[mode] = {
+            "frame_ms": round(total["frame"] / frames * 1000, 3),
+            "flush_ms": round(total["flush"] / frames * 1000, 3),
+            "blits": total["blits"],
+        }
+    return results
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Superchat burst draw benchmark.")
+    arg_parser.add_argument("--frames", type=int, default=300)
+    args = arg_parser.parse_args()
+
+    for mode, result in run(args.frames).items():
+        print(f"{mode:<11} frame {result['frame_ms']:>7.3f} ms   blitting {result['flush_ms']:>7.3f} ms   {result['blits']} sprites")
+
+if __name__ == "__main__":
+    main()
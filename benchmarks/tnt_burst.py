@@ -0,0 +1,112 @@
+"""
+Step the physics after a 50 TNT burst headless, once with every TNT spawned on the same point
+(how spawns used to work) and once placed by the SpawnPlacer.
+
+    python ./benchmarks/tnt_burst.py --tnts 50 --frames 120
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pygame
+from atlas import create_texture_atlas
+from chunk import generate_chunk
+from collision import register_collision_handlers
+from physics import create_space, add_walls
+from constants import BLOCK_SCALE_FACTOR, CHUNK_PIXEL_HEIGHT, FRAMERATE, INTERNAL_HEIGHT, INTERNAL_WIDTH
+from entities import EntityStore
+from pickaxe import Pickaxe
+from sound import SoundManager
+from spawn_placement import SpawnPlacer
+from textures import TextureRegistry
+from tnt import Tnt, TntPool
+
+def load_textures():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    assets_dir = Path(__file__).parent.parent / "src/assets"
+    texture_atlas, atlas_items = create_texture_atlas(assets_dir, BLOCK_SCALE_FACTOR)
+    return TextureRegistry(texture_atlas, atlas_items)
+
+def run_burst(mode, textures, tnts, frames):
+    """
+    Spawn tnts TNTs above the pickaxe in the starting shaft and step the space for frames frames.
+
+    :return: Dict with "step_ms" (mean), "max_step_ms", "max_speed" (fastest TNT seen, px/s) and "spawned" (TNTs in the world at the end).
+    """
+    space = create_space()
+    register_collision_handlers(space)
+    add_walls(space, 2 * CHUNK_PIXEL_HEIGHT)
+    for chunk_y in (0, 1):
+        generate_chunk(0, chunk_y, textures, space)
+
+    sound_manager = SoundManager()
+    pickaxe = Pickaxe(space, INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2, textures, sound_manager)
+    tnt_store = EntityStore()
+    tnt_pool = TntPool(space, textures, sound_manager, {Tnt: tnts})
+    spawn_placer = SpawnPlacer(space, tnt_pool, tnt_store)
+
+    spawn_x, spawn_y = pickaxe.body.position.x, pickaxe.body.position.y - 100
+    for _ in range(tnts):
+        if mode == "stacked":
+            tnt_store.add(tnt_pool.spawn(Tnt, spawn_x, spawn_y))
+        else:
+            spawn_placer.request(Tnt)
+
+    step_total = 0.0
+    max_step = 0.0
+    max_speed = 0.0
+    for _ in range(frames):
+        spawn_placer.update(spawn_x, spawn_y)
+
+        step_start = time.perf_counter()
+        space.step(1 / FRAMERATE)
+        step_time = time.perf_counter() - step_start
+        step_total += step_time
+        max_step = max(max_step, step_time)
+
+        for tnt in tnt_store:
+            max_speed = max(max_speed, tnt.body.velocity.length)
+        tnt_store.flush()
+
+    return {
+        "step_ms": round(step_total / frames * 1000, 3),
+        "max_step_ms": round(max_step * 1000, 3),
+        "max_speed": round(max_speed),
+        "spawned": len(tnt_store),
+    }
+
+def run(tnts=50, frames=120, runs=3):
+    """
+    Time both spawn modes, runs times each, taking turns.
+
+    :return: Dict of mode -> result of the run with the lowest mean step time.
+    """
+    textures = load_textures()
+    results = {}
+    for _ in range(runs):
+        for mode in ("stacked", "placed"):
+            result = run_burst(mode, textures, tnts, frames)
+            if mode not in results or result["step_ms"] < results[mode]["step_ms"]:
+                results[mode] = result
+    return results
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="TNT burst physics benchmark.")
+    arg_parser.add_argument("--tnts", type=int, default=50)
+    arg_parser.add_argument("--frames", type=int, default=120)
+    arg_parser.add_argument("--runs", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    for mode, result in run(args.tnts, args.frames, args.runs).items():
+        print(f"{mode:<8} step {result['step_ms']:>7.3f} ms   worst {result['max_step_ms']:>7.3f} ms   "
+              f"fastest TNT {result['max_speed']:>6} px/s   {result['spawned']} TNTs spawned")
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,80 @@
 import os
 import pygame
 
-def create_texture_atlas(asset_path):
-    categories = ['block', 'item', 'destroy_stage', 'particle', "pickaxe"]
-    textures = {category: {} for category in categories}
+CATEGORIES = ['block', 'item', 'destroy_stage', 'particle', "pickaxe"]
+
+def shelf_pack(sizes, min_width=512):
+    """
+    Pack rectangles into rows ("shelves"), tallest first.
+
+    :param sizes: List of (width, height).
+    :param min_width: Smallest atlas width to use.
+    :return: (positions, atlas_width, atlas_height), positions in the same order as sizes.
+    """
+    if not sizes:
+        return [], min_width, 0
+
+    # Roughly square atlas: a power of two wide enough for the total area and the widest image
+    total_area = sum(w * h for w, h in sizes)
+    atlas_width = max(min_width, max(w for w, h in sizes))
+    while atlas_width * atlas_width < total_area:
+        atlas_width *= 2
+
+    order = sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True)
+    positions = [None] * len(sizes)
+
+    x_offset, y_offset, shelf_height = 0, 0, 0
+    for i in order:
+        width, height = sizes[i]
+
+        # Start a new shelf when the current one is full
+        if x_offset + width > atlas_width:
+            x_offset = 0
+            y_offset += shelf_height
+            shelf_height = 0
+
+        positions[i] = (x_offset, y_offset)
+        x_offset += width
+        shelf_height = max(shelf_height, height)
+
+    return positions, atlas_width, y_offset + shelf_height
+
+def create_texture_atlas(asset_path, scale=1):
+    """
+    Load every texture, scale it and pack it into one surface.
+
+    :param asset_path: Folder with one sub folder per category.
+    :param scale: Scale applied to every texture before packing.
+    :return: (atlas_surface, textures) where textures[category][name] = (x, y, w, h)
+    """
+    textures = {category: {} for category in CATEGORIES}
     images = []
-    positions = {}
-    atlas_width = 512
+    names = []
 
-    # Load images and track dimensions
-    x_offset, y_offset, row_height = 0, 0, 0
-    for category in categories:
+    for category in CATEGORIES:
         folder_path = os.path.join(asset_path, category)
         if not os.path.exists(folder_path):
             print("Folder not found: ", folder_path)
             continue
-        
+
         for filename in sorted(os.listdir(folder_path)):
             if filename.endswith(".png"):
                 img_path = os.path.join(folder_path, filename)
                 image = pygame.image.load(img_path).convert_alpha()
-                img_width, img_height = image.get_size()
-                
-                # Wrap to new row if necessary
-                if x_offset + img_width > atlas_width:  # Max texture width
-                    x_offset = 0
-                    y_offset += row_height
-                    row_height = 0
-                
-                # Store texture coordinates
-                texture_name = filename.rsplit(".", 1)[0]
-                textures[category][texture_name] = (x_offset, y_offset, img_width, img_height)
-                
-                images.append((image, (x_offset, y_offset)))
-                
-                x_offset += img_width
-                row_height = max(row_height, img_height)
-    
-    # Determine atlas size
-    atlas_height = y_offset + row_height
+
+                if scale != 1:
+                    img_width, img_height = image.get_size()
+                    image = pygame.transform.scale(image, (round(img_width * scale), round(img_height * scale)))
+
+                images.append(image)
+                names.append((category, filename.rsplit(".", 1)[0]))
+
+    positions, atlas_width, atlas_height = shelf_pack([image.get_size() for image in images])
     atlas_surface = pygame.Surface((atlas_width, atlas_height), pygame.SRCALPHA)
-    
-    # Blit images onto atlas
-    for image, pos in images:
+
+    # Blit images onto atlas and store texture coordinates
+    for image, (category, texture_name), pos in zip(images, names, positions):
         atlas_surface.blit(image, pos)
-    
+        textures[category][texture_name] = (pos[0], pos[1], image.get_width(), image.get_height())
+
     return atlas_surface, textures
@@ -1,10 +1,12 @@
 import pygame
 import pymunk
 from constants import BLOCK_SIZE
+from stats import stats
+from collision import BLOCK
 import random 
 
 class Block:
-    def __init__(self, space, x, y, name, texture_atlas, atlas_items):
+    def __init__(self, space, x, y, name, textures):
         if name == "bedrock":
             self.max_hp = 1000000000
             self.hp = 1000000000
@@ -57,11 +59,8 @@ class Block:
             self.hp = 1
             self.max_hp = 1
 
-        self.texture_atlas = texture_atlas
-        self.atlas_items = atlas_items
-
-        rect = atlas_items["block"][name]  
-        self.texture = texture_atlas.subsurface(rect)
+        self.texture = textures.get("block", name)
+        self.destroy_stages = textures.destroy_stages
 
         width, height = self.texture.get_size()
 
@@ -72,7 +71,7 @@ class Block:
         # Create a hitbox
         self.shape = pymunk.Poly.create_box(self.body, (width, height))
         self.shape.elasticity = 1  # No bounce
-        self.shape.collision_type = 2 # Identifier for collisions
+        self.shape.collision_type = BLOCK # Identifier for collisions
         self.shape.friction = 1
         self.shape.block_ref = self  # Reference to the block object
 
@@ -111,6 +110,7 @@ class Block:
         if self.hp <= 0 and not self.destroyed:
             self.destroyed = True
             space.remove(self.body, self.shape)  # Remove from physics world
+            stats.blocks_broken += 1
 
             if self.name == "coal_ore":
                 hud.amounts["coal"] += 1  # Add to HUD amounts
@@ -129,7 +129,7 @@ class Block:
             elif self.name == "lapis_ore":
                 hud.amounts["lapis_lazuli"] += random.randint(4, 8)  # Add to HUD amounts
 
-    def draw(self, screen, camera):
+    def draw(self, render_queue, camera):
         """Draw block at its position"""
 
         if(self.destroyed):
@@ -138,15 +138,16 @@ class Block:
         block_x = self.body.position.x - camera.offset_x - BLOCK_SIZE // 2
         block_y = self.body.position.y - camera.offset_y - BLOCK_SIZE // 2
 
-        screen.blit(self.texture, (block_x, block_y))
-
-        # Determine the destroy stage (0-9) based on hp percentage
-        if self.hp < self.max_hp:
-            damage_stage = int((1 - (self.hp / self.max_hp)) * 9)  # Scale hp to 0-9 range
-            damage_stage = min(damage_stage, 9)  # Ensure it doesn't exceed stage_9
-            
-            # Draw the destroy stage overlay
-            destroy_texture = self.texture_atlas.subsurface(
-                self.atlas_items["destroy_stage"][f"destroy_stage_{damage_stage}"]
-            )
-            screen.blit(destroy_texture, (block_x, block_y))
\ No newline at end of file
+        render_queue.push("terrain", self.texture, (block_x, block_y))
+
+        # Draw the destroy stage overlay
+        damage_stage = self.damage_stage()
+        if damage_stage >= 0:
+            render_queue.push("damage", self.destroy_stages[damage_stage], (block_x, block_y))
+
+    def damage_stage(self):
+        """Destroy stage (0-9) based on hp percentage, -1 when undamaged"""
+        if self.hp >= self.max_hp:
+            return -1
+        damage_stage = int((1 - (self.hp / self.max_hp)) * 9)  # Scale hp to 0-9 range
+        return min(damage_stage, 9)  # Ensure it doesn't exceed stage_9
\ No newline at end of file
@@ -1,6 +1,6 @@
 import pygame
 import random
-from constants import INTERNAL_HEIGHT
+from constants import INTERNAL_WIDTH, INTERNAL_HEIGHT
 
 class Camera:
     def __init__(self):
@@ -16,6 +16,11 @@ class Camera:
         self.bias_x = bias_x
         self.bias_y = bias_y
 
+    def visible_rect(self):
+        """The part of the world drawn on the internal surface this frame."""
+        # Offsets are fractional, a pixel off at the edges makes no visible difference
+        return pygame.Rect(int(self.offset_x), int(self.offset_y), INTERNAL_WIDTH, INTERNAL_HEIGHT)
+
     def update(self, target_y, smoothing=0.1):
         """Smoothly follow the target's y position (e.g., pickaxe)"""
         desired_offset = target_y - INTERNAL_HEIGHT // 2
@@ -0,0 +1,122 @@
+import re
+import time
+from datetime import datetime
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Line formats written by youtube.get_new_live_chat_messages
+SUPER_CHAT_LINE = re.compile(r"^\[(?P<timestamp>[^\]]+)\] Super Chat from (?P<author>.*) \((?P<amount>[^()]*)\): (?P<message>.*)$")
+SUPER_STICKER_LINE = re.compile(r"^\[(?P<timestamp>[^\]]+)\] Super Sticker from (?P<author>.*) \(Tier (?P<tier>[^,()]*), (?P<amount>[^()]*)\): (?P<message>.*)$")
+MESSAGE_LINE = re.compile(r"^\[(?P<timestamp>[^\]]+)\] (?P<author>.*?): (?P<message>.*)$")
+
+class ChatSource:
+    """Something that produces chat messages in the format of youtube.get_new_live_chat_messages."""
+
+    poll_interval = 15  # Seconds between polls
+
+    def get_new_messages(self):
+        return []
+
+class YoutubeChatSource(ChatSource):
+    def __init__(self, live_chat_id, poll_interval):
+        self.live_chat_id = live_chat_id
+        self.poll_interval = poll_interval
+
+    def get_new_messages(self):
+        from youtube import get_new_live_chat_messages
+        return get_new_live_chat_messages(self.live_chat_id)
+
+def parse_chat_log_line(line):
+    """
+    Parse one line of a logs/chat_YYYY-MM-DD.txt file.
+
+    :return: Message dict, or None if the line is not a chat message.
+    """
+    line = line.rstrip("\r\n")
+
+    match = SUPER_CHAT_LINE.match(line)
+    if match:
+        sc_details = {"amountDisplayString": match["amount"]}
+        ss_details = None
+    else:
+        match = SUPER_STICKER_LINE.match(line)
+        if match:
+            sc_details = None
+            ss_details = {"amountDisplayString": match["amount"], "tier": match["tier"]}
+        else:
+            match = MESSAGE_LINE.match(line)
+            if not match:
+                return None
+            sc_details = None
+            ss_details = None
+
+    try:
+        datetime.strptime(match["timestamp"], TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+    return {
+        "timestamp": match["timestamp"],
+        "author": match["author"],
+        "message": match["message"],
+        "sc_details": sc_details,
+        "ss_details": ss_details,
+        "is_member": False,  # Not recorded in the log
+    }
+
+def load_chat_log(path):
+    """Read all messages from a chat log, sorted by timestamp."""
+    messages = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            message = parse_chat_log_line(line)
+            if message is not None:
+                messages.append(message)
+
+    # Polls can write slightly out of order, sort() is stable for equal timestamps
+    messages.sort(key=lambda message: message["timestamp"])
+    return messages
+
+class ReplayChatSource(ChatSource):
+    poll_interval = 0.1
+
+    def __init__(self, path, speed=1.0):
+        """
+        Replays a recorded chat log as if it was live chat.
+
+        :param path: Path to a logs/chat_YYYY-MM-DD.txt file.
+        :param speed: Playback speed, 10 replays ten minutes of chat per minute.
+        """
+        self.messages = load_chat_log(path)
+        self.speed = speed
+        self.position = 0
+        self.start_time = None
+        self.finished = False
+
+        if self.messages:
+            self.first_timestamp = datetime.strptime(self.messages[0]["timestamp"], TIMESTAMP_FORMAT)
+            self.offsets = [(datetime.strptime(message["timestamp"], TIMESTAMP_FORMAT) - self.first_timestamp).total_seconds()
+                            for message in self.messages]
+            duration = self.offsets[-1] / speed
+        else:
+            self.offsets = []
+            duration = 0
+
+        print(f"Loaded {len(self.messages)} chat messages from {path} ({duration:.0f}s at {speed}x)")
+
+    def get_new_messages(self):
+        """Messages whose (scaled) time has come since the previous call."""
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+
+        replay_time = (time.monotonic() - self.start_time) * self.speed
+
+        start = self.position
+        while self.position < len(self.messages) and self.offsets[self.position] <= replay_time:
+            self.position += 1
+
+        if self.position >= len(self.messages) and not self.finished:
+            self.finished = True
+            print("Chat replay finished")
+
+        return self.messages[start:self.position]
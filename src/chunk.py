@@ -1,7 +1,7 @@
 import pygame
 import random
 from block import Block
-from constants import BLOCK_SIZE, CHUNK_HEIGHT, CHUNK_WIDTH, SEED
+from constants import BLOCK_SIZE, CHUNK_HEIGHT, CHUNK_PIXEL_HEIGHT, CHUNK_WIDTH, SEED
 
 def generate_noise_ranges(block_weights):
     """
@@ -59,51 +59,74 @@ block_weights = {
 # Generate noise ranges
 noise_ranges = generate_noise_ranges(block_weights)
 
-def generate_first_chunk(texture_atlas, atlas_items, space): 
+# Seed of the current world. Chunks are generated from it, so a saved world can be generated again.
+world_seed = random.randrange(2 ** 63)
+
+# Saved block changes (chunk -> list of (index, destroyed, hp)) applied when the chunk is generated again
+pending_deltas = {}
+
+# World chunk row at local chunk row 0. Positions, chunk keys and the camera are local, they move back
+# toward zero whenever the origin is rebased (see origin.py). Seeds and saved deltas use world rows.
+origin_chunk_y = 0
+
+def set_world_seed(seed):
+    global world_seed
+    world_seed = seed
+
+def world_chunk_y(chunk_y):
+    """World chunk row of a local chunk row."""
+    return chunk_y + origin_chunk_y
+
+def chunk_random(chunk_x, chunk_y):
+    """Random generator for one chunk, the same for every run with the same world seed."""
+    return random.Random(f"{world_seed}:{chunk_x}:{chunk_y}")
+
+def generate_first_chunk(chunk_y, textures, space): 
     chunk = []
     for y in range(CHUNK_HEIGHT):
         row = []
         for x in range(CHUNK_WIDTH):
             if(x == 0 or x == CHUNK_WIDTH - 1):
                 block_x = (0 * CHUNK_WIDTH + x) * BLOCK_SIZE
-                block_y = (0 * CHUNK_HEIGHT + y) * BLOCK_SIZE
-                row.append(Block(space, block_x, block_y, "bedrock", texture_atlas, atlas_items))
+                block_y = (chunk_y * CHUNK_HEIGHT + y) * BLOCK_SIZE
+                row.append(Block(space, block_x, block_y, "bedrock", textures))
                 continue
             elif y == 0:
                 block_x = (0 * CHUNK_WIDTH + x) * BLOCK_SIZE
-                block_y = (0 * CHUNK_HEIGHT + y) * BLOCK_SIZE
-                row.append(Block(space, block_x, block_y, "bedrock", texture_atlas, atlas_items))
+                block_y = (chunk_y * CHUNK_HEIGHT + y) * BLOCK_SIZE
+                row.append(Block(space, block_x, block_y, "bedrock", textures))
                 continue
             elif y == CHUNK_HEIGHT - 2:
                 block_x = (0 * CHUNK_WIDTH + x) * BLOCK_SIZE
-                block_y = (0 * CHUNK_HEIGHT + y) * BLOCK_SIZE
-                row.append(Block(space, block_x, block_y, "grass_block", texture_atlas, atlas_items))
+                block_y = (chunk_y * CHUNK_HEIGHT + y) * BLOCK_SIZE
+                row.append(Block(space, block_x, block_y, "grass_block", textures))
                 continue
             elif y == CHUNK_HEIGHT - 1:
                 block_x = (0 * CHUNK_WIDTH + x) * BLOCK_SIZE
-                block_y = (0 * CHUNK_HEIGHT + y) * BLOCK_SIZE
-                row.append(Block(space, block_x, block_y, "dirt", texture_atlas, atlas_items))
+                block_y = (chunk_y * CHUNK_HEIGHT + y) * BLOCK_SIZE
+                row.append(Block(space, block_x, block_y, "dirt", textures))
                 continue
             row.append(None)
         chunk.append(row)
     return chunk
 
-def generate_side_chunk(chunk_x, chunk_y, texture_atlas, atlas_items, space):
+def generate_side_chunk(chunk_x, chunk_y, textures, space):
     chunk = []
     for y in range(CHUNK_HEIGHT):
         row = []
         for x in range(CHUNK_WIDTH):
             block_x = (chunk_x * CHUNK_WIDTH + x) * BLOCK_SIZE
             block_y = (chunk_y * CHUNK_HEIGHT + y) * BLOCK_SIZE
-            row.append(Block(space, block_x, block_y, "bedrock", texture_atlas, atlas_items))
+            row.append(Block(space, block_x, block_y, "bedrock", textures))
         chunk.append(row)
     return chunk
 
 # Function to generate chunks using Perlin noise
-def generate_chunk(chunk_x, chunk_y, texture_atlas, atlas_items, space):
-    if(chunk_y <= 0):
-        return generate_first_chunk(texture_atlas, atlas_items, space)
+def generate_chunk(chunk_x, chunk_y, textures, space):
+    if(world_chunk_y(chunk_y) <= 0):
+        return generate_first_chunk(chunk_y, textures, space)
 
+    rng = chunk_random(chunk_x, world_chunk_y(chunk_y))
     chunk = []
     for y in range(CHUNK_HEIGHT):
         row = []
@@ -112,13 +135,13 @@ def generate_chunk(chunk_x, chunk_y, texture_atlas, atlas_items, space):
             block_y = (chunk_y * CHUNK_HEIGHT + y) * BLOCK_SIZE
 
             if(x == 0 or x == CHUNK_WIDTH - 1):
-                row.append(Block(space, block_x, block_y, "bedrock", texture_atlas, atlas_items))
+                row.append(Block(space, block_x, block_y, "bedrock", textures))
                 continue
 
-            noise_value = random.uniform(-1, 1)
+            noise_value = rng.uniform(-1, 1)
 
             # Block selection based on noise val
-            row.append(Block(space, block_x, block_y, get_block_for_noise(noise_value, noise_ranges), texture_atlas, atlas_items))
+            row.append(Block(space, block_x, block_y, get_block_for_noise(noise_value, noise_ranges), textures))
 
         chunk.append(row)
     return chunk
@@ -126,25 +149,82 @@ def generate_chunk(chunk_x, chunk_y, texture_atlas, atlas_items, space):
 # Store generated chunks
 chunks = {}
 
-def get_block(chunk_x, chunk_y, x, y, texture_atlas, atlas_items, space):
-    if chunk_y < 0:
+def ensure_chunk(chunk_x, chunk_y, textures, space):
+    """Generate a chunk unless it exists already."""
+    if world_chunk_y(chunk_y) < 0 or (chunk_x, chunk_y) in chunks:
+        return
+
+    if(chunk_x == 0):
+        chunks[(chunk_x, chunk_y)] = generate_chunk(chunk_x, chunk_y, textures, space)
+    else:
+        chunks[(chunk_x, chunk_y)] = generate_side_chunk(chunk_x, chunk_y, textures, space)
+
+    world_key = (chunk_x, world_chunk_y(chunk_y))
+    if world_key in pending_deltas:
+        apply_deltas(chunks[(chunk_x, chunk_y)], pending_deltas.pop(world_key), space)
+
+def get_block(chunk_x, chunk_y, x, y, textures, space):
+    if world_chunk_y(chunk_y) < 0:
         return None
 
-    if (chunk_x, chunk_y) not in chunks:
-        if(chunk_x == 0):
-            chunks[(chunk_x, chunk_y)] = generate_chunk(chunk_x, chunk_y, texture_atlas, atlas_items, space)
-        else:
-            chunks[(chunk_x, chunk_y)] = generate_side_chunk(chunk_x, chunk_y, texture_atlas, atlas_items, space)
-            
+    ensure_chunk(chunk_x, chunk_y, textures, space)
     return chunks[(chunk_x, chunk_y)][y][x]
 
+def chunk_deltas(chunk):
+    """Blocks of a chunk that differ from a freshly generated one, as (index, destroyed, hp)."""
+    deltas = []
+    for y in range(CHUNK_HEIGHT):
+        for x in range(CHUNK_WIDTH):
+            block = chunk[y][x]
+            if block is None:
+                continue
+            if block.destroyed or block.hp <= 0:
+                deltas.append((y * CHUNK_WIDTH + x, True, 0))
+            elif block.hp < block.max_hp:
+                deltas.append((y * CHUNK_WIDTH + x, False, block.hp))
+    return deltas
+
+def apply_deltas(chunk, deltas, space):
+    """Restore saved damage and destroyed blocks on a freshly generated chunk."""
+    for index, destroyed, hp in deltas:
+        block = chunk[index // CHUNK_WIDTH][index % CHUNK_WIDTH]
+        if block is None:
+            continue
+        if destroyed:
+            # Keep the block object so the next snapshot still records it as destroyed
+            space.remove(block.body, block.shape)
+            block.destroyed = True
+            block.hp = 0
+        else:
+            block.hp = hp
+
 def delete_block(chunk_x, chunk_y, x, y):
     if (chunk_x, chunk_y) in chunks:
         chunks[(chunk_x, chunk_y)][y][x].hp = 0
         del chunks[(chunk_x, chunk_y)][y][x]
         chunks[(chunk_x, chunk_y)][y][x] = None
 
-def clean_chunks(start_chunk_y):
+def clean_chunks(start_chunk_y, space):
     for (chunk_x, chunk_y) in list(chunks.keys()):
         if chunk_y < start_chunk_y:
-            del chunks[(chunk_x, chunk_y)]
\ No newline at end of file
+            # Take the blocks out of the space too, otherwise it keeps every block ever generated
+            for row in chunks[(chunk_x, chunk_y)]:
+                for block in row:
+                    if block is not None and not block.destroyed:
+                        space.remove(block.body, block.shape)
+            del chunks[(chunk_x, chunk_y)]
+
+def shift_chunks(shift):
+    """Move every chunk shift rows up in local coordinates, the blocks go with it."""
+    global origin_chunk_y
+    dy = shift * CHUNK_PIXEL_HEIGHT
+    shifted = {}
+    for (chunk_x, chunk_y), chunk in chunks.items():
+        for row in chunk:
+            for block in row:
+                if block is not None:
+                    block.body.position = (block.body.position.x, block.body.position.y - dy)
+        shifted[(chunk_x, chunk_y - shift)] = chunk
+    chunks.clear()
+    chunks.update(shifted)
+    origin_chunk_y += shift
@@ -0,0 +1,32 @@
+# Collision types, set as shape.collision_type
+PICKAXE = 1
+BLOCK = 2
+TNT = 3
+
+# Pairs whose first shape gets on_collision(arbiter, space, data) called after the solver ran
+POST_SOLVE_PAIRS = [
+    (PICKAXE, BLOCK),
+    (TNT, BLOCK),
+]
+
+# Handlers registered on any space so far, counted by the memory watchdog
+handlers_registered = 0
+
+def dispatch_post_solve(arbiter, space, data):
+    """Route the collision to the object owning the first shape, found through shape.block_ref."""
+    arbiter.shapes[0].block_ref.on_collision(arbiter, space, data)
+
+def register_collision_handlers(space):
+    """
+    Register every handler once per space. Game objects only set collision_type and block_ref
+    on their shapes, so spawning them never touches the handlers.
+    """
+    global handlers_registered
+    for type_a, type_b in POST_SOLVE_PAIRS:
+        handler = space.add_collision_handler(type_a, type_b)
+        handler.post_solve = dispatch_post_solve
+        handlers_registered += 1
+
+def registered_handler_count():
+    """Handlers registered so far, it only grows if something registers handlers more than once per space."""
+    return handlers_registered
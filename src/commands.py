@@ -0,0 +1,230 @@
+import threading
+import time
+from collections import Counter, deque
+
+# Priorities, lower value is served first
+PRIORITY_SUPERCHAT = 0
+PRIORITY_SUBSCRIBER = 1
+PRIORITY_REGULAR = 2
+PRIORITIES = (PRIORITY_SUPERCHAT, PRIORITY_SUBSCRIBER, PRIORITY_REGULAR)
+
+# Command types, in the order they are dispatched within a frame
+COMMAND_TYPES = ("superchat_tnt", "mega_tnt", "tnt", "fast_slow", "big", "pickaxe")
+
+# Vote-like commands: the whole backlog collapses into one effect
+COALESCED_TYPES = ("fast_slow", "big", "pickaxe")
+
+PICKAXE_KEYWORDS = (
+    ("wood", "wooden_pickaxe"),
+    ("stone", "stone_pickaxe"),
+    ("iron", "iron_pickaxe"),
+    ("gold", "golden_pickaxe"),
+    ("diamond", "diamond_pickaxe"),
+    ("netherite", "netherite_pickaxe"),
+)
+
+def parse_chat_message(message):
+    """
+    Turn a chat message into the commands it triggers.
+
+    :param message: Dict as returned by youtube.get_new_live_chat_messages.
+    :return: List of (command_type, payload, priority) tuples.
+    """
+    text_lower = message["message"].lower()
+    is_superchat = message["sc_details"] is not None or message["ss_details"] is not None
+
+    if is_superchat:
+        priority = PRIORITY_SUPERCHAT
+    elif message.get("is_member"):
+        priority = PRIORITY_SUBSCRIBER
+    else:
+        priority = PRIORITY_REGULAR
+
+    commands = []
+
+    # Only English "tnt"
+    if "tnt" in text_lower:
+        commands.append(("tnt", None, priority))
+
+    if is_superchat:
+        commands.append(("superchat_tnt", message["message"], priority))
+
+    if "fast" in text_lower:
+        commands.append(("fast_slow", "Fast", priority))
+    elif "slow" in text_lower:
+        commands.append(("fast_slow", "Slow", priority))
+
+    if "big" in text_lower:
+        commands.append(("big", None, priority))
+
+    for keyword, pickaxe_name in PICKAXE_KEYWORDS:
+        if keyword in text_lower:
+            commands.append(("pickaxe", pickaxe_name, priority))
+            break
+
+    return commands
+
+class Command:
+    __slots__ = ("type", "author", "payload", "priority", "enqueued_at", "authors", "votes")
+
+    def __init__(self, command_type, author, payload, priority, enqueued_at):
+        self.type = command_type
+        self.author = author
+        self.payload = payload
+        self.priority = priority
+        self.enqueued_at = enqueued_at
+        self.authors = [author]  # Everyone who voted for this effect (coalesced commands)
+        self.votes = 1
+
+class CommandScheduler:
+    def __init__(self, interval_seconds, budgets=None):
+        """
+        :param interval_seconds: Length of one budget window (QUEUES_POP_INTERVAL_SECONDS).
+        :param budgets: Dict of command type -> commands allowed per window. Missing types get 1.
+        """
+        budgets = budgets or {}
+        self.lock = threading.Lock()  # Chat polling submits from the asyncio thread
+
+        self.queues = {}
+        self.pending_authors = {}
+        self.capacity = {}
+        self.refill_rate = {}
+        self.tokens = {}
+        self.stats = {}
+
+        now = time.monotonic()
+        self.last_refill = now
+
+        for command_type in COMMAND_TYPES:
+            budget = max(1, budgets.get(command_type, 1))
+            self.queues[command_type] = {priority: deque() for priority in PRIORITIES}
+            self.pending_authors[command_type] = set()
+            self.capacity[command_type] = budget
+            self.refill_rate[command_type] = budget / interval_seconds if interval_seconds > 0 else float("inf")
+            self.tokens[command_type] = 0.0  # First command waits one slot, like the old pop interval
+            self.stats[command_type] = {
+                "submitted": 0,
+                "dispatched": 0,
+                "coalesced": 0,
+                "latency_total": 0.0,
+                "latency_max": 0.0,
+                "latency_last": 0.0,
+            }
+
+    def submit(self, command_type, author, payload=None, priority=PRIORITY_REGULAR):
+        """Queue a command. An author can only have one pending command per type."""
+        with self.lock:
+            if author in self.pending_authors[command_type]:
+                return False
+
+            self.pending_authors[command_type].add(author)
+            self.queues[command_type][priority].append(Command(command_type, author, payload, priority, time.monotonic()))
+            self.stats[command_type]["submitted"] += 1
+            return True
+
+    def submit_message(self, message):
+        """Parse a chat message and queue every command it contains."""
+        author = message["author"]
+        for command_type, payload, priority in parse_chat_message(message):
+            if self.submit(command_type, author, payload, priority):
+                print(f"Added {author} to {command_type} queue" + (f" ({payload})" if command_type in COALESCED_TYPES and payload else ""))
+
+    def depth(self, command_type):
+        queues = self.queues[command_type]
+        return len(queues[PRIORITY_SUPERCHAT]) + len(queues[PRIORITY_SUBSCRIBER]) + len(queues[PRIORITY_REGULAR])
+
+    def has_pending(self, *command_types):
+        for command_type in command_types:
+            if self.depth(command_type):
+                return True
+        return False
+
+    def pending_commands(self):
+        """Copy of every queued command, in dispatch order per type."""
+        with self.lock:
+            return [command for command_type in COMMAND_TYPES for priority in PRIORITIES for command in self.queues[command_type][priority]]
+
+    def poll(self):
+        """Return the commands whose budget allows them to run now, highest priority first."""
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+
+        ready = []
+        with self.lock:
+            for command_type in COMMAND_TYPES:
+                # Refill the budget, idle types keep at most one window worth of tokens
+                tokens = min(self.capacity[command_type], self.tokens[command_type] + elapsed * self.refill_rate[command_type])
+                self.tokens[command_type] = tokens
+
+                if tokens < 1 or not self.depth(command_type):
+                    continue
+
+                if command_type in COALESCED_TYPES:
+                    ready.append(self._pop_coalesced(command_type, now))
+                    self.tokens[command_type] -= 1
+                    continue
+
+                while self.tokens[command_type] >= 1 and self.depth(command_type):
+                    ready.append(self._pop(command_type, now))
+                    self.tokens[command_type] -= 1
+
+        return ready
+
+    def _pop(self, command_type, now):
+        for priority in PRIORITIES:
+            queue = self.queues[command_type][priority]
+            if queue:
+                command = queue.popleft()
+                self.pending_authors[command_type].discard(command.author)
+                self._record(command_type, now - command.enqueued_at)
+                return command
+
+    def _pop_coalesced(self, command_type, now):
+        """Collapse the whole backlog of a vote-like command into one command with the winning payload."""
+        votes = Counter()
+        first = None
+        authors = []
+        for priority in PRIORITIES:
+            queue = self.queues[command_type][priority]
+            while queue:
+                command = queue.popleft()
+                if first is None:
+                    first = command
+                votes[command.payload] += 1
+                authors.append(command.author)
+                self._record(command_type, now - command.enqueued_at)
+
+        self.pending_authors[command_type].clear()
+
+        # Counter.most_common keeps insertion order on ties, so priority order wins a tie
+        first.payload = votes.most_common(1)[0][0]
+        first.authors = authors
+        first.votes = len(authors)
+        self.stats[command_type]["coalesced"] += len(authors) - 1
+        return first
+
+    def _record(self, command_type, latency):
+        stats = self.stats[command_type]
+        stats["dispatched"] += 1
+        stats["latency_total"] += latency
+        stats["latency_last"] = latency
+        stats["latency_max"] = max(stats["latency_max"], latency)
+
+    def metrics(self):
+        """Queue depth and latency (seconds) per command type."""
+        metrics = {}
+        with self.lock:
+            for command_type in COMMAND_TYPES:
+                stats = self.stats[command_type]
+                dispatched = stats["dispatched"]
+                metrics[command_type] = {
+                    "depth": self.depth(command_type),
+                    "submitted": stats["submitted"],
+                    "dispatched": dispatched,
+                    "coalesced": stats["coalesced"],
+                    "latency_avg": stats["latency_total"] / dispatched if dispatched else 0.0,
+                    "latency_max": stats["latency_max"],
+                    "latency_last": stats["latency_last"],
+                }
+        return metrics
@@ -11,4 +11,10 @@ if not os.path.exists("config.json"):
 
 # Load configuration from config.json
 with open("config.json", "r") as config_file:
-    config = json.load(config_file)
\ No newline at end of file
+    config = json.load(config_file)
+
+# Fill in settings that were added to default.config.json after config.json was created
+if os.path.exists("default.config.json"):
+    with open("default.config.json", "r") as default_config_file:
+        for key, value in json.load(default_config_file).items():
+            config.setdefault(key, value)
\ No newline at end of file
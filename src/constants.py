@@ -5,4 +5,6 @@ INTERNAL_WIDTH, INTERNAL_HEIGHT = 1080, 1920
 BLOCK_TEXTURE_SIZE = 16
 BLOCK_SCALE_FACTOR = INTERNAL_WIDTH / BLOCK_TEXTURE_SIZE / CHUNK_WIDTH
 BLOCK_SIZE = int(INTERNAL_WIDTH / CHUNK_WIDTH)
+CHUNK_PIXEL_WIDTH = CHUNK_WIDTH * BLOCK_SIZE
+CHUNK_PIXEL_HEIGHT = CHUNK_HEIGHT * BLOCK_SIZE
 FRAMERATE = 60
\ No newline at end of file
@@ -0,0 +1,70 @@
+class EntityStore:
+    def __init__(self):
+        """
+        Live entities of one kind packed in a list, with O(1) add and remove.
+
+        Each entity gets an id (slot, generation) stored as entity.entity_id. A slot is reused after
+        its entity is removed, and the generation tells an old id apart from the new entity.
+        Removal is deferred until flush(), so removing while iterating never skips an entity.
+        """
+        self.entities = []  # Dense, iteration order
+        self.entity_slots = []  # Slot of each entity in self.entities
+        self.dense_index = []  # Slot -> index in self.entities, -1 when the slot is free
+        self.generations = []  # Slot -> current generation
+        self.free_slots = []
+        self.pending_removal = []
+
+    def add(self, entity):
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.generations)
+            self.generations.append(0)
+            self.dense_index.append(-1)
+
+        self.dense_index[slot] = len(self.entities)
+        self.entities.append(entity)
+        self.entity_slots.append(slot)
+        entity.entity_id = (slot, self.generations[slot])
+        return entity.entity_id
+
+    def get(self, entity_id):
+        """The entity for an id, or None if it was removed since."""
+        slot, generation = entity_id
+        if slot >= len(self.generations) or self.generations[slot] != generation or self.dense_index[slot] < 0:
+            return None
+        return self.entities[self.dense_index[slot]]
+
+    def remove(self, entity_id):
+        """Mark an entity for removal at the next flush, removing it twice is harmless."""
+        self.pending_removal.append(entity_id)
+
+    def flush(self):
+        """Swap-remove everything marked for removal."""
+        for slot, generation in self.pending_removal:
+            if self.generations[slot] != generation or self.dense_index[slot] < 0:
+                continue  # Already removed
+
+            # Move the last entity into the hole
+            index = self.dense_index[slot]
+            last_slot = self.entity_slots[-1]
+            self.entities[index] = self.entities[-1]
+            self.entity_slots[index] = last_slot
+            self.dense_index[last_slot] = index
+            self.entities.pop()
+            self.entity_slots.pop()
+
+            self.dense_index[slot] = -1
+            self.generations[slot] += 1
+            self.free_slots.append(slot)
+
+        self.pending_removal.clear()
+
+    def __iter__(self):
+        # Entities added while iterating are visited from the next frame on
+        entities = self.entities
+        for index in range(len(entities)):
+            yield entities[index]
+
+    def __len__(self):
+        return len(self.entities)
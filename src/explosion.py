@@ -1,22 +1,18 @@
-import pygame
-import random
-
+import math
 import pygame
 import random
 
 class ExplosionParticle:
-    def __init__(self, pos, texture_atlas, atlas_items, frame_count=16, frame_duration=1):
+    def __init__(self, pos, textures, frame_count=16, frame_duration=1):
         """
         :param pos: Starting position (tuple or pygame.Vector2)
-        :param texture_atlas: The atlas surface containing the explosion frames.
-        :param atlas_items: A dict with keys like "explosion_0", "explosion_1", ... up to frame_count-1.
+        :param textures: TextureRegistry with the explosion frames ("explosion_0", "explosion_1", ... up to frame_count-1).
         :param frame_count: Total number of explosion frames.
         :param animation_duration: Total duration of the animation. Interpreted either in ms or frames.
         :param duration_mode: Either 'ms' for milliseconds or 'frames' for game frames.
         """
         self.pos = pygame.Vector2(pos)
-        self.texture_atlas = texture_atlas
-        self.atlas_items = atlas_items
+        self.frames = textures.explosion_frames
         self.frame_count = frame_count
 
         self.elapsed_time = 0.0
@@ -27,6 +23,10 @@ class ExplosionParticle:
         # Random rotation between 0 and 360 degrees.
         self.rotation = random.uniform(0, 360)
 
+        # Largest side of the rotated frame, used to skip particles off screen
+        width, height = self.frames[0].get_size()
+        self.max_size = int(math.hypot(width, height)) + 1
+
     def update(self, dt):
         """Update animation frame based on elapsed time or frame count."""
         if self.finished:
@@ -42,15 +42,12 @@ class ExplosionParticle:
                 self.current_frame = self.frame_count - 1
 
 
-    def draw(self, screen, camera):
+    def draw(self, render_queue, camera):
         if self.finished:
             return
         
-        # Get the corresponding rect for the current explosion frame
-        key = f"explosion_{self.current_frame}"
-        # Ensure the atlas_items[key] is a tuple or pygame.Rect
-        rect = pygame.Rect(self.atlas_items["particle"][key])
-        texture = self.texture_atlas.subsurface(rect)
+        # Get the texture for the current explosion frame
+        texture = self.frames[self.current_frame]
 
         # Rotate the texture
         texture = pygame.transform.rotate(texture, self.rotation)
@@ -59,22 +56,21 @@ class ExplosionParticle:
         # Adjust drawing position by camera offset (if only vertical, subtract camera.offset_y)
         draw_pos = (self.pos.x - camera.offset_x, self.pos.y - camera.offset_y)
 
-        screen.blit(texture, draw_pos)
+        render_queue.push("particles", texture, draw_pos)
 
 class Explosion:
-    def __init__(self, pos, texture_atlas, atlas_items, particle_count=20):
+    def __init__(self, pos, textures, particle_count=20):
         """
         Creates an explosion effect at the given position.
         :param pos: The center position of the explosion.
-        :param texture_atlas: The atlas surface.
-        :param atlas_items: The atlas items dictionary.
+        :param textures: The TextureRegistry.
         :param particle_count: Number of particles to spawn.
         """
         self.particles = []
         for _ in range(particle_count):
             # Give each particle a slight random offset around the explosion center
             offset = pygame.Vector2(random.randint(-200, 200), random.randint(-200, 200))
-            particle = ExplosionParticle(pos + offset, texture_atlas, atlas_items)
+            particle = ExplosionParticle(pos + offset, textures)
             self.particles.append(particle)
 
     def update(self):
@@ -87,6 +83,7 @@ class Explosion:
         # Optionally remove finished particles
         self.particles = [p for p in self.particles if not p.finished]
 
-    def draw(self, screen, camera):
+    def draw(self, render_queue, camera, visibility):
         for particle in self.particles:
-            particle.draw(screen, camera)
+            if visibility.rect_visible("particle", particle.pos.x, particle.pos.y, particle.max_size, particle.max_size):
+                particle.draw(render_queue, camera)
@@ -0,0 +1,83 @@
+import time
+from constants import FRAMERATE
+
+class Job:
+    __slots__ = ("function", "max_wait_frames", "waited_frames")
+
+    def __init__(self, function, max_wait_frames):
+        self.function = function
+        self.max_wait_frames = max_wait_frames
+        self.waited_frames = 0
+
+class FrameBudget:
+    def __init__(self, frame_seconds=1 / FRAMERATE):
+        """
+        Runs deferrable jobs in whatever is left of a frame, the rest waits for a later frame.
+
+        :param frame_seconds: Time one frame may take, work and jobs together.
+        """
+        self.frame_seconds = frame_seconds
+        self.jobs = {}  # Key -> Job, in the order they were deferred
+        self.cost_estimates = {}  # Job name -> seconds, moving average
+
+        # Since the last metrics record
+        self.jobs_run = 0
+        self.jobs_deferred = 0  # Times a job was left for a later frame
+        self.jobs_forced = 0  # Ran over budget because it waited max_wait_frames
+        self.longest_frame_ms = 0.0
+
+    def defer(self, key, function, max_wait_frames=30):
+        """
+        Queue a job, unless one with the same key is queued already.
+
+        :param key: A string or a tuple starting with the job name, e.g. ("chunk", 0, 5).
+        :param max_wait_frames: Run it after this many frames even when there is no time left.
+        """
+        if key not in self.jobs:
+            self.jobs[key] = Job(function, max_wait_frames)
+
+    def cancel(self, name):
+        """Drop queued jobs with this name, e.g. ones holding chunk coordinates that no longer apply."""
+        for key in list(self.jobs):
+            if (key[0] if isinstance(key, tuple) else key) == name:
+                del self.jobs[key]
+
+    def run(self, frame_start):
+        """Run queued jobs while they fit in the frame that started at frame_start (perf_counter)."""
+        for key in list(self.jobs):
+            job = self.jobs[key]
+            name = key[0] if isinstance(key, tuple) else key
+            remaining = self.frame_seconds - (time.perf_counter() - frame_start)
+
+            if remaining < self.cost_estimates.get(name, 0) or remaining <= 0:
+                if job.waited_frames < job.max_wait_frames:
+                    job.waited_frames += 1
+                    self.jobs_deferred += 1
+                    continue
+                self.jobs_forced += 1
+
+            del self.jobs[key]
+            job_start = time.perf_counter()
+            job.function()
+            cost = time.perf_counter() - job_start
+            estimate = self.cost_estimates.get(name)
+            self.cost_estimates[name] = cost if estimate is None else estimate * 0.8 + cost * 0.2
+            self.jobs_run += 1
+
+        frame_ms = (time.perf_counter() - frame_start) * 1000
+        self.longest_frame_ms = max(self.longest_frame_ms, frame_ms)
+
+    def take_interval(self):
+        """Job counts and the longest frame since the previous call, for the metrics log."""
+        interval = {
+            "jobs_run": self.jobs_run,
+            "jobs_deferred": self.jobs_deferred,
+            "jobs_forced": self.jobs_forced,
+            "jobs_pending": len(self.jobs),
+            "longest_frame_ms": round(self.longest_frame_ms, 3),
+        }
+        self.jobs_run = 0
+        self.jobs_deferred = 0
+        self.jobs_forced = 0
+        self.longest_frame_ms = 0.0
+        return interval
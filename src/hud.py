@@ -21,14 +21,12 @@ def render_text_with_outline(text, font, text_color, outline_color, outline_widt
     return outline_surface
 
 class Hud:
-    def __init__(self, texture_atlas, atlas_items, position=(32, 32)):
+    def __init__(self, textures, position=(32, 32)):
         """
-        :param texture_atlas: The atlas surface containing the item icons.
-        :param atlas_items: A dict with keys under "item" for each ore.
+        :param textures: TextureRegistry with an "item" texture for each ore.
         :param position: Top-left position where the HUD will be drawn.
         """
-        self.texture_atlas = texture_atlas
-        self.atlas_items = atlas_items
+        self.textures = textures
 
         # Initialize ore amounts to 0.
         self.amounts = {
@@ -49,6 +47,24 @@ class Hud:
         # Initialize a font (using the default font and size 24)
         self.font = pygame.font.Font(None, 64)
 
+        # Icons scaled once to the desired icon size, ores without an icon are skipped
+        self.icons = {}
+        for ore in self.amounts:
+            if textures.has("item", ore):
+                self.icons[ore] = textures.scaled("item", ore, self.icon_size)
+
+        # Outlined text is only rendered again when it changes
+        self.text_cache = {}
+
+    def render_text(self, key, text):
+        """Outlined text for a HUD line, cached until the text of that line changes."""
+        cached = self.text_cache.get(key)
+        if cached is None or cached[0] != text:
+            # You can tweak outline_width, text color, and outline color as needed.
+            cached = (text, render_text_with_outline(text, self.font, (255, 255, 255), (0, 0, 0), outline_width=2))
+            self.text_cache[key] = cached
+        return cached[1]
+
     def update_amounts(self, new_amounts):
         """
         Update the ore amounts.
@@ -56,54 +72,48 @@ class Hud:
         """
         self.amounts.update(new_amounts)
 
-    def draw(self, screen, pickaxe_y, fast_slow_active, fast_slow):
+    def draw(self, render_queue, pickaxe_y, fast_slow_active, fast_slow):
         """
         Draws the HUD: each ore icon with its amount and other indicators.
         """
         x, y = self.position
 
         for ore, amount in self.amounts.items():
-            # Retrieve the icon rect from atlas_items["item"][ore]
-            if ore in self.atlas_items["item"]:
-                icon_rect = pygame.Rect(self.atlas_items["item"][ore])
-                icon = self.texture_atlas.subsurface(icon_rect)
-                # Scale the icon to desired icon size
-                icon = pygame.transform.scale(icon, self.icon_size)
+            icon = self.icons.get(ore)
+            if icon is not None:
                 # Blit the icon
-                screen.blit(icon, (x, y))
+                render_queue.push("hud", icon, (x, y))
             else:
                 # In case the ore key is missing, skip drawing the icon
                 continue
 
             # Render the amount text with a black outline.
-            text = str(amount)
-            # You can tweak outline_width, text color, and outline color as needed.
-            text_surface = render_text_with_outline(text, self.font, (255, 255, 255), (0, 0, 0), outline_width=2)
+            text_surface = self.render_text(ore, str(amount))
             
             # Position text to the right of the icon
             text_x = x + self.icon_size[0] + self.spacing
             text_y = y + (self.icon_size[1] - text_surface.get_height()) // 2 + 3
-            screen.blit(text_surface, (text_x, text_y))
+            render_queue.push("hud", text_surface, (text_x, text_y))
 
             # Move to the next line
             y += self.icon_size[1] + self.spacing
 
         # Draw the pickaxe position indicator with outlined text
         pickaxe_indicator_text = f"Y: {-int(pickaxe_y // BLOCK_SIZE)}"
-        pickaxe_indicator_surface = render_text_with_outline(pickaxe_indicator_text, self.font, (255, 255, 255), (0, 0, 0), outline_width=2)
+        pickaxe_indicator_surface = self.render_text("pickaxe_y", pickaxe_indicator_text)
         pickaxe_indicator_x = x + self.spacing
         pickaxe_indicator_y = y + self.spacing
-        screen.blit(pickaxe_indicator_surface, (pickaxe_indicator_x, pickaxe_indicator_y))
+        render_queue.push("hud", pickaxe_indicator_surface, (pickaxe_indicator_x, pickaxe_indicator_y))
 
         # Draw the fast/slow indicator with outlined text
         if fast_slow_active:
             fast_slow_text = f"{fast_slow}"
         else:
             fast_slow_text = "Normal"
-        fast_slow_surface = render_text_with_outline(fast_slow_text, self.font, (255, 255, 255), (0, 0, 0), outline_width=2)
+        fast_slow_surface = self.render_text("fast_slow", fast_slow_text)
         fast_slow_x = x + self.spacing
         fast_slow_y = y + 2 * self.spacing + fast_slow_surface.get_height()
-        screen.blit(fast_slow_surface, (fast_slow_x, fast_slow_y))
+        render_queue.push("hud", fast_slow_surface, (fast_slow_x, fast_slow_y))
 
             
 
@@ -1,32 +1,86 @@
+from startup import startup_timer
+import os
+import sys
 import time
 import pygame
 import pymunk
-import pymunk.pygame_util   
-from youtube import get_live_stream, get_new_live_chat_messages, get_live_chat_id, get_subscriber_count
 from config import config
-from atlas import create_texture_atlas 
+from atlas import create_texture_atlas
 from pathlib import Path
-from chunk import get_block, clean_chunks, delete_block, chunks
-from constants import BLOCK_SCALE_FACTOR, BLOCK_SIZE, CHUNK_HEIGHT, CHUNK_WIDTH, INTERNAL_HEIGHT, INTERNAL_WIDTH, FRAMERATE
+from chunk import chunks, get_block, ensure_chunk, clean_chunks, world_chunk_y
+from constants import BLOCK_SCALE_FACTOR, BLOCK_SIZE, CHUNK_HEIGHT, CHUNK_PIXEL_HEIGHT, CHUNK_WIDTH, INTERNAL_HEIGHT, INTERNAL_WIDTH, FRAMERATE
 from pickaxe import Pickaxe
 from camera import Camera
 from sound import SoundManager
-from tnt import Tnt, MegaTnt
+from collision import register_collision_handlers, registered_handler_count
+from physics import create_space, add_walls
+from tnt import Tnt, MegaTnt, TntPool
+from spawn_placement import SpawnPlacer
+from entities import EntityStore
+from visibility import Visibility
+from render_queue import RenderQueue
+from frame_budget import FrameBudget
+from timers import EventTimers
+from origin import true_y, rebase_if_needed
 import asyncio
 import threading
+from functools import partial
 import random
 from hud import Hud
+from textures import TextureRegistry, load_background
+from pickaxe import ENLARGED_SIZE
+from stats import stats
+from metrics_log import MetricsLog
+from snapshot import SnapshotWriter, capture_snapshot, load_snapshot, restore_snapshot
+from commands import CommandScheduler, PRIORITY_SUBSCRIBER
+from subscribers import SubscriberWatcher
+from chat_source import YoutubeChatSource, ReplayChatSource
+from render_process import RenderProcess
+from memory_watchdog import MemoryWatchdog
+from metrics_endpoint import MetricsEndpoint
+from block import Block
+
+startup_timer.mark("imports")
 
 # Track key states
 key_t_pressed = False
 key_m_pressed = False
 
-# 
+# Set by init_chat once the window is up
 live_stream = None
 live_chat_id = None
 subscribers = None
+chat_source = None
+subscriber_watcher = None
+
+# Replaying a recorded chat log turns on chat control without touching the API
+chat_control = config["CHAT_CONTROL"] or bool(config["CHAT_REPLAY_FILE"])
+
+async def init_chat():
+    """Connect to chat on the asyncio thread after the first frame, retrying until it works."""
+    while True:
+        try:
+            connect_chat()
+            return
+        except Exception as e:
+            stats.api_errors += 1
+            print(f"Chat initialization failed, retrying in {config['CHAT_INIT_RETRY_SECONDS']}s:", e)
+            await asyncio.sleep(config["CHAT_INIT_RETRY_SECONDS"])
+
+def connect_chat():
+    """Look up the live stream, chat and subscriber count."""
+    global live_stream, live_chat_id, subscribers, chat_source, subscriber_watcher
+
+    init_start = time.perf_counter()
+
+    if config["CHAT_REPLAY_FILE"]:
+        print("Replaying chat log:", config["CHAT_REPLAY_FILE"])
+        chat_source = ReplayChatSource(config["CHAT_REPLAY_FILE"], config["CHAT_REPLAY_SPEED"])
+        return
+
+    # Imported here so googleapiclient is only loaded when chat control is on
+    from youtube import get_live_stream, get_live_chat_id, get_subscriber_count, get_subscriber_count_if_changed, quota
 
-if config["CHAT_CONTROL"] == True:
     print("Checking for specific live stream")
     if config["LIVESTREAM_ID"] is not None and config["LIVESTREAM_ID"] != "":
         live_stream = get_live_stream(config["LIVESTREAM_ID"])
@@ -45,6 +99,7 @@ if config["CHAT_CONTROL"] == True:
         print("No live chat ID found. App will run without it.")
     else:
         print("Live chat ID found:", live_chat_id)
+        chat_source = YoutubeChatSource(live_chat_id, config["YT_POLL_INTERVAL_SECONDS"])
 
     # get subscribers count
     if(config["CHANNEL_ID"] is not None and config["CHANNEL_ID"] != ""):
@@ -56,105 +111,66 @@ if config["CHAT_CONTROL"] == True:
     else:
         print("Subscribers count found:", subscribers)
 
-# Queues for chat 
-tnt_queue = []
-tnt_superchat_queue = []
-fast_slow_queue = []
-big_queue = []
-pickaxe_queue = []
-mega_tnt_queue = []
+        # Subscriber count is polled on its own adaptive schedule
+        subscriber_watcher = SubscriberWatcher(config["CHANNEL_ID"], get_subscriber_count_if_changed, quota, subscribers,
+                                               min_interval=config["SUBSCRIBER_POLL_MIN_SECONDS"],
+                                               max_interval=config["SUBSCRIBER_POLL_MAX_SECONDS"],
+                                               quota_share=config["SUBSCRIBER_QUOTA_SHARE"])
+
+    print(f"Chat initialized in {(time.perf_counter() - init_start) * 1000:.0f}ms")
+
+async def handle_subscriber_poll():
+    poll_start = time.perf_counter()
+    try:
+        new_subscribers = subscriber_watcher.poll()
+    except Exception as e:
+        stats.api_errors += 1
+        print("Subscriber poll failed:", e)
+        return
+    finally:
+        stats.subscriber_poll_ms = (time.perf_counter() - poll_start) * 1000
+
+    if new_subscribers > 0:
+        command_scheduler.submit("mega_tnt", "New Subscriber", priority=PRIORITY_SUBSCRIBER) # Add to mega tnt queue
+        print("New subscriber! Subscribers count:", subscriber_watcher.subscribers)
 
 async def handle_youtube_poll():
-    global subscribers # Use global to modify the variable
-
-    if subscribers is not None:
-        new_subscribers = get_subscriber_count(config["CHANNEL_ID"])
-        if new_subscribers is not None and new_subscribers > subscribers:
-            mega_tnt_queue.append("New Subscriber") # Add to mega tnt queue
-            subscribers = new_subscribers # Update subscriber count
-
-    new_messages = get_new_live_chat_messages(live_chat_id)
+    poll_start = time.perf_counter()
+    try:
+        new_messages = chat_source.get_new_messages()
+    except Exception as e:
+        stats.api_errors += 1
+        print("Chat poll failed:", e)
+        return
+    finally:
+        stats.chat_poll_ms = (time.perf_counter() - poll_start) * 1000
+    stats.chat_polls += 1
 
     for message in new_messages:
-        author = message["author"]
-        text = message["message"]
-        is_superchat = message["sc_details"] is not None
-        is_supersticker = message["ss_details"] is not None
-
-        text_lower = text.lower()
-
-        # Check for "tnt" command (add author to regular tnt_queue) - Only English "tnt"
-        if "tnt" in text_lower:
-            if author not in tnt_queue:
-                tnt_queue.append(author)
-                print(f"Added {author} to regular TNT queue")
-
-        # Check for Superchat/Supersticker (add to superchat tnt queue)
-        if is_superchat or is_supersticker:
-            if author not in [entry[0] for entry in tnt_superchat_queue]:
-                 tnt_superchat_queue.append((author, text))
-                 print(f"Added {author} to Superchat TNT queue")
-
-        if "fast" in text.lower() and author not in [entry[0] for entry in fast_slow_queue]:
-            fast_slow_queue.append((author, "Fast"))
-            print(f"Added {author} to Fast/Slow queue (Fast)")
-        elif "slow" in text.lower() and author not in [entry[0] for entry in fast_slow_queue]:
-            fast_slow_queue.append((author, "Slow"))
-            print(f"Added {author} to Fast/Slow queue (Slow)")
-
-        if "big" in text.lower() and author not in big_queue:
-            big_queue.append(author)
-            print(f"Added {author} to Big queue")
-
-        # Check for pickaxe commands (add author and pickaxe type to pickaxe_queue)
-        if "wood" in text_lower:
-             if author not in [entry[0] for entry in pickaxe_queue]:
-                 pickaxe_queue.append((author, "wooden_pickaxe"))
-                 print(f"Added {author} to Pickaxe queue (wooden_pickaxe)")
-        elif "stone" in text_lower:
-             if author not in [entry[0] for entry in pickaxe_queue]:
-                 pickaxe_queue.append((author, "stone_pickaxe"))
-                 print(f"Added {author} to Pickaxe queue (stone_pickaxe)")
-        elif "iron" in text_lower:
-             if author not in [entry[0] for entry in pickaxe_queue]:
-                 pickaxe_queue.append((author, "iron_pickaxe"))
-                 print(f"Added {author} to Pickaxe queue (iron_pickaxe)")
-        elif "gold" in text_lower:
-             if author not in [entry[0] for entry in pickaxe_queue]:
-                 pickaxe_queue.append((author, "golden_pickaxe"))
-                 print(f"Added {author} to Pickaxe queue (golden_pickaxe)")
-        elif "diamond" in text_lower:
-             if author not in [entry[0] for entry in pickaxe_queue]:
-                 pickaxe_queue.append((author, "diamond_pickaxe"))
-                 print(f"Added {author} to Pickaxe queue (diamond_pickaxe)")
-        elif "netherite" in text_lower:
-             if author not in [entry[0] for entry in pickaxe_queue]:
-                 pickaxe_queue.append((author, "netherite_pickaxe"))
-                 print(f"Added {author} to Pickaxe queue (netherite_pickaxe)")
-
-    # print the queue counts (optional, for debugging)
-    # print(f"Queues: TNT={len(tnt_queue)}, Superchat TNT={len(tnt_superchat_queue)}, Fast/Slow={len(fast_slow_queue)}, Big={len(big_queue)}, Pickaxe={len(pickaxe_queue)}, MegaTNT={len(mega_tnt_queue)}")
+        command_scheduler.submit_message(message)
 
 def start_event_loop(loop):
     asyncio.set_event_loop(loop)
     loop.run_forever()
 
-# Create a new event loop
-asyncio_loop = asyncio.new_event_loop()
-# Start it in a daemon thread so it doesn’t block shutdown
-threading.Thread(target=start_event_loop, args=(asyncio_loop,), daemon=True).start()
-
 def game():
     window_width = int(INTERNAL_WIDTH / 2)
     window_height = int(INTERNAL_HEIGHT / 2)
 
+    # With a render process the window belongs to it, this process only simulates
+    video_driver = os.environ.get("SDL_VIDEODRIVER")
+    if config["RENDER_PROCESS"]:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+
     # Initialize pygame
     pygame.init()
     clock = pygame.time.Clock()
 
-    # Pymunk physics 
-    space = pymunk.Space()
-    space.gravity = (0, 1000)  # (x, y) - down is positive y
+    # Pymunk physics, tuned by PHYSICS_PROFILE
+    space = create_space(config["PHYSICS_PROFILE"])
+    register_collision_handlers(space)
+    # Local y never gets much below the rebase distance, see origin.py
+    add_walls(space, (config["ORIGIN_REBASE_CHUNKS"] + 2) * CHUNK_PIXEL_HEIGHT)
 
     # Create a resizable window
     screen_size = (window_width, window_height)
@@ -163,91 +179,217 @@ def game():
     # set icon
     icon = pygame.image.load(Path(__file__).parent.parent / "src/assets/pickaxe" / "diamond_pickaxe.png")
     pygame.display.set_icon(icon)
+    startup_timer.mark("window")
 
     # Create an internal surface with fixed resolution
     internal_surface = pygame.Surface((INTERNAL_WIDTH, INTERNAL_HEIGHT))
+    render_queue = RenderQueue()  # Draw methods queue their blits here
 
-    # Load texture atlas
+    # Load texture atlas, packed and scaled by BLOCK_SCALE_FACTOR
     assets_dir = Path(__file__).parent.parent / "src/assets" 
-    (texture_atlas, atlas_items) = create_texture_atlas(assets_dir)
-    
+    (texture_atlas, atlas_items) = create_texture_atlas(assets_dir, BLOCK_SCALE_FACTOR)
+
+    # Every texture and scaled variant used while drawing, sliced from the atlas once
+    textures = TextureRegistry(texture_atlas, atlas_items)
+    textures.prescale("pickaxe", textures.category("pickaxe"), ENLARGED_SIZE)
+    mega_tnt_width, mega_tnt_height = textures.get("block", "mega_tnt").get_size()
+    textures.prescale("block", ["mega_tnt"], (mega_tnt_width * 2, mega_tnt_height * 2))
+    startup_timer.mark("atlas")
+
     # Load background 
-    background_image = pygame.image.load(assets_dir / "background.png")
-    background_scale_factor = 1.5  
-    background_width = int(background_image.get_width() * background_scale_factor)
-    background_height = int(background_image.get_height() * background_scale_factor)
-    background_image = pygame.transform.scale(background_image, (background_width, background_height))
-
-    # Scale the entire texture atlas
-    texture_atlas = pygame.transform.scale(texture_atlas, 
-                                        (texture_atlas.get_width() * BLOCK_SCALE_FACTOR, 
-                                        texture_atlas.get_height() * BLOCK_SCALE_FACTOR))
-
-    for category in atlas_items:
-        for item in atlas_items[category]:
-            x, y, w, h = atlas_items[category][item]
-            atlas_items[category][item] = (x * BLOCK_SCALE_FACTOR, y * BLOCK_SCALE_FACTOR, w * BLOCK_SCALE_FACTOR, h * BLOCK_SCALE_FACTOR)
+    background_image = load_background(assets_dir)
+    background_width, background_height = background_image.get_size()
+    startup_timer.mark("background")
+
+    # The render process packs the same atlas itself, texture ids match
+    render_process = None
+    if config["RENDER_PROCESS"]:
+        render_process = RenderProcess(textures, video_driver)
+        startup_timer.mark("render process")
 
     #sounds 
     sound_manager = SoundManager()
 
     sound_manager.load_sound("tnt", assets_dir / "sounds" / "tnt.mp3", 0.3)
-    sound_manager.load_sound("stone1", assets_dir / "sounds" / "stone1.wav", 0.5)
-    sound_manager.load_sound("stone2", assets_dir / "sounds" / "stone2.wav", 0.5)
-    sound_manager.load_sound("stone3", assets_dir / "sounds" / "stone3.wav", 0.5)
-    sound_manager.load_sound("stone4", assets_dir / "sounds" / "stone4.wav", 0.5)
-    sound_manager.load_sound("grass1", assets_dir / "sounds" / "grass1.wav", 0.1)
-    sound_manager.load_sound("grass2", assets_dir / "sounds" / "grass2.wav", 0.1)
-    sound_manager.load_sound("grass3", assets_dir / "sounds" / "grass3.wav", 0.1)
-    sound_manager.load_sound("grass4", assets_dir / "sounds" / "grass4.wav", 0.1)
+    sound_manager.load_sound("stone1", assets_dir / "sounds" / "stone1.wav", 0.5, group="stone")
+    sound_manager.load_sound("stone2", assets_dir / "sounds" / "stone2.wav", 0.5, group="stone")
+    sound_manager.load_sound("stone3", assets_dir / "sounds" / "stone3.wav", 0.5, group="stone")
+    sound_manager.load_sound("stone4", assets_dir / "sounds" / "stone4.wav", 0.5, group="stone")
+    sound_manager.load_sound("grass1", assets_dir / "sounds" / "grass1.wav", 0.1, group="grass")
+    sound_manager.load_sound("grass2", assets_dir / "sounds" / "grass2.wav", 0.1, group="grass")
+    sound_manager.load_sound("grass3", assets_dir / "sounds" / "grass3.wav", 0.1, group="grass")
+    sound_manager.load_sound("grass4", assets_dir / "sounds" / "grass4.wav", 0.1, group="grass")
+
+    # Mining triggers a sound on every contact of every physics step, a few voices are plenty
+    sound_manager.set_limit("stone", max_voices=3, min_interval_ms=60)
+    sound_manager.set_limit("grass", max_voices=3, min_interval_ms=60)
+    sound_manager.set_limit("tnt", max_voices=4)
+    startup_timer.mark("sounds")
 
     # Pickaxe
-    pickaxe = Pickaxe(space, INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2, texture_atlas.subsurface(atlas_items["pickaxe"]["wooden_pickaxe"]), sound_manager)
+    pickaxe = Pickaxe(space, INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2, textures, sound_manager)
 
     # TNT
-    last_tnt_spawn = pygame.time.get_ticks()
-    tnt_spawn_interval = 1000 * random.uniform(config["TNT_SPAWN_INTERVAL_SECONDS_MIN"], config["TNT_SPAWN_INTERVAL_SECONDS_MAX"]) 
-    tnt_list = []  # List to keep track of spawned TNT objects
-
-    # Random Pickaxe
-    last_random_pickaxe = pygame.time.get_ticks()
-    random_pickaxe_interval = 1000 * random.uniform(config["RANDOM_PICKAXE_INTERVAL_SECONDS_MIN"], config["RANDOM_PICKAXE_INTERVAL_SECONDS_MAX"]) 
+    tnt_store = EntityStore()  # Spawned TNT objects
+    # Enough TNTs for a superchat are ready before the first one arrives
+    tnt_pool = TntPool(space, textures, sound_manager, {Tnt: config["TNT_AMOUNT_ON_SUPERCHAT"] + 2, MegaTnt: 2})
+    # Every spawn goes through here, bursts are spread over free spots and frames
+    spawn_placer = SpawnPlacer(space, tnt_pool, tnt_store, config["TNT_SPAWNS_PER_FRAME"], max_pending=config["TNT_SPAWN_QUEUE_MAX"])
 
     # Pickaxe enlargement
-    last_enlarge = pygame.time.get_ticks()
-    enlarge_interval = 1000 * random.uniform(config["PICKAXE_ENLARGE_INTERVAL_SECONDS_MIN"], config["PICKAXE_ENLARGE_INTERVAL_SECONDS_MAX"])
     enlarge_duration = 1000 * config["PICKAXE_ENLARGE_DURATION_SECONDS"]
 
     # Fast slow 
     fast_slow_active = False
     fast_slow = random.choice(["Fast", "Slow"])
-    fast_slow_interval = 1000 * random.uniform(config["FAST_SLOW_INTERVAL_SECONDS_MIN"], config["FAST_SLOW_INTERVAL_SECONDS_MAX"])
-    last_fast_slow = pygame.time.get_ticks()
+
+    # Random gameplay events, each one waits in the timer heap until its turn.
+    # Returning False means chat has the same thing queued, so the timer tries again shortly.
+    timers = EventTimers()
+
+    def random_tnt():
+        if chat_control and command_scheduler.has_pending("tnt", "superchat_tnt", "mega_tnt"):
+            return False
+        spawn_placer.request(Tnt)
+
+    def random_pickaxe():
+        if chat_control and command_scheduler.has_pending("pickaxe"):
+            return False
+        pickaxe.random_pickaxe()
+
+    def random_enlarge():
+        if chat_control and command_scheduler.has_pending("big"):
+            return False
+        pickaxe.enlarge(enlarge_duration)
+        # The next interval starts once the pickaxe is back to normal size
+        timers.reset("enlarge", extra_seconds=config["PICKAXE_ENLARGE_DURATION_SECONDS"])
+
+    def random_fast_slow():
+        if chat_control and command_scheduler.has_pending("fast_slow"):
+            return False
+        # Randomly choose between "fast" and "slow"
+        speed = random.choice(["Fast", "Slow"])
+        print("Changing speed to:", speed)
+        start_fast_slow(speed)
+
+    def start_fast_slow(speed):
+        nonlocal fast_slow_active, fast_slow
+        fast_slow = speed
+        fast_slow_active = True
+        # No random change while one is active, the next interval starts when it ends
+        timers.cancel("fast_slow")
+        timers.after("fast_slow_end", config["FAST_SLOW_DURATION_SECONDS"], end_fast_slow)
+
+    def end_fast_slow():
+        nonlocal fast_slow_active
+        fast_slow_active = False
+        timers.reset("fast_slow")
+
+    timers.every("tnt", random_tnt, config["TNT_SPAWN_INTERVAL_SECONDS_MIN"], config["TNT_SPAWN_INTERVAL_SECONDS_MAX"])
+    timers.every("random_pickaxe", random_pickaxe, config["RANDOM_PICKAXE_INTERVAL_SECONDS_MIN"], config["RANDOM_PICKAXE_INTERVAL_SECONDS_MAX"])
+    timers.every("enlarge", random_enlarge, config["PICKAXE_ENLARGE_INTERVAL_SECONDS_MIN"], config["PICKAXE_ENLARGE_INTERVAL_SECONDS_MAX"])
+    timers.every("fast_slow", random_fast_slow, config["FAST_SLOW_INTERVAL_SECONDS_MIN"], config["FAST_SLOW_INTERVAL_SECONDS_MAX"])
 
     # Camera
     camera = Camera()
 
     # HUD
-    hud = Hud(texture_atlas, atlas_items)
+    hud = Hud(textures)
+
+    # Game state snapshot, written every SAVE_PROGRESS_INTERVAL_SECONDS so a restart can resume
+    snapshot_path = Path(__file__).parent.parent / "logs" / "snapshot.bin"
+    snapshot_writer = SnapshotWriter(snapshot_path)
+    if config["RESUME_FROM_SNAPSHOT"]:
+        resume_start = time.perf_counter()
+        snapshot = load_snapshot(snapshot_path)
+        if snapshot is not None:
+            restore_snapshot(snapshot, pickaxe, camera, hud, command_scheduler)
+            print(f"Resumed from snapshot in {(time.perf_counter() - resume_start) * 1000:.1f}ms")
+    startup_timer.mark("world")
 
     # Explosions
-    explosions = []
+    explosions = EntityStore()
+    visibility = Visibility()
 
     # Youtube
-    yt_poll_interval = 1000 * config["YT_POLL_INTERVAL_SECONDS"]
     last_yt_poll = pygame.time.get_ticks()
-
-    # Save progress interval 
-    save_progress_interval = 1000 * config["SAVE_PROGRESS_INTERVAL_SECONDS"]
-    last_save_progress = pygame.time.get_ticks()
-
-    # Youtupe chat queues
-    queues_pop_interval = 1000 * config["QUEUES_POP_INTERVAL_SECONDS"]
-    last_queues_pop = pygame.time.get_ticks()
+    first_frame = True
+
+    # Save progress
+    metrics_log = MetricsLog(Path(__file__).parent.parent / "logs")
+
+    def save_progress():
+        print("Saving progress...")
+        # Save progress to logs folder (written by a background thread)
+        metrics_log.record({
+            "time": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "depth": int(true_y(pickaxe.body.position.y) // BLOCK_SIZE),
+            "ores": dict(hud.amounts),
+            **stats.take_interval(),
+            "sounds": sound_manager.counters(),
+            **visibility.take_interval(),
+            "frame_budget": frame_budget.take_interval(),
+            "chat_queues": command_scheduler.metrics(),
+        })
+
+        snapshot_writer.save(capture_snapshot(pickaxe, camera, hud, command_scheduler))
+
+    # Work that can wait a few frames runs in the time left after drawing
+    frame_budget = FrameBudget()
+    timers.every("save_progress", lambda: frame_budget.defer("save_progress", save_progress), config["SAVE_PROGRESS_INTERVAL_SECONDS"])
+
+    # Optional memory growth monitor, logs to logs/memory_YYYY-MM-DD.jsonl
+    if config["MEMORY_WATCHDOG"]:
+        memory_watchdog = MemoryWatchdog(Path(__file__).parent.parent / "logs", config["MEMORY_WATCHDOG_WARN_MB_PER_HOUR"])
+        memory_watchdog.count("chunks", lambda: len(chunks))
+        memory_watchdog.count("chunk_blocks", lambda: sum(block is not None for chunk in chunks.values() for row in chunk for block in row))
+        memory_watchdog.count("space_bodies", lambda: len(space.bodies))
+        memory_watchdog.count("space_shapes", lambda: len(space.shapes))
+        memory_watchdog.count("collision_handlers", registered_handler_count)
+        memory_watchdog.count("tnts_live", lambda: len(tnt_store))
+        memory_watchdog.count("tnts_built", lambda: tnt_pool.created)
+        memory_watchdog.count("explosions", lambda: len(explosions))
+        # Only there once chat control loaded the YouTube client
+        memory_watchdog.count("seen_messages", lambda: len(sys.modules["youtube"].seen_messages) if "youtube" in sys.modules else 0)
+        memory_watchdog.count_instances("blocks", Block)
+        memory_watchdog.count_instances("tnts", Tnt)
+        memory_watchdog.count_instances("pymunk_bodies", pymunk.Body)
+        memory_watchdog.count_instances("pymunk_shapes", pymunk.Shape)
+        timers.every("memory_watchdog", lambda: frame_budget.defer("memory_watchdog", memory_watchdog.check), config["MEMORY_WATCHDOG_INTERVAL_SECONDS"])
+
+    # Optional Prometheus endpoint on localhost, it only ever sees the dicts published here
+    metrics_endpoint = None
+    if config["METRICS_ENDPOINT"]:
+        metrics_endpoint = MetricsEndpoint(config["METRICS_ENDPOINT_PORT"])
+    frame_window = []  # Frame times since the last publish
+    step_window = []  # Physics step times since the last publish
+
+    def publish_metrics():
+        frame_times = sorted(frame_window)
+        count = len(frame_times)
+        chat_queues = command_scheduler.metrics()
+        metrics_endpoint.publish({
+            "fps": round(clock.get_fps(), 2),
+            "frame_ms": {quantile: round(frame_times[min(count - 1, int(count * quantile))], 3) for quantile in (0.5, 0.95, 0.99)},
+            "physics_step_ms": round(sum(step_window) / len(step_window), 3),
+            "chunks_loaded": len(chunks),
+            "physics_shapes": len(space.shapes),
+            "tnts_live": len(tnt_store),
+            "chat_queue_depth": {command_type: queue["depth"] for command_type, queue in chat_queues.items()},
+            "chat_queue_latency_ms": {command_type: round(queue["latency_avg"] * 1000, 3) for command_type, queue in chat_queues.items()},
+            "chat_polls_total": stats.chat_polls,
+            "chat_poll_ms": round(stats.chat_poll_ms, 3),
+            "subscriber_poll_ms": round(stats.subscriber_poll_ms, 3),
+            "api_errors_total": stats.api_errors,
+        })
+        frame_window.clear()
+        step_window.clear()
 
     # Main loop
     running = True
     while running:
+        frame_start = time.perf_counter()
+
         # ++++++++++++++++++  EVENTS ++++++++++++++++++ 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:  # Close window event
@@ -264,6 +406,11 @@ def game():
                 window_width, window_height = new_width, new_height
                 screen = pygame.display.set_mode((window_width, window_height), pygame.RESIZABLE)
 
+        if render_process is not None:
+            quit_requested, key_t_down, key_m_down = render_process.input()
+            if quit_requested:
+                running = False
+
         # ++++++++++++++++++  UPDATE ++++++++++++++++++
         # Determine which chunks are visible
         # Update physics
@@ -274,221 +421,238 @@ def game():
         elif fast_slow_active and fast_slow == "Slow":
             step_speed = 1 / (FRAMERATE * 2)
 
+        step_start = time.perf_counter()
         space.step(step_speed) 
-
-        start_chunk_y = int(pickaxe.body.position.y // (CHUNK_HEIGHT * BLOCK_SIZE) - 1) - 1
-        end_chunk_y = int(pickaxe.body.position.y + INTERNAL_HEIGHT) // (CHUNK_HEIGHT * BLOCK_SIZE)  + 1
+        step_ms = (time.perf_counter() - step_start) * 1000
 
         # Update pickaxe
         pickaxe.update()
 
+        # Shift everything back toward zero every ORIGIN_REBASE_CHUNKS chunks of falling
+        if rebase_if_needed(config["ORIGIN_REBASE_CHUNKS"], space, pickaxe, tnt_store, explosions, camera):
+            # Queued chunk jobs hold local chunk rows from before the shift
+            frame_budget.cancel("chunk")
+            frame_budget.cancel("clean_chunks")
+
         # Update camera
         camera.update(pickaxe.body.position.y)
 
+        # Visible world rect, and the chunks simulated around it
+        visibility.update(camera)
+        start_chunk_y, end_chunk_y = visibility.chunk_range()
+
         # ++++++++++++++++++  DRAWING ++++++++++++++++++
-        # Clear the internal surface
-        screen.fill((0, 0, 0))
+        if render_process is None:
+            # Clear the internal surface
+            screen.fill((0, 0, 0))
 
-        # Fill internal surface with the background
-        internal_surface.blit(background_image, ((INTERNAL_WIDTH - background_width) // 2, (INTERNAL_HEIGHT - background_height) // 2))
+            # Fill internal surface with the background
+            internal_surface.blit(background_image, ((INTERNAL_WIDTH - background_width) // 2, (INTERNAL_HEIGHT - background_height) // 2))
+        else:
+            render_process.frame.begin()
 
-        # Check if it's time to spawn a new TNT (regular random spawn)
+        # Random events that are due
         current_time = pygame.time.get_ticks()
-        if (not config["CHAT_CONTROL"] or (not tnt_queue and not tnt_superchat_queue and not mega_tnt_queue)) and current_time - last_tnt_spawn >= tnt_spawn_interval:
-             # Example: spawn TNT at position (400, 300) with a given texture
-             new_tnt = Tnt(space, pickaxe.body.position.x, pickaxe.body.position.y - 100,
-               texture_atlas, atlas_items, sound_manager)
-             tnt_list.append(new_tnt)
-             last_tnt_spawn = current_time
-             # New random interval for the next TNT spawn
-             tnt_spawn_interval = 1000 * random.uniform(config["TNT_SPAWN_INTERVAL_SECONDS_MIN"], config["TNT_SPAWN_INTERVAL_SECONDS_MAX"]) 
-
-        # Check if it's time to change the pickaxe (random)
-        if (not config["CHAT_CONTROL"] or not pickaxe_queue) and current_time - last_random_pickaxe >= random_pickaxe_interval:
-            pickaxe.random_pickaxe(texture_atlas, atlas_items)
-            last_random_pickaxe = current_time
-            # New random interval for the next pickaxe change
-            random_pickaxe_interval = 1000 * random.uniform(config["RANDOM_PICKAXE_INTERVAL_SECONDS_MIN"], config["RANDOM_PICKAXE_INTERVAL_SECONDS_MAX"])
-
-        # Check if it's time for pickaxe enlargement (random)
-        if (not config["CHAT_CONTROL"] or not big_queue) and current_time - last_enlarge >= enlarge_interval:
-            pickaxe.enlarge(enlarge_duration)
-            last_enlarge = current_time + enlarge_duration
-            # New random interval for the next enlargement
-            enlarge_interval = 1000 * random.uniform(config["PICKAXE_ENLARGE_INTERVAL_SECONDS_MIN"], config["PICKAXE_ENLARGE_INTERVAL_SECONDS_MAX"])
-
-        # Check if it's time to change speed (random)
-        if (not config["CHAT_CONTROL"] or not fast_slow_queue) and current_time - last_fast_slow >= fast_slow_interval and not fast_slow_active:
-            # Randomly choose between "fast" and "slow"
-            fast_slow = random.choice(["Fast", "Slow"])
-            print("Changing speed to:", fast_slow)
-            fast_slow_active = True
-            last_fast_slow = current_time
-            # New random interval for the next fast/slow spawn
-            fast_slow_interval = 1000 * random.uniform(config["FAST_SLOW_INTERVAL_SECONDS_MIN"], config["FAST_SLOW_INTERVAL_SECONDS_MAX"])
-        elif current_time - last_fast_slow >= (1000 * config["FAST_SLOW_DURATION_SECONDS"]) and fast_slow_active:
-            fast_slow_active = False
-            last_fast_slow = current_time
+        timers.update()
 
         # Update all TNTs
-        for tnt in tnt_list:
-            tnt.update(tnt_list, explosions, camera)
+        for tnt in tnt_store:
+            tnt.update(tnt_store, explosions, camera)
+        tnt_store.flush()
 
         # Poll Yotutube api 
-        if live_chat_id is not None and current_time - last_yt_poll >= yt_poll_interval:
-            print("Polling YouTube API...")
+        if chat_source is not None and current_time - last_yt_poll >= 1000 * chat_source.poll_interval:
+            if isinstance(chat_source, YoutubeChatSource):
+                print("Polling YouTube API...")
             last_yt_poll = current_time
             asyncio.run_coroutine_threadsafe(handle_youtube_poll(), asyncio_loop)
 
-        # Process chat queues
-        if config["CHAT_CONTROL"] and current_time - last_queues_pop >= queues_pop_interval:
-            last_queues_pop = current_time
-            
-            # Handle regular TNT from chat command
-            if tnt_queue:
-                author = tnt_queue.pop(0)
-                print(f"Spawning regular TNT for {author} (from chat command)")
-                new_tnt = Tnt(space, pickaxe.body.position.x, pickaxe.body.position.y - 100,
-                             texture_atlas, atlas_items, sound_manager, owner_name=author)
-                tnt_list.append(new_tnt)
-                last_tnt_spawn = current_time 
-            
-            # Handle MegaTNT (New Subscriber)
-            if mega_tnt_queue:
-                author = mega_tnt_queue.pop(0)
-                print(f"Spawning MegaTNT for {author} (New Subscriber)")
-                new_megatnt = MegaTnt(space, pickaxe.body.position.x, pickaxe.body.position.y - 100,
-                      texture_atlas, atlas_items, sound_manager, owner_name=author)
-                tnt_list.append(new_megatnt)
-                last_tnt_spawn = current_time 
-
-            # Handle Superchat/Supersticker TNT
-            if tnt_superchat_queue:
-                author, text = tnt_superchat_queue.pop(0)
-                print(f"Spawning TNT for {author} (Superchat: {text})")
-                last_tnt_spawn = current_time 
-                for _ in range(config["TNT_AMOUNT_ON_SUPERCHAT"]):
-                    new_tnt = Tnt(space, pickaxe.body.position.x, pickaxe.body.position.y - 100, texture_atlas, atlas_items, sound_manager, owner_name=author)
-                    tnt_list.append(new_tnt)
-            
-            # Handle Fast/Slow command
-            if fast_slow_queue:
-                author, q_fast_slow = fast_slow_queue.pop(0)
-                print(f"Changing speed for {author} to {q_fast_slow}")
-                fast_slow_active = True
-                last_fast_slow = current_time
-                fast_slow = q_fast_slow
-                fast_slow_interval = 1000 * random.uniform(config["FAST_SLOW_INTERVAL_SECONDS_MIN"], config["FAST_SLOW_INTERVAL_SECONDS_MAX"])
-
-            # Handle Big pickaxe command
-            if big_queue:
-                author = big_queue.pop(0)
-                print(f"Making pickaxe big for {author}")
-                pickaxe.enlarge(enlarge_duration)
-                last_enlarge = current_time + enlarge_duration
-                enlarge_interval = 1000 * random.uniform(config["PICKAXE_ENLARGE_INTERVAL_SECONDS_MIN"], config["PICKAXE_ENLARGE_INTERVAL_SECONDS_MAX"])
-
-            # Handle Pickaxe type command
-            if pickaxe_queue:
-                author, pickaxe_type = pickaxe_queue.pop(0)
-                print(f"Changing pickaxe for {author} to {pickaxe_type}")
-                pickaxe.pickaxe(pickaxe_type, texture_atlas, atlas_items)
-                last_random_pickaxe = current_time
-                random_pickaxe_interval = 1000 * random.uniform(config["RANDOM_PICKAXE_INTERVAL_SECONDS_MIN"], config["RANDOM_PICKAXE_INTERVAL_SECONDS_MAX"])
-
+        # Poll subscriber count
+        if subscriber_watcher is not None and subscriber_watcher.due():
+            subscriber_watcher.in_flight = True  # Don't schedule again before the poll finishes
+            asyncio.run_coroutine_threadsafe(handle_subscriber_poll(), asyncio_loop)
+
+        # Process chat commands that are within their rate budget
+        if chat_control:
+            for command in command_scheduler.poll():
+                author = command.author
+
+                # Handle regular TNT from chat command
+                if command.type == "tnt":
+                    print(f"Spawning regular TNT for {author} (from chat command)")
+                    spawn_placer.request(Tnt, author)
+                    timers.reset("tnt")
+
+                # Handle MegaTNT (New Subscriber)
+                elif command.type == "mega_tnt":
+                    print(f"Spawning MegaTNT for {author} (New Subscriber)")
+                    spawn_placer.request(MegaTnt, author)
+                    timers.reset("tnt")
+
+                # Handle Superchat/Supersticker TNT
+                elif command.type == "superchat_tnt":
+                    print(f"Spawning TNT for {author} (Superchat: {command.payload})")
+                    timers.reset("tnt")
+                    for _ in range(config["TNT_AMOUNT_ON_SUPERCHAT"]):
+                        spawn_placer.request(Tnt, author)
+
+                # Handle Fast/Slow command (all pending votes collapse into one)
+                elif command.type == "fast_slow":
+                    print(f"Changing speed to {command.payload} ({command.votes} votes, first by {author})")
+                    start_fast_slow(command.payload)
+
+                # Handle Big pickaxe command
+                elif command.type == "big":
+                    print(f"Making pickaxe big ({command.votes} votes, first by {author})")
+                    pickaxe.enlarge(enlarge_duration)
+                    timers.reset("enlarge", extra_seconds=config["PICKAXE_ENLARGE_DURATION_SECONDS"])
+
+                # Handle Pickaxe type command
+                elif command.type == "pickaxe":
+                    print(f"Changing pickaxe to {command.payload} ({command.votes} votes, first by {author})")
+                    pickaxe.pickaxe(command.payload)
+                    timers.reset("random_pickaxe")
+
+        # Spawn queued TNTs where there is room above the pickaxe
+        spawn_placer.update(pickaxe.body.position.x, pickaxe.body.position.y - 100)
 
         # Delete chunks 
-        clean_chunks(start_chunk_y)
+        frame_budget.defer("clean_chunks", partial(clean_chunks, start_chunk_y, space))
 
-        # Draw blocks in visible chunks
+        # Update blocks in simulated chunks, draw only the rows on screen
         for chunk_x in range(-1, 2):
             for chunk_y in range(start_chunk_y, end_chunk_y):
+                visible_rows = visibility.visible_rows(chunk_x, chunk_y)
+                if world_chunk_y(chunk_y) >= 0 and (chunk_x, chunk_y) not in chunks and not visible_rows:
+                    # Off screen, generate it once a frame has time to spare
+                    frame_budget.defer(("chunk", chunk_x, chunk_y), partial(ensure_chunk, chunk_x, chunk_y, textures, space), max_wait_frames=10)
+                    continue
                 for y in range(CHUNK_HEIGHT):
+                    visible = y in visible_rows
                     for x in range(CHUNK_WIDTH):
-                        block = get_block(chunk_x, chunk_y, x, y, texture_atlas, atlas_items, space)
+                        block = get_block(chunk_x, chunk_y, x, y, textures, space)
                         
                         if block == None:
                             continue
                         
                         block.update(space, hud)
-                        block.draw(internal_surface, camera)
-
-        # Draw pickaxe
-        pickaxe.draw(internal_surface, camera)
+                        if block.destroyed:
+                            continue
+                        if visible:
+                            if render_process is None:
+                                block.draw(render_queue, camera)
+                            else:
+                                render_process.frame.block(block)
+                            visibility.count("block", 1)
+                        else:
+                            visibility.count("block", 0, 1)
+
+        # Draw pickaxe (the render process gets it with the rest of the frame)
+        if render_process is None:
+            pickaxe.draw(render_queue, camera)
 
         # Draw TNT
-        for tnt in tnt_list:
-            tnt.draw(internal_surface, camera)
+        for tnt in tnt_store:
+            if visibility.circle_visible("tnt", tnt.body.position.x, tnt.body.position.y, tnt.cull_radius):
+                if render_process is None:
+                    tnt.draw(render_queue, camera)
+                else:
+                    render_process.frame.tnt(tnt)
 
         # Draw particles
         for explosion in explosions:
             explosion.update()
-            explosion.draw(internal_surface, camera)
-            
-        # Optionally, remove explosions that have no particles left:
-        explosions = [e for e in explosions if e.particles]
-
-        # Draw HUD
-        hud.draw(internal_surface, pickaxe.body.position.y, fast_slow_active, fast_slow)
-
-        # Scale internal surface to fit the resized window
-        scaled_surface = pygame.transform.smoothscale(internal_surface, (window_width, window_height))
-        screen.blit(scaled_surface, (0, 0))
-
-        # Save progress
-        if current_time - last_save_progress >= save_progress_interval:
-            # Save the game state or progress here
-            print("Saving progress...")
-            last_save_progress = current_time
-            # Save progress to logs folder
-            log_dir = Path(__file__).parent.parent / "logs"
-            log_dir.mkdir(parents=True, exist_ok=True)
-            with open(log_dir / "progress.txt", "a+") as f:
-                f.write(f"Date: {time.strftime('%Y-%m-%d %H:%M:%S')} | ")
-                f.write(f"Y: {-int(pickaxe.body.position.y // BLOCK_SIZE)} ")
-                f.write(f"coal: {hud.amounts['coal']} ")
-                f.write(f"iron: {hud.amounts['iron_ingot']} ")   
-                f.write(f"gold: {hud.amounts['gold_ingot']} ")
-                f.write(f"copper: {hud.amounts['copper_ingot']} ")
-                f.write(f"redstone: {hud.amounts['redstone']} ")
-                f.write(f"lapis: {hud.amounts['lapis_lazuli']} ")
-                f.write(f"diamond: {hud.amounts['diamond']} ")
-                f.write(f"emerald: {hud.amounts['emerald']} \n")
-
-        # Update the display
-        pygame.display.flip()
+            if render_process is None:
+                explosion.draw(render_queue, camera, visibility)
+            else:
+                render_process.frame.explosion(explosion, visibility)
+
+            # Remove explosions that have no particles left
+            if not explosion.particles:
+                explosions.remove(explosion.entity_id)
+        explosions.flush()
+
+        if render_process is None:
+            # Draw HUD
+            hud.draw(render_queue, true_y(pickaxe.body.position.y), fast_slow_active, fast_slow)
+
+            # Blit everything queued this frame, one batched call per layer
+            render_queue.flush(internal_surface)
+
+            # Scale internal surface to fit the resized window
+            scaled_surface = pygame.transform.smoothscale(internal_surface, (window_width, window_height))
+            screen.blit(scaled_surface, (0, 0))
+
+        # Update the display, or hand the frame to the render process
+        if render_process is None:
+            pygame.display.flip()
+        else:
+            render_process.publish(render_process.frame.finish(camera, pickaxe, hud, fast_slow_active, fast_slow))
+
+        # The frame is out, spend what is left of it on deferred jobs
+        frame_budget.run(frame_start)
+        frame_ms = (time.perf_counter() - frame_start) * 1000
+        stats.frame(frame_ms)
+
+        # Hand the metrics endpoint a fresh set of values once a second
+        if metrics_endpoint is not None:
+            frame_window.append(frame_ms)
+            step_window.append(step_ms)
+            if len(frame_window) == FRAMERATE:
+                publish_metrics()
+
+        # Connect to chat only once the window shows something, lookups can take seconds
+        if first_frame:
+            first_frame = False
+            startup_timer.mark("first frame")
+            startup_timer.report()
+            if chat_control:
+                asyncio.run_coroutine_threadsafe(init_chat(), asyncio_loop)
+
         clock.tick(FRAMERATE)  # Cap the frame rate
 
         # Inside the main loop
-        keys = pygame.key.get_pressed()
+        if render_process is None:
+            keys = pygame.key.get_pressed()
+            key_t_down, key_m_down = keys[pygame.K_t], keys[pygame.K_m]
 
         # Handle TNT spawn (key T)
-        if keys[pygame.K_t]:
+        if key_t_down:
             if not key_t_pressed:  # Only spawn if the key was not pressed in the previous frame
-                new_tnt = Tnt(space, pickaxe.body.position.x, pickaxe.body.position.y - 100,
-                            texture_atlas, atlas_items, sound_manager)
-                tnt_list.append(new_tnt)
-                last_tnt_spawn = current_time
+                spawn_placer.request(Tnt)
                 # New random interval for the next TNT spawn
-                tnt_spawn_interval = 1000 * random.uniform(config["TNT_SPAWN_INTERVAL_SECONDS_MIN"], config["TNT_SPAWN_INTERVAL_SECONDS_MAX"])
+                timers.reset("tnt")
             key_t_pressed = True
         else:
             key_t_pressed = False  # Reset the flag when the key is released
 
         # Handle MegaTNT spawn (key M)
-        if keys[pygame.K_m]:
+        if key_m_down:
             if not key_m_pressed:  # Only spawn if the key was not pressed in the previous frame
-                new_megatnt = MegaTnt(space, pickaxe.body.position.x, pickaxe.body.position.y - 100,
-                                    texture_atlas, atlas_items, sound_manager)
-                tnt_list.append(new_megatnt)
-                last_tnt_spawn = current_time
+                spawn_placer.request(MegaTnt)
                 # New random interval for the next TNT spawn
-                tnt_spawn_interval = 1000 * random.uniform(config["TNT_SPAWN_INTERVAL_SECONDS_MIN"], config["TNT_SPAWN_INTERVAL_SECONDS_MAX"])
+                timers.reset("tnt")
             key_m_pressed = True
         else:
             key_m_pressed = False  # Reset the flag when the key is released
 
+    # Save the final state before quitting
+    snapshot_writer.flush(capture_snapshot(pickaxe, camera, hud, command_scheduler))
+
+    if render_process is not None:
+        render_process.close()
+
     # Quit pygame properly
     pygame.quit()
 
-game()
\ No newline at end of file
+# Guarded, the render process imports this module again when it starts
+if __name__ == "__main__":
+    # Chat command scheduler, created here because the render process imports this module again as __mp_main__
+    command_scheduler = CommandScheduler(config["QUEUES_POP_INTERVAL_SECONDS"], config["COMMAND_BUDGETS"])
+
+    # Create a new event loop
+    asyncio_loop = asyncio.new_event_loop()
+    # Start it in a daemon thread so it doesn’t block shutdown
+    threading.Thread(target=start_event_loop, args=(asyncio_loop,), daemon=True).start()
+
+    game()
\ No newline at end of file
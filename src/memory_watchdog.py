@@ -0,0 +1,88 @@
+import gc
+import os
+import time
+import tracemalloc
+from metrics_log import MetricsLog
+
+# Allocations made by the watchdog itself and by imports are not what we are looking for
+IGNORED_FILES = (__file__, tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+class MemoryWatchdog:
+    def __init__(self, log_dir, warn_mb_per_hour, top=10):
+        """
+        Looks for memory growth on long streams. Every check takes a tracemalloc snapshot, compares it
+        with the previous one and appends the totals, the object counts and the top growth sites to
+        logs/memory_YYYY-MM-DD.jsonl. Tracing slows every allocation down, so it is off unless enabled.
+
+        check runs on the game thread: tracemalloc.take_snapshot and the scan of gc.get_objects for
+        count_instances take tens to hundreds of milliseconds on a long stream, and FrameBudget runs
+        the check anyway once it has waited max_wait_frames, so expect a slow frame with every check.
+
+        :param warn_mb_per_hour: Print a warning when traced memory grew faster than this since the last check.
+        :param top: Growth sites (file and line) kept per record.
+        """
+        self.warn_mb_per_hour = warn_mb_per_hour
+        self.top = top
+        self.counters = {}  # Name -> function returning a count
+        self.classes = {}  # Name -> class whose live instances are counted
+        self.previous = None  # (snapshot, traced bytes, perf_counter) of the last check
+        self.metrics_log = MetricsLog(log_dir, prefix="memory")
+
+        tracemalloc.start()
+
+    def count(self, name, function):
+        """Log function() with every check, e.g. the number of chunks."""
+        self.counters[name] = function
+
+    def count_instances(self, name, cls):
+        """Log how many instances of cls (and subclasses) are alive, whether anything still uses them or not."""
+        self.classes[name] = cls
+
+    def instance_counts(self):
+        counts = dict.fromkeys(self.classes, 0)
+        for obj in gc.get_objects():
+            for name, cls in self.classes.items():
+                if isinstance(obj, cls):
+                    counts[name] += 1
+        return counts
+
+    def check(self):
+        """Take a snapshot, log what grew since the last check and warn if it grew too fast."""
+        now = time.perf_counter()
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, path) for path in IGNORED_FILES])
+        traced, peak = tracemalloc.get_traced_memory()
+
+        record = {
+            "time": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "traced_mb": round(traced / 2 ** 20, 2),
+            "peak_mb": round(peak / 2 ** 20, 2),
+            "counts": {name: function() for name, function in self.counters.items()},
+            "instances": self.instance_counts(),
+        }
+
+        if self.previous is not None:
+            previous_snapshot, previous_traced, previous_time = self.previous
+            hours = (now - previous_time) / 3600
+            growth_mb_per_hour = (traced - previous_traced) / 2 ** 20 / hours
+            record["growth_mb_per_hour"] = round(growth_mb_per_hour, 2)
+
+            # compare_to sorts by the size of the change, shrinking sites are not interesting here
+            growth = sorted((stat for stat in snapshot.compare_to(previous_snapshot, "lineno") if stat.size_diff > 0),
+                            key=lambda stat: stat.size_diff, reverse=True)
+            record["top_growth"] = []
+            for stat in growth[:self.top]:
+                frame = stat.traceback[0]
+                record["top_growth"].append({
+                    "site": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                    "size_kb": round(stat.size_diff / 1024, 1),
+                    "count": stat.count_diff,
+                })
+
+            if growth_mb_per_hour > self.warn_mb_per_hour:
+                print(f"Memory grows {growth_mb_per_hour:.1f} MB/h (limit {self.warn_mb_per_hour} MB/h), "
+                      f"traced {record['traced_mb']} MB. Top growth sites:")
+                for site in record["top_growth"][:3]:
+                    print(f"    {site['site']}: {site['size_kb']:+} KB, {site['count']:+} blocks")
+
+        self.previous = (snapshot, traced, now)
+        self.metrics_log.record(record)
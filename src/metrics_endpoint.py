@@ -0,0 +1,91 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Optional, without it memory comes from /proc where there is one
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PREFIX = "falling_pickaxe_"
+
+# Name -> (type, help). Values are numbers, or dicts of label value -> number for the label in LABELS.
+METRICS = {
+    "fps": ("gauge", "Frames per second, averaged by pygame over the last frames."),
+    "frame_ms": ("gauge", "Work per frame in milliseconds over the last second, by quantile."),
+    "physics_step_ms": ("gauge", "Average space.step time in milliseconds over the last second."),
+    "chunks_loaded": ("gauge", "Chunks in memory."),
+    "physics_shapes": ("gauge", "Shapes in the pymunk space."),
+    "tnts_live": ("gauge", "TNTs in the world."),
+    "chat_queue_depth": ("gauge", "Chat commands waiting, by command type."),
+    "chat_queue_latency_ms": ("gauge", "Average wait of dispatched chat commands in milliseconds since the start, by command type."),
+    "chat_polls_total": ("counter", "Chat polls finished."),
+    "chat_poll_ms": ("gauge", "Duration of the last chat poll in milliseconds."),
+    "subscriber_poll_ms": ("gauge", "Duration of the last subscriber count poll in milliseconds."),
+    "api_errors_total": ("counter", "Chat and subscriber polls that raised an error."),
+    "memory_bytes": ("gauge", "Resident memory of the game process."),
+}
+LABELS = {"frame_ms": "quantile", "chat_queue_depth": "type", "chat_queue_latency_ms": "type"}
+
+def process_memory_bytes():
+    """Resident memory of this process, or None if it can't be read here."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def format_metrics(values):
+    """Prometheus text format for a dict of metric name -> value, names missing from values are left out."""
+    lines = []
+    for name, (metric_type, help_text) in METRICS.items():
+        value = values.get(name)
+        if value is None:
+            continue
+        lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} {metric_type}")
+        if isinstance(value, dict):
+            for label_value, number in value.items():
+                lines.append(f'{PREFIX}{name}{{{LABELS[name]}="{label_value}"}} {number}')
+        else:
+            lines.append(f"{PREFIX}{name} {value}")
+    return "\n".join(lines) + "\n"
+
+class MetricsEndpoint:
+    def __init__(self, port, host="127.0.0.1"):
+        """
+        Serves GET /metrics in Prometheus text format from a background thread. The game only hands
+        over a finished dict with publish, the server never reads game objects.
+
+        :param port: Port to listen on, on localhost only by default.
+        """
+        self.values = {}  # Replaced as a whole by publish, never changed in place
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                values = endpoint.values  # The dict published last, publish never changes it afterwards
+                body = format_metrics({**values, "memory_bytes": process_memory_bytes()}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # A scrape every few seconds would flood the console
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"Metrics at http://{host}:{port}/metrics")
+
+    def publish(self, values):
+        """Make values the current metrics. One reference assignment, a scrape sees the old or the new dict."""
+        self.values = values
@@ -0,0 +1,43 @@
+import json
+import queue
+import threading
+from pathlib import Path
+
+class MetricsLog:
+    def __init__(self, log_dir, prefix="metrics"):
+        """
+        Appends records to logs/metrics_YYYY-MM-DD.jsonl (one JSON object per line) from a background thread.
+
+        :param log_dir: Folder for the metrics files.
+        :param prefix: File name prefix, e.g. "memory" for logs/memory_YYYY-MM-DD.jsonl.
+        """
+        self.log_dir = Path(log_dir)
+        self.prefix = prefix
+        self.queue = queue.Queue()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def record(self, record):
+        """Queue a record, it must have a "time" field formatted as "YYYY-MM-DD HH:MM:SS"."""
+        self.queue.put(record)
+
+    def run(self):
+        while True:
+            # Wait for one record, then take everything else that is already queued as one batch
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines_by_day = {}
+            for record in batch:
+                lines_by_day.setdefault(record["time"][:10], []).append(json.dumps(record, separators=(",", ":")))
+
+            try:
+                self.log_dir.mkdir(parents=True, exist_ok=True)
+                for day, lines in lines_by_day.items():
+                    with open(self.log_dir / f"{self.prefix}_{day}.jsonl", "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+            except OSError as e:
+                print("Could not write metrics:", e)
@@ -0,0 +1,42 @@
+import chunk as world
+from constants import CHUNK_PIXEL_HEIGHT
+
+def true_y(y):
+    """World y of a local y, e.g. for the depth shown on the HUD."""
+    return y + world.origin_chunk_y * CHUNK_PIXEL_HEIGHT
+
+def rebase(shift, space, pickaxe, tnt_store, explosions, camera):
+    """
+    Move the local origin shift chunk rows down: the pickaxe, TNTs, explosions, blocks and camera all
+    move up by the same whole number of chunks, so nothing changes relative to anything else.
+    """
+    dy = shift * CHUNK_PIXEL_HEIGHT
+
+    pickaxe.body.position = (pickaxe.body.position.x, pickaxe.body.position.y - dy)
+    for tnt in tnt_store:
+        tnt.body.position = (tnt.body.position.x, tnt.body.position.y - dy)
+    for explosion in explosions:
+        for particle in explosion.particles:
+            particle.pos.y -= dy
+    camera.offset_y -= dy
+
+    world.shift_chunks(shift)
+    # Blocks are static, their shapes stay where they were in the broadphase until reindexed.
+    # One call for every static shape is several times faster than reindex_shapes_for_body per block.
+    space.reindex_static()
+
+def rebase_if_needed(max_chunks, space, pickaxe, tnt_store, explosions, camera):
+    """
+    Rebase once the pickaxe is max_chunks chunk rows below the local origin.
+
+    :return: True if the origin moved.
+    """
+    pickaxe_chunk_y = int(pickaxe.body.position.y // CHUNK_PIXEL_HEIGHT)
+    if pickaxe_chunk_y < max_chunks:
+        return False
+
+    # Keep the pickaxe's chunk row at 1, the chunk above it stays simulated
+    shift = pickaxe_chunk_y - 1
+    rebase(shift, space, pickaxe, tnt_store, explosions, camera)
+    print(f"Rebased world origin to chunk row {world.origin_chunk_y}")
+    return True
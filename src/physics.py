@@ -0,0 +1,69 @@
+import math
+import pymunk
+from constants import BLOCK_SIZE, CHUNK_PIXEL_HEIGHT, CHUNK_WIDTH
+
+# Fastest anything falls, in pixels per second
+TERMINAL_VELOCITY = 1000
+
+WALL_RADIUS = BLOCK_SIZE / 2  # Thick enough that nothing passes through in one step
+
+# Space settings, chosen by name with PHYSICS_PROFILE in the config. Compare them on your
+# machine with benchmarks/physics_profiles.py.
+#   spatial_hash    Broadphase: False for pymunk's default bounding box tree, True for a hash with
+#                   block sized cells, which suits a grid of equal static boxes
+#   iterations      Solver iterations per step
+#   collision_slop  Overlap in pixels the solver leaves alone, more means less jitter on resting contacts
+#   sleep_time      Seconds at rest before a body sleeps. A sleeping pickaxe stops mining and never wakes
+#                   up on its own, so every profile keeps sleeping off (inf)
+PROFILES = {
+    "default": {"spatial_hash": False, "iterations": 10, "collision_slop": 0.1, "sleep_time": math.inf},
+    "spatial_hash": {"spatial_hash": True, "iterations": 10, "collision_slop": 0.1, "sleep_time": math.inf},
+    "light": {"spatial_hash": False, "iterations": 6, "collision_slop": 0.5, "sleep_time": math.inf},
+    "spatial_hash_light": {"spatial_hash": True, "iterations": 6, "collision_slop": 0.5, "sleep_time": math.inf},
+}
+
+# Spatial hash cells, about ten per shape is what chipmunk recommends
+SPATIAL_HASH_COUNT = 20000
+
+def create_space(profile_name="default"):
+    """A space with the game's gravity and the settings of a profile from PROFILES."""
+    if profile_name not in PROFILES:
+        print(f"Unknown physics profile {profile_name}, using default")
+        profile_name = "default"
+    profile = PROFILES[profile_name]
+
+    space = pymunk.Space()
+    space.gravity = (0, 1000)  # (x, y) - down is positive y
+    space.iterations = profile["iterations"]
+    space.collision_slop = profile["collision_slop"]
+    space.sleep_time_threshold = profile["sleep_time"]
+    if profile["spatial_hash"]:
+        space.use_spatial_hash(BLOCK_SIZE, SPATIAL_HASH_COUNT)
+    return space
+
+def limit_fall_speed(body, gravity, damping, dt):
+    """velocity_func for falling bodies: the usual integration, then cap the downward speed."""
+    pymunk.Body.update_velocity(body, gravity, damping, dt)
+    if body.velocity.y > TERMINAL_VELOCITY:
+        body.velocity = (body.velocity.x, TERMINAL_VELOCITY)
+
+def add_walls(space, bottom):
+    """
+    Static walls on the inner faces of the bedrock columns, so nothing leaves the shaft
+    even when it gets pushed into the bedrock blocks.
+
+    :param bottom: Lowest local y the walls reach. They start a chunk above the top of the world.
+                   Keep it as short as the origin rebasing allows, a spatial hash puts the walls
+                   into every cell along them.
+    """
+    left = BLOCK_SIZE - WALL_RADIUS
+    right = BLOCK_SIZE * (CHUNK_WIDTH - 1) + WALL_RADIUS
+    walls = []
+    for x in (left, right):
+        wall = pymunk.Segment(space.static_body, (x, -CHUNK_PIXEL_HEIGHT), (x, bottom), WALL_RADIUS)
+        # Same surface as bedrock, where both touch the bounce is the same as off the block alone
+        wall.elasticity = 1
+        wall.friction = 1
+        walls.append(wall)
+    space.add(*walls)
+    return walls
@@ -3,9 +3,14 @@ import math
 import pymunk
 import pymunk.autogeometry
 from chunk import chunks
-from constants import BLOCK_SIZE, CHUNK_WIDTH
+from constants import BLOCK_SIZE
+from collision import PICKAXE
+from physics import limit_fall_speed
 import random
 
+# Size of the pickaxe texture while enlarged (3 times bigger)
+ENLARGED_SIZE = (BLOCK_SIZE * 3, BLOCK_SIZE * 3)
+
 def rotate_point(x, y, angle):
     """Rotate a point (x, y) by angle (in radians) around the origin (0, 0)."""
     cos_angle = math.cos(angle)
@@ -27,8 +32,10 @@ def rotate_vertices(vertices, angle):
         return rotated_vertices
 
 class Pickaxe:
-    def __init__(self, space, x, y, texture, sound_manager, damage=2, velocity=0, rotation=0, mass=100):
-        self.texture = texture
+    def __init__(self, space, x, y, textures, sound_manager, name="wooden_pickaxe", damage=2, velocity=0, rotation=0, mass=100):
+        self.textures = textures
+        self.name = name
+        self.texture = textures.get("pickaxe", name)
         self.velocity = velocity
         self.rotation = rotation
         self.space = space
@@ -66,6 +73,7 @@ class Pickaxe:
         self.body = pymunk.Body(mass, inertia)
         self.body.position = (x, y)
         self.body.angle = math.radians(rotation)
+        self.body.velocity_func = limit_fall_speed  # Terminal velocity, applied inside the step
 
         self.sound_manager = sound_manager
 
@@ -74,68 +82,57 @@ class Pickaxe:
             shape = pymunk.Poly(self.body, vertices)
             shape.elasticity = 0.7
             shape.friction = 0.7
-            shape.collision_type = 1  # Identifier for collisions
+            shape.collision_type = PICKAXE  # Identifier for collisions
+            shape.block_ref = self  # collision.py routes block hits to on_collision
             self.shapes.append(shape)
 
         self.space.add(self.body, *self.shapes)
 
-        # Add collision handler for pickaxe & blocks
-        handler = space.add_collision_handler(1, 2)  # (Pickaxe type, Block type)
-        handler.post_solve = self.on_collision
+        # Blocks touched during the current physics step, applied by apply_hits (dict keeps hit order)
+        self.hits = {}
 
     def on_collision(self, arbiter, space, data):
-        """Handles collision with blocks: Reduce HP or destroy the block."""
-        block_shape = arbiter.shapes[1]  # Get the block shape
-        block = block_shape.block_ref  # Get the actual block instance
+        """Remember which block was hit, pymunk calls this for every touching shape pair on every step."""
+        block = arbiter.shapes[1].block_ref  # Get the actual block instance
+        self.hits[block] = None
+
+    def apply_hits(self):
+        """Damage each block hit during the last physics step once, however many contacts it had."""
+        if not self.hits:
+            return
+
+        current_time = pygame.time.get_ticks()
+        for block in self.hits:
+            block.first_hit_time = current_time
+            block.last_heal_time = current_time
 
-        block.first_hit_time = pygame.time.get_ticks()  
-        block.last_heal_time = block.first_hit_time
+            block.hp -= self.damage  # Reduce HP when hit
 
-        block.hp -= self.damage  # Reduce HP when hit
+            if (block.name == "grass_block" or block.name == "dirt"):
+                self.sound_manager.play_sound("grass")
+            else:
+                self.sound_manager.play_sound("stone")
 
-        if (block.name == "grass_block" or block.name == "dirt"):
-            self.sound_manager.play_sound("grass" + str(random.randint(1, 4)))
-        else:
-            self.sound_manager.play_sound("stone" + str(random.randint(1, 4)))
+        self.hits.clear()
 
         # Add small random rotation on hit
         self.body.angle += random.choice([0.01, -0.01])
 
-    def random_pickaxe(self, texture_atlas, atlas_items): 
+    def random_pickaxe(self):
         """Randomly change the pickaxe's properties."""
 
-        pickaxe_name = random.choice(list(atlas_items["pickaxe"].keys()))
-        self.texture = texture_atlas.subsurface(atlas_items["pickaxe"][pickaxe_name])
-        print("Setting pickaxe to:", pickaxe_name)
-
-        if self.is_enlarged:
-            # Scale up texture
-            new_size = (BLOCK_SIZE * 3, BLOCK_SIZE * 3)
-            self.texture = pygame.transform.scale(self.texture, new_size)
-
-        if(pickaxe_name =="wooden_pickaxe"):  
-            self.damage = 2
-        elif(pickaxe_name =="stone_pickaxe"):
-            self.damage = 4
-        elif(pickaxe_name =="iron_pickaxe"):
-            self.damage = 6
-        elif(pickaxe_name =="golden_pickaxe"):
-            self.damage = 8
-        elif(pickaxe_name =="diamond_pickaxe"):
-            self.damage = 10
-        elif(pickaxe_name =="netherite_pickaxe"):
-            self.damage = 12
+        self.pickaxe(random.choice(self.textures.category("pickaxe")))
 
-    def pickaxe(self, name, texture_atlas, atlas_items):
+    def pickaxe(self, name):
         """Set the pickaxe's properties based on its name."""
 
-        self.texture = texture_atlas.subsurface(atlas_items["pickaxe"][name])
+        self.name = name
+        self.texture = self.textures.get("pickaxe", name)
         print("Setting pickaxe to:", name)
 
         if self.is_enlarged:
-            # Scale up texture
-            new_size = (BLOCK_SIZE * 3, BLOCK_SIZE * 3)
-            self.texture = pygame.transform.scale(self.texture, new_size)
+            # Scaled up texture
+            self.texture = self.textures.scaled("pickaxe", name, ENLARGED_SIZE)
 
         if(name =="wooden_pickaxe"):  
             self.damage = 2
@@ -152,47 +149,22 @@ class Pickaxe:
 
     def update(self):
         """Apply gravity, update movement, check collisions, and rotate."""
-        # Manually limit the falling speed (terminal velocity)
-        if self.body.velocity.y > 1000:
-            self.body.velocity = (self.body.velocity.x, 1000)
-
-        # --- Bounding box check for bedrock collision ---
-        # Gather all vertices from all shapes, transformed to world coordinates
-        all_vertices = []
-        for shape in self.shapes:
-            for v in shape.get_vertices():
-                # Transform local vertex to world coordinates
-                world_v = self.body.local_to_world(v)
-                all_vertices.append(world_v)
-
-        min_x = min(v.x for v in all_vertices)
-        max_x = max(v.x for v in all_vertices)
-
-        left_limit = BLOCK_SIZE
-        right_limit = BLOCK_SIZE * (CHUNK_WIDTH - 1)
-
-        # If any part is left of the left limit, shift the body right
-        if min_x < left_limit:
-            dx = left_limit - min_x
-            self.body.position = (self.body.position.x + dx, self.body.position.y)
-
-        # If any part is right of the right limit, shift the body left
-        if max_x > right_limit:
-            dx = max_x - right_limit
-            self.body.position = (self.body.position.x - dx, self.body.position.y)
+        self.apply_hits()
+
+        # Terminal velocity and the bedrock walls are handled by pymunk, see physics.py
 
         # If pickaxe is enlarged, check if time is up
         if hasattr(self, "enlarge_end_time") and pygame.time.get_ticks() > self.enlarge_end_time:
             self.reset_size()
             self.is_enlarged = False
 
-    def draw(self, screen, camera):
+    def draw(self, render_queue, camera):
         """Draw the pickaxe at its current position."""
         rotated_image = pygame.transform.rotate(self.texture, -math.degrees(self.body.angle))  # Convert to degrees
         rect = rotated_image.get_rect(center=(self.body.position.x, self.body.position.y))
         rect.y -= camera.offset_y
         rect.x -= camera.offset_x
-        screen.blit(rotated_image, rect)
+        render_queue.push("entities", rotated_image, rect)
 
     def enlarge(self, duration=5000):
         """Temporarily makes the pickaxe 3 times bigger with a larger hitbox."""
@@ -203,14 +175,12 @@ class Pickaxe:
             self.enlarge_end_time += duration
             return
 
-        # Not enlarged yet, so store original texture and shapes
-        self.original_texture = self.texture.copy()
+        # Not enlarged yet, so store original shapes
         self.original_shapes = self.shapes[:]  # Store original hitbox shapes
         self.is_enlarged = True
 
-        # Scale up texture using the original texture.
-        new_size = (BLOCK_SIZE * 3, BLOCK_SIZE * 3)
-        self.texture = pygame.transform.scale(self.original_texture, new_size)
+        # Scaled up texture
+        self.texture = self.textures.scaled("pickaxe", self.name, ENLARGED_SIZE)
 
         # Scale up hitbox:
         self.space.remove(*self.shapes)  # Remove current shapes
@@ -222,6 +192,7 @@ class Pickaxe:
             new_shape.elasticity = shape.elasticity
             new_shape.friction = shape.friction
             new_shape.collision_type = shape.collision_type
+            new_shape.block_ref = self
             new_shapes.append(new_shape)
         self.shapes = new_shapes
         self.space.add(*self.shapes)  # Add new enlarged shapes
@@ -232,8 +203,8 @@ class Pickaxe:
     def reset_size(self):
         """Restore the pickaxe to its original size."""
         if hasattr(self, "original_shapes"):
-            # Restore texture using the stored original.
-            self.texture = self.original_texture.copy()
+            # Restore texture of the current pickaxe
+            self.texture = self.textures.get("pickaxe", self.name)
 
             # Reset hitbox: remove enlarged shapes and add back the original shapes.
             self.space.remove(*self.shapes)
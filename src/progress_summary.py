@@ -0,0 +1,96 @@
+"""
+Summarize the metrics logs written by the game (logs/metrics_YYYY-MM-DD.jsonl).
+
+    python ./src/progress_summary.py
+    python ./src/progress_summary.py --by month --from 2025-01-01 --to 2025-06-30
+"""
+import argparse
+import json
+from pathlib import Path
+
+ORES = ["coal", "iron_ingot", "copper_ingot", "gold_ingot", "redstone", "lapis_lazuli", "diamond", "emerald"]
+
+def metrics_files(log_dir, date_from=None, date_to=None):
+    """Metrics files in date order, filtered by the date in their name so skipped days are never opened."""
+    for path in sorted(Path(log_dir).glob("metrics_*.jsonl")):
+        day = path.stem[len("metrics_"):]
+        if date_from is not None and day < date_from:
+            continue
+        if date_to is not None and day > date_to:
+            continue
+        yield day, path
+
+def summarize(log_dir, date_from=None, date_to=None, by="day"):
+    """
+    Aggregate records per day or month.
+
+    :return: Dict of period -> summary dict, in period order.
+    """
+    periods = {}
+    for day, path in metrics_files(log_dir, date_from, date_to):
+        period = day if by == "day" else day[:7]
+        summary = periods.setdefault(period, {
+            "samples": 0,
+            "max_depth": 0,
+            "tnt_spawned": 0,
+            "blocks_broken": 0,
+            "frames": 0,
+            "frame_ms_total": 0.0,
+            "frame_ms_p95_worst": 0.0,
+            "frame_ms_max": 0.0,
+            "ores": {ore: 0 for ore in ORES},
+        })
+
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Half written line from a crash
+
+                summary["samples"] += 1
+                summary["max_depth"] = max(summary["max_depth"], record["depth"])
+                summary["tnt_spawned"] += record["tnt_spawned"]
+                summary["blocks_broken"] += record["blocks_broken"]
+                summary["frames"] += record["frames"]
+                summary["frame_ms_total"] += record["frame_ms_avg"] * record["frames"]
+                summary["frame_ms_p95_worst"] = max(summary["frame_ms_p95_worst"], record["frame_ms_p95"])
+                summary["frame_ms_max"] = max(summary["frame_ms_max"], record["frame_ms_max"])
+
+                # Ore amounts are running totals, keep the highest seen
+                for ore, amount in record["ores"].items():
+                    summary["ores"][ore] = max(summary["ores"].get(ore, 0), amount)
+
+    for summary in periods.values():
+        frames = summary.pop("frames")
+        summary["frame_ms_avg"] = summary.pop("frame_ms_total") / frames if frames else 0.0
+
+    return periods
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Summarize Falling Pickaxe metrics logs.")
+    arg_parser.add_argument("--logs", default=Path(__file__).parent.parent / "logs", help="Folder with metrics_*.jsonl files")
+    arg_parser.add_argument("--from", dest="date_from", help="First day to include (YYYY-MM-DD)")
+    arg_parser.add_argument("--to", dest="date_to", help="Last day to include (YYYY-MM-DD)")
+    arg_parser.add_argument("--by", choices=["day", "month"], default="day")
+    arg_parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = arg_parser.parse_args()
+
+    periods = summarize(args.logs, args.date_from, args.date_to, args.by)
+
+    if args.json:
+        print(json.dumps(periods, indent=2))
+        return
+
+    if not periods:
+        print("No metrics found in", args.logs)
+        return
+
+    print(f"{'period':<10} {'samples':>7} {'depth':>8} {'tnt':>7} {'blocks':>8} {'frame ms':>9} {'p95 max':>8} {'max':>8}  ores")
+    for period, summary in periods.items():
+        ores = " ".join(f"{ore}={amount}" for ore, amount in summary["ores"].items() if amount)
+        print(f"{period:<10} {summary['samples']:>7} {summary['max_depth']:>8} {summary['tnt_spawned']:>7} {summary['blocks_broken']:>8} "
+              f"{summary['frame_ms_avg']:>9.2f} {summary['frame_ms_p95_worst']:>8.2f} {summary['frame_ms_max']:>8.2f}  {ores}")
+
+if __name__ == "__main__":
+    main()
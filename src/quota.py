@@ -0,0 +1,89 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# YouTube resets the Data API quota at midnight Pacific time
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+except Exception:  # No tz database (e.g. Windows without tzdata)
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+# Quota cost of the calls we make, in units
+COST_SEARCH = 100
+COST_VIDEOS_LIST = 1
+COST_CHANNELS_LIST = 1
+COST_LIVE_CHAT_MESSAGES_LIST = 5
+
+class QuotaBudget:
+    def __init__(self, daily_units, path=None):
+        """
+        Tracks how many quota units were spent today, per category of call.
+
+        :param daily_units: Daily quota of the Google Cloud project.
+        :param path: Optional json file so the count survives restarts.
+        """
+        self.daily_units = daily_units
+        self.path = path
+        self.lock = threading.Lock()
+        self.day = self._quota_day()
+        self.spent = {}
+
+        if self.path is not None and Path(self.path).exists():
+            try:
+                with open(self.path, "r") as f:
+                    saved = json.load(f)
+                if saved.get("day") == self.day:
+                    self.spent = saved.get("spent", {})
+            except (OSError, ValueError):
+                print("Could not read quota file, starting from zero")
+
+    def _quota_day(self):
+        return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+    def _roll_over(self):
+        day = self._quota_day()
+        if day != self.day:
+            self.day = day
+            self.spent = {}
+
+    def seconds_until_reset(self):
+        now = datetime.now(QUOTA_TIMEZONE)
+        tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (tomorrow - now).total_seconds()
+
+    def spend(self, units, category="other"):
+        """Record a call that cost `units` quota units."""
+        with self.lock:
+            self._roll_over()
+            self.spent[category] = self.spent.get(category, 0) + units
+
+            if self.path is not None:
+                try:
+                    Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.path, "w") as f:
+                        json.dump({"day": self.day, "spent": self.spent}, f)
+                except OSError:
+                    pass
+
+    def used(self, category=None):
+        with self.lock:
+            self._roll_over()
+            if category is None:
+                return sum(self.spent.values())
+            return self.spent.get(category, 0)
+
+    def remaining(self):
+        return max(0, self.daily_units - self.used())
+
+    def pace_interval(self, units, category, share):
+        """
+        Seconds to wait between calls of `units` so that `category` stays within
+        `share` (0-1) of the daily quota until the next reset.
+        """
+        budget = self.daily_units * share - self.used(category)
+        budget = min(budget, self.remaining())
+        if budget < units:
+            return self.seconds_until_reset()  # Out of budget, wait for the reset
+        return self.seconds_until_reset() * units / budget
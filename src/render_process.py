@@ -0,0 +1,265 @@
+import math
+import os
+import struct
+import multiprocessing
+from multiprocessing import shared_memory
+from pathlib import Path
+import pygame
+from constants import BLOCK_SCALE_FACTOR, BLOCK_SIZE, INTERNAL_HEIGHT, INTERNAL_WIDTH, FRAMERATE
+from pickaxe import ENLARGED_SIZE
+from tnt import NAME_OFFSET_Y
+from origin import true_y
+from render_queue import RenderQueue
+
+# Most entities one frame can hold, the rest of a frame is dropped
+MAX_BLOCKS = 1024
+MAX_TNTS = 128
+MAX_PARTICLES = 2048
+NAME_BYTES = 32
+
+# Shared memory layout, all little endian:
+#   sequence  u32, odd while the simulation copies a frame in (seqlock)
+#   input     quit requested, key T down, key M down (written by the render process)
+#   closed    set by the simulation when the render process should exit
+#   frame     scene, then the entity counts and records
+SEQUENCE = struct.Struct("<I")
+INPUT = struct.Struct("<???")
+CLOSED = struct.Struct("<?")
+# camera x/y, pickaxe texture id, enlarged, x, y, angle, hud pickaxe y, fast/slow active, fast, 8 ore amounts
+SCENE = struct.Struct("<ddH?ddd d??8q")
+COUNTS = struct.Struct("<III")
+BLOCK_RECORD = struct.Struct("<Hffb")  # texture id, top left x, y, destroy stage (-1 for none)
+TNT_RECORD = struct.Struct(f"<H?fffB{NAME_BYTES}s")  # texture id, mega, center x, y, angle, blink alpha, owner name
+PARTICLE_RECORD = struct.Struct("<Bfff")  # explosion frame, top left x, y, rotation in degrees
+
+INPUT_OFFSET = SEQUENCE.size
+CLOSED_OFFSET = INPUT_OFFSET + INPUT.size
+FRAME_OFFSET = CLOSED_OFFSET + CLOSED.size
+FRAME_SIZE = SCENE.size + COUNTS.size + MAX_BLOCKS * BLOCK_RECORD.size + MAX_TNTS * TNT_RECORD.size + MAX_PARTICLES * PARTICLE_RECORD.size
+
+class FrameWriter:
+    def __init__(self, textures):
+        """Packs what the render process needs to draw one frame, entity by entity."""
+        self.textures = textures
+        self.blocks = bytearray(MAX_BLOCKS * BLOCK_RECORD.size)
+        self.tnts = bytearray(MAX_TNTS * TNT_RECORD.size)
+        self.particles = bytearray(MAX_PARTICLES * PARTICLE_RECORD.size)
+        self.block_count = 0
+        self.tnt_count = 0
+        self.particle_count = 0
+
+    def begin(self):
+        self.block_count = 0
+        self.tnt_count = 0
+        self.particle_count = 0
+
+    def block(self, block):
+        if self.block_count == MAX_BLOCKS:
+            return
+        BLOCK_RECORD.pack_into(self.blocks, self.block_count * BLOCK_RECORD.size, self.textures.id("block", block.name),
+                               block.body.position.x - BLOCK_SIZE // 2, block.body.position.y - BLOCK_SIZE // 2,
+                               block.damage_stage())
+        self.block_count += 1
+
+    def tnt(self, tnt):
+        if self.tnt_count == MAX_TNTS:
+            return
+        name = (tnt.owner_name or "").encode("utf-8")[:NAME_BYTES]
+        TNT_RECORD.pack_into(self.tnts, self.tnt_count * TNT_RECORD.size, self.textures.id("block", tnt.name), tnt.name == "mega_tnt",
+                             tnt.body.position.x, tnt.body.position.y, tnt.body.angle, tnt.blink_alpha(), name)
+        self.tnt_count += 1
+
+    def explosion(self, explosion, visibility):
+        for particle in explosion.particles:
+            if particle.finished or self.particle_count == MAX_PARTICLES:
+                continue
+            if visibility.rect_visible("particle", particle.pos.x, particle.pos.y, particle.max_size, particle.max_size):
+                PARTICLE_RECORD.pack_into(self.particles, self.particle_count * PARTICLE_RECORD.size, particle.current_frame,
+                                          particle.pos.x, particle.pos.y, particle.rotation)
+                self.particle_count += 1
+
+    def finish(self, camera, pickaxe, hud, fast_slow_active, fast_slow):
+        """The whole frame as bytes, ready to publish."""
+        scene = SCENE.pack(camera.offset_x, camera.offset_y,
+                           self.textures.id("pickaxe", pickaxe.name), pickaxe.is_enlarged,
+                           pickaxe.body.position.x, pickaxe.body.position.y, pickaxe.body.angle,
+                           true_y(pickaxe.body.position.y), fast_slow_active, fast_slow == "Fast", *hud.amounts.values())
+        return b"".join((
+            scene,
+            COUNTS.pack(self.block_count, self.tnt_count, self.particle_count),
+            memoryview(self.blocks)[:self.block_count * BLOCK_RECORD.size],
+            memoryview(self.tnts)[:self.tnt_count * TNT_RECORD.size],
+            memoryview(self.particles)[:self.particle_count * PARTICLE_RECORD.size],
+        ))
+
+class RenderProcess:
+    def __init__(self, textures, video_driver):
+        """
+        Runs drawing, scaling and the display flip in a second process that reads frames from shared memory.
+
+        :param video_driver: SDL_VIDEODRIVER for the render process, the simulation itself runs on "dummy".
+        """
+        self.memory = shared_memory.SharedMemory(create=True, size=FRAME_OFFSET + FRAME_SIZE)
+        self.buffer = self.memory.buf
+        self.buffer[:FRAME_OFFSET] = bytes(FRAME_OFFSET)
+        self.sequence = 0
+        self.frame = FrameWriter(textures)
+
+        # Spawned, not forked: SDL doesn't survive a fork
+        context = multiprocessing.get_context("spawn")
+        self.process = context.Process(target=render_main, args=(self.memory.name, video_driver), daemon=True)
+        self.process.start()
+
+    def publish(self, data):
+        """Copy a finished frame into shared memory, the reader retries if it catches the copy halfway."""
+        SEQUENCE.pack_into(self.buffer, 0, self.sequence + 1)
+        self.buffer[FRAME_OFFSET:FRAME_OFFSET + len(data)] = data
+        self.sequence += 2
+        SEQUENCE.pack_into(self.buffer, 0, self.sequence)
+
+    def input(self):
+        """(quit requested, key T down, key M down) as seen by the render window."""
+        quit_requested, key_t, key_m = INPUT.unpack_from(self.buffer, INPUT_OFFSET)
+        return quit_requested or not self.process.is_alive(), key_t, key_m
+
+    def close(self):
+        CLOSED.pack_into(self.buffer, CLOSED_OFFSET, True)
+        self.process.join(timeout=5)
+        del self.buffer
+        self.memory.close()
+        self.memory.unlink()
+
+def read_frame(buffer, last_sequence):
+    """(sequence, frame bytes) of a frame newer than last_sequence, or None."""
+    (sequence,) = SEQUENCE.unpack_from(buffer, 0)
+    if sequence == last_sequence or sequence % 2:
+        return None
+    data = bytes(buffer[FRAME_OFFSET:])
+    (sequence_after,) = SEQUENCE.unpack_from(buffer, 0)
+    if sequence_after != sequence:
+        return None  # Written to while copying, take the next one
+    return sequence, data
+
+def draw_frame(surface, render_queue, data, textures, hud, background, name_cache, overlays, font):
+    (camera_x, camera_y, pickaxe_id, enlarged, pickaxe_x, pickaxe_y, pickaxe_angle,
+     hud_y, fast_slow_active, fast, *amounts) = SCENE.unpack_from(data, 0)
+    offset = SCENE.size
+    block_count, tnt_count, particle_count = COUNTS.unpack_from(data, offset)
+    offset += COUNTS.size
+
+    surface.fill((0, 0, 0))
+    surface.blit(background, ((INTERNAL_WIDTH - background.get_width()) // 2, (INTERNAL_HEIGHT - background.get_height()) // 2))
+
+    destroy_stages = textures.destroy_stages
+    for texture_id, x, y, damage_stage in BLOCK_RECORD.iter_unpack(data[offset:offset + block_count * BLOCK_RECORD.size]):
+        position = (x - camera_x, y - camera_y)
+        render_queue.push("terrain", textures.by_id(texture_id), position)
+        if damage_stage >= 0:
+            render_queue.push("damage", destroy_stages[damage_stage], position)
+    offset += block_count * BLOCK_RECORD.size
+
+    category, name = textures.names[pickaxe_id]
+    texture = textures.scaled(category, name, ENLARGED_SIZE) if enlarged else textures.by_id(pickaxe_id)
+    rotated = pygame.transform.rotate(texture, -math.degrees(pickaxe_angle))
+    render_queue.push("entities", rotated, rotated.get_rect(center=(pickaxe_x - camera_x, pickaxe_y - camera_y)))
+
+    for texture_id, mega, x, y, angle, alpha, name in TNT_RECORD.iter_unpack(data[offset:offset + tnt_count * TNT_RECORD.size]):
+        texture = textures.by_id(texture_id)
+        if mega:
+            category, tnt_name = textures.names[texture_id]
+            texture = textures.scaled(category, tnt_name, (texture.get_width() * 2, texture.get_height() * 2))
+        center = (x - camera_x, y - camera_y)
+        rotated = pygame.transform.rotate(texture, -math.degrees(angle))
+        render_queue.push("entities", rotated, rotated.get_rect(center=center))
+
+        overlay = overlays.get(texture.get_size())
+        if overlay is None:
+            overlay = overlays[texture.get_size()] = pygame.Surface(texture.get_size(), pygame.SRCALPHA)
+        overlay.fill((255, 255, 255, alpha))
+        rotated = pygame.transform.rotate(overlay, -math.degrees(angle))
+        render_queue.push("entities", rotated, rotated.get_rect(center=center))
+
+        name = name.rstrip(b"\0").decode("utf-8", "ignore")
+        if name:
+            if name not in name_cache:
+                name_cache[name] = (font.render(name, True, (255, 255, 255)), font.render(name, True, (0, 0, 0)))
+            name_surface, name_shadow = name_cache[name]
+            render_queue.push("entities", name_shadow, name_shadow.get_rect(center=(center[0] + 1, center[1] - NAME_OFFSET_Y + 1)))
+            render_queue.push("entities", name_surface, name_surface.get_rect(center=(center[0], center[1] - NAME_OFFSET_Y)))
+    offset += tnt_count * TNT_RECORD.size
+
+    explosion_frames = textures.explosion_frames
+    for frame, x, y, rotation in PARTICLE_RECORD.iter_unpack(data[offset:offset + particle_count * PARTICLE_RECORD.size]):
+        render_queue.push("particles", pygame.transform.rotate(explosion_frames[frame], rotation), (x - camera_x, y - camera_y))
+
+    hud.amounts.update(zip(list(hud.amounts), amounts))
+    hud.draw(render_queue, hud_y, fast_slow_active, "Fast" if fast else "Slow")
+    render_queue.flush(surface)
+
+def render_main(memory_name, video_driver):
+    """Entry point of the render process."""
+    if video_driver is None:
+        os.environ.pop("SDL_VIDEODRIVER", None)
+    else:
+        os.environ["SDL_VIDEODRIVER"] = video_driver
+
+    # Imported here, the simulation doesn't need them in this module
+    from atlas import create_texture_atlas
+    from textures import TextureRegistry, load_background
+    from hud import Hud
+
+    memory = shared_memory.SharedMemory(name=memory_name)
+    buffer = memory.buf
+
+    pygame.init()
+    window_width, window_height = INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2
+    screen = pygame.display.set_mode((window_width, window_height), pygame.RESIZABLE)
+    pygame.display.set_caption("Falling Pickaxe")
+    assets_dir = Path(__file__).parent / "assets"
+    pygame.display.set_icon(pygame.image.load(assets_dir / "pickaxe" / "diamond_pickaxe.png"))
+    internal_surface = pygame.Surface((INTERNAL_WIDTH, INTERNAL_HEIGHT))
+
+    # Same atlas as the simulation, packing is deterministic so texture ids match
+    texture_atlas, atlas_items = create_texture_atlas(assets_dir, BLOCK_SCALE_FACTOR)
+    textures = TextureRegistry(texture_atlas, atlas_items)
+    background = load_background(assets_dir)
+    hud = Hud(textures)
+    font = pygame.font.Font(None, 70)
+    render_queue = RenderQueue()
+    name_cache = {}  # Owner name -> (text, shadow)
+    overlays = {}  # Texture size -> blink overlay
+
+    clock = pygame.time.Clock()
+    last_sequence = 0
+    quit_requested = False
+    while not CLOSED.unpack_from(buffer, CLOSED_OFFSET)[0]:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                quit_requested = True
+            elif event.type == pygame.VIDEORESIZE:
+                new_width, new_height = event.w, event.h
+
+                # Maintain 9:16 aspect ratio
+                if new_width / 9 > new_height / 16:
+                    new_width = int(new_height * (9 / 16))
+                else:
+                    new_height = int(new_width * (16 / 9))
+
+                window_width, window_height = new_width, new_height
+                screen = pygame.display.set_mode((window_width, window_height), pygame.RESIZABLE)
+
+        keys = pygame.key.get_pressed()
+        INPUT.pack_into(buffer, INPUT_OFFSET, quit_requested, keys[pygame.K_t], keys[pygame.K_m])
+
+        frame = read_frame(buffer, last_sequence)
+        if frame is not None:
+            last_sequence, data = frame
+            draw_frame(internal_surface, render_queue, data, textures, hud, background, name_cache, overlays, font)
+            screen.blit(pygame.transform.smoothscale(internal_surface, (window_width, window_height)), (0, 0))
+            pygame.display.flip()
+
+        clock.tick(FRAMERATE)
+
+    del buffer
+    memory.close()
+    pygame.quit()
@@ -0,0 +1,35 @@
+import pygame
+
+# Drawn in this order, each layer in the order it was pushed
+LAYERS = ("terrain", "damage", "entities", "particles", "hud")
+
+# pygame-ce has fblits, pygame 2 has blits which only skips building the rect list with doreturn=False
+HAS_FBLITS = hasattr(pygame.Surface, "fblits")
+
+class RenderQueue:
+    def __init__(self):
+        """Collects (surface, position) pairs from the draw methods and blits each layer in one call."""
+        self.layers = {layer: [] for layer in LAYERS}
+        self.blit_count = 0  # Blits in the last flush
+        self.batch_count = 0  # Batched calls in the last flush
+
+    def push(self, layer, surface, position):
+        self.layers[layer].append((surface, position))
+
+    def flush(self, target):
+        """Blit every queued layer onto target and empty the queue."""
+        self.blit_count = 0
+        self.batch_count = 0
+        for layer in LAYERS:
+            items = self.layers[layer]
+            if not items:
+                continue
+
+            if HAS_FBLITS:
+                target.fblits(items)
+            else:
+                target.blits(items, doreturn=False)
+
+            self.blit_count += len(items)
+            self.batch_count += 1
+            items.clear()
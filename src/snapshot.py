@@ -0,0 +1,226 @@
+import os
+import struct
+import threading
+import time
+import pygame
+import chunk as world
+from chunk import chunks, chunk_deltas
+from origin import true_y
+
+# File layout, all little endian:
+#   header    magic, version, world seed
+#   pickaxe   name, x, y, vx, vy, angle, angular velocity, enlarged ms left
+#   camera    offset y
+#   hud       count, then (name, amount) pairs
+#   chunks    count, then chunk x, chunk y, delta count, then (index, destroyed, hp) per delta
+#   commands  count, then (type, author, has payload, payload, priority)
+# Strings are a u16 length followed by utf-8 bytes.
+SNAPSHOT_MAGIC = b"FPSV"
+SNAPSHOT_VERSION = 1
+
+HEADER = struct.Struct("<4sHQ")
+PICKAXE = struct.Struct("<6di")
+CAMERA = struct.Struct("<d")
+COUNT = struct.Struct("<I")
+HUD_AMOUNT = struct.Struct("<q")
+CHUNK = struct.Struct("<iiH")
+DELTA = struct.Struct("<HBf")
+COMMAND = struct.Struct("<BB")
+
+def pack_string(parts, text):
+    data = text.encode("utf-8")[:0xFFFF]
+    parts.append(struct.pack("<H", len(data)))
+    parts.append(data)
+
+def unpack_string(data, offset):
+    (length,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+def capture_snapshot(pickaxe, camera, hud, command_scheduler):
+    """Copy everything worth saving. Runs on the main thread, packing and writing happen later."""
+    enlarged_left = 0
+    if pickaxe.is_enlarged:
+        enlarged_left = max(0, pickaxe.enlarge_end_time - pygame.time.get_ticks())
+
+    # Saved in world coordinates, the local origin is chosen again when the game resumes
+    body = pickaxe.body
+    return {
+        "world_seed": world.world_seed,
+        "pickaxe": (pickaxe.name, body.position.x, true_y(body.position.y), body.velocity.x, body.velocity.y,
+                    body.angle, body.angular_velocity, enlarged_left),
+        "camera_offset_y": true_y(camera.offset_y),
+        "hud": dict(hud.amounts),
+        # Chunks waiting to be generated again keep their saved deltas
+        "chunks": {**world.pending_deltas, **{(chunk_x, world.world_chunk_y(chunk_y)): chunk_deltas(chunk)
+                                             for (chunk_x, chunk_y), chunk in chunks.items()}},
+        "commands": [(command.type, command.author, command.payload, command.priority)
+                     for command in command_scheduler.pending_commands()],
+    }
+
+def pack_snapshot(state):
+    parts = [HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, state["world_seed"])]
+
+    name, *pickaxe_values = state["pickaxe"]
+    pack_string(parts, name)
+    parts.append(PICKAXE.pack(*pickaxe_values))
+
+    parts.append(CAMERA.pack(state["camera_offset_y"]))
+
+    parts.append(COUNT.pack(len(state["hud"])))
+    for item, amount in state["hud"].items():
+        pack_string(parts, item)
+        parts.append(HUD_AMOUNT.pack(amount))
+
+    chunk_items = [(key, deltas) for key, deltas in state["chunks"].items() if deltas]
+    parts.append(COUNT.pack(len(chunk_items)))
+    for (chunk_x, chunk_y), deltas in chunk_items:
+        parts.append(CHUNK.pack(chunk_x, chunk_y, len(deltas)))
+        for index, destroyed, hp in deltas:
+            parts.append(DELTA.pack(index, destroyed, hp))
+
+    parts.append(COUNT.pack(len(state["commands"])))
+    for command_type, author, payload, priority in state["commands"]:
+        pack_string(parts, command_type)
+        pack_string(parts, author)
+        parts.append(COMMAND.pack(payload is not None, priority))
+        pack_string(parts, payload or "")
+
+    return b"".join(parts)
+
+def unpack_snapshot(data):
+    magic, version, world_seed = HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError("Not a snapshot of this version")
+    offset = HEADER.size
+
+    name, offset = unpack_string(data, offset)
+    pickaxe = (name, *PICKAXE.unpack_from(data, offset))
+    offset += PICKAXE.size
+
+    (camera_offset_y,) = CAMERA.unpack_from(data, offset)
+    offset += CAMERA.size
+
+    hud = {}
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    for _ in range(count):
+        item, offset = unpack_string(data, offset)
+        (hud[item],) = HUD_AMOUNT.unpack_from(data, offset)
+        offset += HUD_AMOUNT.size
+
+    chunk_deltas_by_key = {}
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    for _ in range(count):
+        chunk_x, chunk_y, delta_count = CHUNK.unpack_from(data, offset)
+        offset += CHUNK.size
+        deltas = []
+        for _ in range(delta_count):
+            index, destroyed, hp = DELTA.unpack_from(data, offset)
+            offset += DELTA.size
+            deltas.append((index, bool(destroyed), hp))
+        chunk_deltas_by_key[(chunk_x, chunk_y)] = deltas
+
+    commands = []
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    for _ in range(count):
+        command_type, offset = unpack_string(data, offset)
+        author, offset = unpack_string(data, offset)
+        has_payload, priority = COMMAND.unpack_from(data, offset)
+        offset += COMMAND.size
+        payload, offset = unpack_string(data, offset)
+        commands.append((command_type, author, payload if has_payload else None, priority))
+
+    return {
+        "world_seed": world_seed,
+        "pickaxe": pickaxe,
+        "camera_offset_y": camera_offset_y,
+        "hud": hud,
+        "chunks": chunk_deltas_by_key,
+        "commands": commands,
+    }
+
+def write_snapshot(path, state):
+    """Write atomically: a crash while writing leaves the previous snapshot in place."""
+    data = pack_snapshot(state)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def load_snapshot(path):
+    """Read a snapshot, or None if there is none or it can't be read."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return unpack_snapshot(f.read())
+    except (OSError, ValueError, struct.error, UnicodeDecodeError) as e:
+        print("Could not load snapshot:", e)
+        return None
+
+def restore_snapshot(state, pickaxe, camera, hud, command_scheduler):
+    """Put a loaded snapshot back into a freshly started game."""
+    world.set_world_seed(state["world_seed"])
+    world.pending_deltas.clear()
+    world.pending_deltas.update(state["chunks"])
+
+    name, x, y, vx, vy, angle, angular_velocity, enlarged_left = state["pickaxe"]
+    pickaxe.pickaxe(name)
+    pickaxe.body.position = (x, y)
+    pickaxe.body.velocity = (vx, vy)
+    pickaxe.body.angle = angle
+    pickaxe.body.angular_velocity = angular_velocity
+    if enlarged_left > 0:
+        pickaxe.enlarge(enlarged_left)
+
+    camera.offset_y = state["camera_offset_y"]
+    hud.amounts.update(state["hud"])
+
+    for command_type, author, payload, priority in state["commands"]:
+        command_scheduler.submit(command_type, author, payload, priority)
+
+class SnapshotWriter:
+    def __init__(self, path):
+        """Writes snapshots on a background thread, only the newest pending snapshot is kept."""
+        self.path = path
+        self.pending = None
+        self.lock = threading.Lock()  # Guards pending
+        self.write_lock = threading.Lock()  # One write at a time, so an older state can't replace a newer one
+        self.wake = threading.Event()
+        self.last_write_ms = 0.0
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def save(self, state):
+        with self.lock:
+            self.pending = state
+        self.wake.set()
+
+    def run(self):
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            with self.write_lock:
+                with self.lock:
+                    state, self.pending = self.pending, None
+                if state is None:
+                    continue
+
+                start = time.perf_counter()
+                try:
+                    write_snapshot(self.path, state)
+                except OSError as e:
+                    print("Could not write snapshot:", e)
+                self.last_write_ms = (time.perf_counter() - start) * 1000
+
+    def flush(self, state):
+        """Write synchronously, used when the game closes. Waits for a background write that already started."""
+        with self.write_lock:
+            with self.lock:
+                self.pending = None
+            write_snapshot(self.path, state)
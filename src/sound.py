@@ -1,21 +1,97 @@
+import random
 import pygame
+from collections import deque
 
 class SoundManager:
-    def __init__(self):
+    def __init__(self, num_channels=16):
+        """
+        Plays sounds on a fixed pool of mixer channels and limits how many voices each sound group may use.
+
+        :param num_channels: Mixer channels shared by all sounds.
+        """
         pygame.mixer.init()  # Initialize the mixer
-        pygame.mixer.set_num_channels(128)
+        pygame.mixer.set_num_channels(num_channels)
         self.sounds = {}
+        self.groups = {}  # Group name -> list of sound names, variants of the same sound share one group
+        self.sound_group = {}  # Sound name -> group name
+        self.limits = {}  # Group name -> (max voices, min retrigger ms)
+        self.voices = {}  # Group name -> deque of (start ms, channel, sound), oldest first
+        self.last_played = {}  # Group name -> ms
+
+        self.requested = 0
+        self.played = 0
+        self.throttled = 0  # Dropped because the group was retriggered too soon
+        self.stolen = 0  # Voices cut short to make room for a new one
 
-    def load_sound(self, name, path, volume=1.0):
-        """Load a sound and set its volume"""
+    def load_sound(self, name, path, volume=1.0, group=None):
+        """Load a sound and set its volume, sounds loaded with the same group share its voice limit"""
         sound = pygame.mixer.Sound(str(path))
         sound.set_volume(volume)
         self.sounds[name] = sound
 
+        group = group or name
+        self.groups.setdefault(group, []).append(name)
+        self.sound_group[name] = group
+
+    def set_limit(self, group, max_voices, min_interval_ms=0):
+        """Allow at most max_voices at once for a group, and no new voice within min_interval_ms of the last one"""
+        self.limits[group] = (max_voices, min_interval_ms)
+
     def play_sound(self, name, loop=False):
-        """Play a loaded sound"""
-        if name in self.sounds:
-            self.sounds[name].play(loops=-1 if loop else 0)
+        """Play a loaded sound, or a random variant when name is a group"""
+        if name in self.groups and name not in self.sounds:
+            group = name
+            name = random.choice(self.groups[group])
+        elif name in self.sounds:
+            group = self.sound_group[name]
+        else:
+            return
+
+        self.requested += 1
+        sound = self.sounds[name]
+        now = pygame.time.get_ticks()
+
+        if group not in self.limits:
+            if sound.play(loops=-1 if loop else 0) is not None:
+                self.played += 1
+            return
+
+        max_voices, min_interval_ms = self.limits[group]
+        if now - self.last_played.get(group, -min_interval_ms) < min_interval_ms:
+            self.throttled += 1
+            return
+
+        # Forget voices that finished or whose channel was taken by another sound
+        voices = self.voices.setdefault(group, deque())
+        for voice in list(voices):
+            _, channel, voice_sound = voice
+            if not channel.get_busy() or channel.get_sound() is not voice_sound:
+                voices.remove(voice)
+
+        if len(voices) >= max_voices:
+            # Steal the oldest voice of this group
+            _, channel, _ = voices.popleft()
+            channel.stop()
+            self.stolen += 1
+        else:
+            # find_channel(True) cuts the longest playing channel short when the pool is full
+            channel = pygame.mixer.find_channel(True)
+            if channel is None:
+                return
+
+        channel.play(sound, loops=-1 if loop else 0)
+        voices.append((now, channel, sound))
+        self.last_played[group] = now
+        self.played += 1
+
+    def counters(self):
+        """Totals since start, for the metrics log"""
+        return {
+            "requested": self.requested,
+            "played": self.played,
+            "throttled": self.throttled,
+            "stolen": self.stolen,
+        }
 
     def stop_sound(self, name):
         """Stop a playing sound"""
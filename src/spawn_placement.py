@@ -0,0 +1,85 @@
+from collections import deque
+import pymunk
+from constants import BLOCK_SIZE, CHUNK_WIDTH
+
+# Free space between neighbouring spawn spots
+SPAWN_GAP = 10
+
+# Inside the bedrock walls of the middle chunk column
+SHAFT_LEFT = BLOCK_SIZE
+SHAFT_RIGHT = (CHUNK_WIDTH - 1) * BLOCK_SIZE
+
+class SpawnPlacer:
+    def __init__(self, space, tnt_pool, tnt_store, spawns_per_frame=5, rows=4, max_pending=50):
+        """
+        Spreads TNT spawns over free spots above the pickaxe and over several frames, so a burst
+        never starts out as a pile of overlapping boxes for the solver to push apart.
+
+        :param spawns_per_frame: TNTs placed per frame at most, the rest wait for the next frames.
+        :param rows: Rows of spots stacked above the spawn point. When all are taken, spawns wait.
+        :param max_pending: Spawns allowed to wait. Requests beyond that are dropped, so bursts into
+                            a packed shaft can't pile up without end.
+        """
+        self.space = space
+        self.tnt_pool = tnt_pool
+        self.tnt_store = tnt_store
+        self.spawns_per_frame = spawns_per_frame
+        self.rows = rows
+        self.max_pending = max_pending
+        self.pending = deque()  # (TNT class, owner name)
+        self.dropped = 0
+        self.filter = pymunk.ShapeFilter()
+
+    def request(self, tnt_class, owner_name=None):
+        """
+        Queue a TNT, it is spawned by the next update that finds room for it.
+
+        :return: False if the queue is full and the TNT was dropped.
+        """
+        if len(self.pending) >= self.max_pending:
+            self.dropped += 1
+            print(f"TNT spawn queue full ({self.max_pending}), dropping a {tnt_class.__name__}")
+            return False
+        self.pending.append((tnt_class, owner_name))
+        return True
+
+    def update(self, x, y):
+        """Spawn queued TNTs in free spots around (x, y), the spot a single TNT would use."""
+        placed = 0
+        while self.pending and placed < self.spawns_per_frame:
+            tnt_class, owner_name = self.pending[0]
+            spot = self.free_spot(self.tnt_pool.size(tnt_class), x, y)
+            if spot is None:
+                break  # Everything around is taken, try again once the last ones fell away
+
+            self.pending.popleft()
+            self.tnt_store.add(self.tnt_pool.spawn(tnt_class, spot[0], spot[1], owner_name))
+            placed += 1
+
+    def spots(self, size, x, y):
+        """Candidate centers, nearest first: rows going up from y, every other row shifted half a step."""
+        width, height = size
+        step_x = width + SPAWN_GAP
+        step_y = height + SPAWN_GAP
+        left = SHAFT_LEFT + width / 2
+        right = SHAFT_RIGHT - width / 2
+
+        for row in range(self.rows):
+            row_y = y - row * step_y
+            row_x = x + (step_x / 2 if row % 2 else 0)
+            # Columns alternate right and left of the center
+            for column in range(CHUNK_WIDTH):
+                offset = (column + 1) // 2 * (1 if column % 2 else -1)
+                spot_x = min(max(row_x + offset * step_x, left), right)
+                yield spot_x, row_y
+
+    def free_spot(self, size, x, y):
+        """The first spot no shape overlaps, or None."""
+        # Boxes that only touch count as overlapping in bb_query, a pixel less lets a TNT sit against a wall
+        half_width = size[0] / 2 - 1
+        half_height = size[1] / 2 - 1
+        for spot_x, spot_y in self.spots(size, x, y):
+            bb = pymunk.BB(spot_x - half_width, spot_y - half_height, spot_x + half_width, spot_y + half_height)
+            if not self.space.bb_query(bb, self.filter):
+                return spot_x, spot_y
+        return None
@@ -0,0 +1,23 @@
+import time
+
+class StartupTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.steps = []
+
+    def mark(self, name):
+        """Record how long the step that just finished took."""
+        now = time.perf_counter()
+        self.steps.append((name, now - self.last))
+        self.last = now
+
+    def total(self):
+        return self.last - self.start
+
+    def report(self):
+        steps = " | ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.steps)
+        print(f"Startup took {self.total() * 1000:.0f}ms: {steps}")
+
+# Created on first import, main.py imports this module first
+startup_timer = StartupTimer()
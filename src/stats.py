@@ -0,0 +1,38 @@
+class GameStats:
+    def __init__(self):
+        """Counters updated by game objects and read when a metrics record is written."""
+        self.tnt_spawned = 0
+        self.blocks_broken = 0
+        self.frame_times = []  # Milliseconds of work per frame since the last record
+
+        # Never reset, read by the metrics endpoint
+        self.chat_polls = 0
+        self.chat_poll_ms = 0.0  # Last poll
+        self.subscriber_poll_ms = 0.0  # Last poll
+        self.api_errors = 0
+
+    def frame(self, milliseconds):
+        self.frame_times.append(milliseconds)
+
+    def take_interval(self):
+        """Counters and frame time statistics since the previous call, then start a new interval."""
+        frame_times = sorted(self.frame_times)
+        count = len(frame_times)
+
+        interval = {
+            "tnt_spawned": self.tnt_spawned,
+            "blocks_broken": self.blocks_broken,
+            "frames": count,
+            "frame_ms_avg": round(sum(frame_times) / count, 3) if count else 0.0,
+            "frame_ms_p50": round(frame_times[count // 2], 3) if count else 0.0,
+            "frame_ms_p95": round(frame_times[min(count - 1, int(count * 0.95))], 3) if count else 0.0,
+            "frame_ms_max": round(frame_times[-1], 3) if count else 0.0,
+        }
+
+        self.tnt_spawned = 0
+        self.blocks_broken = 0
+        self.frame_times = []
+        return interval
+
+# Shared by the whole game
+stats = GameStats()
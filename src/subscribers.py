@@ -0,0 +1,76 @@
+import time
+from quota import COST_CHANNELS_LIST
+
+class SubscriberWatcher:
+    def __init__(self, channel_id, fetch, quota, subscribers, min_interval=15, max_interval=300, backoff=1.5, quota_share=0.2):
+        """
+        Polls the subscriber count on its own adaptive schedule.
+
+        :param channel_id: Channel to watch.
+        :param fetch: Function (channel_id, etag) -> (count, etag). count is None when unchanged (HTTP 304).
+        :param quota: QuotaBudget shared with the other YouTube calls.
+        :param subscribers: Subscriber count at startup.
+        :param min_interval: Seconds between polls right after the count changed.
+        :param max_interval: Longest wait when the count stays the same.
+        :param backoff: Interval multiplier after every poll without a change.
+        :param quota_share: Part of the daily quota these polls may use.
+        """
+        self.channel_id = channel_id
+        self.fetch = fetch
+        self.quota = quota
+        self.subscribers = subscribers
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.quota_share = quota_share
+
+        self.etag = None
+        self.interval = min_interval
+        self.last_poll = time.monotonic()
+        self.next_poll = self.last_poll + self.next_interval()
+        self.in_flight = False
+
+        self.polls = 0
+        self.not_modified = 0
+
+    def next_interval(self):
+        """Adaptive interval, stretched further if the quota share would run out before the reset."""
+        return max(self.interval, self.quota.pace_interval(COST_CHANNELS_LIST, "subscribers", self.quota_share))
+
+    def due(self):
+        """Cheap enough for every frame, the quota pacing is only worked out after each poll."""
+        return not self.in_flight and time.monotonic() >= self.next_poll
+
+    def poll(self):
+        """
+        Fetch the subscriber count.
+
+        :return: Number of new subscribers since the last poll (0 if none).
+        """
+        self.in_flight = True
+        try:
+            count, etag = self.fetch(self.channel_id, self.etag)
+        finally:
+            self.in_flight = False
+            self.last_poll = time.monotonic()
+            self.next_poll = self.last_poll + self.next_interval()  # Also when the fetch failed
+            self.polls += 1
+
+        if etag is not None:
+            self.etag = etag
+
+        if count is None:
+            self.not_modified += 1
+            count = self.subscribers
+
+        # Only an increase counts, so unsubscribing and subscribing again does not trigger twice
+        gained = 0
+        if count > self.subscribers:
+            gained = count - self.subscribers
+            self.subscribers = count
+            self.interval = self.min_interval  # Something is happening, look again soon
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        self.next_poll = self.last_poll + self.next_interval()
+
+        return gained
@@ -0,0 +1,70 @@
+import pygame
+
+class TextureRegistry:
+    def __init__(self, texture_atlas, atlas_items):
+        """
+        Hands out textures from the atlas. Every subsurface and scaled variant is created once and reused.
+
+        :param texture_atlas: The atlas surface, already scaled.
+        :param atlas_items: Dict of category -> name -> (x, y, w, h) rect in the atlas.
+        """
+        self.texture_atlas = texture_atlas
+        self.atlas_items = atlas_items
+
+        self.surfaces = []  # Texture id -> surface
+        self.ids = {}  # (category, name) -> texture id
+        self.names = {}  # Texture id -> (category, name)
+        self.scaled_surfaces = {}  # (texture id, size) -> surface
+
+        for category in atlas_items:
+            for name, rect in atlas_items[category].items():
+                self.ids[(category, name)] = len(self.surfaces)
+                self.names[len(self.surfaces)] = (category, name)
+                self.surfaces.append(texture_atlas.subsurface(rect))
+
+        # Animations looked up by frame number on every draw
+        self.destroy_stages = self.sequence("destroy_stage", "destroy_stage_", 10)
+        self.explosion_frames = self.sequence("particle", "explosion_", 16)
+
+    def id(self, category, name):
+        """Integer id of a texture, stable for a given atlas."""
+        return self.ids[(category, name)]
+
+    def has(self, category, name):
+        return (category, name) in self.ids
+
+    def get(self, category, name):
+        return self.surfaces[self.ids[(category, name)]]
+
+    def by_id(self, texture_id):
+        return self.surfaces[texture_id]
+
+    def category(self, category):
+        """Names of all textures in a category, in atlas order."""
+        return list(self.atlas_items[category].keys())
+
+    def sequence(self, category, prefix, count):
+        """Numbered textures (e.g. destroy_stage_0..9) as a list indexed by number."""
+        return [self.get(category, f"{prefix}{i}") for i in range(count)]
+
+    def scaled(self, category, name, size):
+        """Texture scaled to size (width, height). Created on first request, then cached."""
+        texture_id = self.ids[(category, name)]
+        key = (texture_id, size)
+        surface = self.scaled_surfaces.get(key)
+        if surface is None:
+            surface = pygame.transform.scale(self.surfaces[texture_id], size)
+            self.scaled_surfaces[key] = surface
+        return surface
+
+    def prescale(self, category, names, size):
+        """Create scaled variants up front so they are never built during a frame."""
+        for name in names:
+            self.scaled(category, name, size)
+
+def load_background(assets_dir, scale=1.5):
+    """The background image, scaled and converted for fast blits."""
+    background_image = pygame.image.load(assets_dir / "background.png")
+    background_width = int(background_image.get_width() * scale)
+    background_height = int(background_image.get_height() * scale)
+    return pygame.transform.scale(background_image, (background_width, background_height)).convert()
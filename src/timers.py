@@ -0,0 +1,100 @@
+import heapq
+import itertools
+import random
+import pygame
+
+class Timer:
+    __slots__ = ("name", "callback", "min_ms", "max_ms", "repeat", "due", "cancelled")
+
+    def __init__(self, name, callback, min_ms, max_ms, repeat):
+        self.name = name
+        self.callback = callback
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.repeat = repeat
+        self.due = None  # Timer time in ms, None while not scheduled
+        self.cancelled = False
+
+class EventTimers:
+    def __init__(self, retry_seconds=0.1, clock=pygame.time.get_ticks):
+        """
+        Timed gameplay events kept in a heap ordered by due time, so waiting timers cost nothing per frame.
+
+        :param retry_seconds: Delay before a callback that returned False (not now) is tried again.
+        :param clock: Milliseconds source, timer time follows it scaled by self.scale unless paused.
+        """
+        self.retry_ms = retry_seconds * 1000
+        self.clock = clock
+        self.last_clock = clock()
+        self.time = 0.0  # Timer time in ms
+        self.scale = 1.0
+        self.paused = False
+        self.timers = {}  # Name -> Timer
+        self.heap = []  # (due, order, timer), stale entries are skipped when popped
+        self.order = itertools.count()  # Keeps equal due times in scheduling order
+
+    def every(self, name, callback, min_seconds, max_seconds=None):
+        """
+        Call callback every min_seconds to max_seconds, picked at random each time.
+
+        The callback may return False when it can't run right now, it is then tried again shortly.
+        """
+        self.add(Timer(name, callback, min_seconds * 1000, (max_seconds if max_seconds is not None else min_seconds) * 1000, True))
+
+    def after(self, name, seconds, callback):
+        """Call callback once after seconds, replacing a timer with the same name."""
+        self.add(Timer(name, callback, seconds * 1000, seconds * 1000, False))
+
+    def add(self, timer):
+        old = self.timers.get(timer.name)
+        if old is not None:
+            old.cancelled = True
+        self.timers[timer.name] = timer
+        self.schedule(timer, random.uniform(timer.min_ms, timer.max_ms))
+
+    def schedule(self, timer, delay_ms):
+        timer.due = self.time + delay_ms
+        heapq.heappush(self.heap, (timer.due, next(self.order), timer))
+
+    def reset(self, name, extra_seconds=0):
+        """Start a timer's countdown over from now with a new random interval, extra_seconds later."""
+        timer = self.timers.get(name)
+        if timer is None:
+            return
+        timer.cancelled = False
+        self.schedule(timer, random.uniform(timer.min_ms, timer.max_ms) + extra_seconds * 1000)
+
+    def cancel(self, name):
+        """Stop a timer until it is reset."""
+        timer = self.timers.get(name)
+        if timer is not None:
+            timer.cancelled = True
+            timer.due = None
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def update(self):
+        """Advance timer time and run every callback that is due."""
+        now = self.clock()
+        if not self.paused:
+            self.time += (now - self.last_clock) * self.scale
+        self.last_clock = now
+
+        while self.heap and self.heap[0][0] <= self.time:
+            due, _, timer = heapq.heappop(self.heap)
+            if timer.cancelled or timer.due != due or self.timers.get(timer.name) is not timer:
+                continue  # Cancelled, rescheduled or replaced since this entry was pushed
+
+            timer.due = None
+            if timer.callback() is False:
+                if timer.due is None and not timer.cancelled:
+                    self.schedule(timer, self.retry_ms)
+                continue
+
+            # A callback that reset or cancelled its own timer keeps that
+            if timer.due is None and not timer.cancelled and timer.repeat:
+                self.schedule(timer, random.uniform(timer.min_ms, timer.max_ms))
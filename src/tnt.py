@@ -5,50 +5,100 @@ import random
 from constants import BLOCK_SIZE
 from chunk import chunks
 from explosion import Explosion
+from stats import stats
+from collision import TNT
+from physics import limit_fall_speed
+
+NAME_OFFSET_Y = 55  # The owner name is centered this far above the TNT
 
 class Tnt:
-    def __init__(self, space, x, y, texture_atlas, atlas_items, sound_manager, owner_name=None, velocity=0, rotation=0, mass=70):
-        print("Spawning TNT")
-        self.texture_atlas = texture_atlas
-        self.atlas_items = atlas_items
+    def __init__(self, space, textures, sound_manager, font, mass=70):
+        """
+        A TNT that can be spawned again after it exploded, see TntPool.
+
+        :param font: Font for the owner name, shared by all TNTs.
+        """
+        self.textures = textures
 
-        rect = atlas_items["block"]["tnt"]  
-        self.texture = texture_atlas.subsurface(rect)
+        self.texture = textures.get("block", "tnt")
 
         width, height = self.texture.get_size()
 
         self.name = "tnt"
+        self.pool = None  # Set by the pool that recycles this TNT
 
-        self.velocity = velocity
-        self.rotation = rotation
+        self.velocity = 0
+        self.rotation = 0
         self.space = space
 
         inertia = pymunk.moment_for_box(mass, (width, height))
         self.body = pymunk.Body(mass, inertia)
-        self.body.position = (x, y)
-        self.body.angle = math.radians(rotation)
+        self.body.velocity_func = limit_fall_speed  # Terminal velocity, applied inside the step
 
         # Create a hitbox
         self.shape = pymunk.Poly.create_box(self.body, (width, height))
         self.shape.elasticity = 1  # No bounce
-        self.shape.collision_type = 3 # Identifier for collisions
+        self.shape.collision_type = TNT # Identifier for collisions
         self.shape.friction = 0.7
         self.shape.block_ref = self  # Reference to the block object
 
         self.sound_manager = sound_manager
-        self.sound_manager.play_sound("tnt")
 
+        self.detonated = True  # Not in the space until spawned
+        self.spawn_time = 0
+
+        # Owner name (nick from chat)
+        self.owner_name = None
+        self.font = font
+
+        # Reused for the blinking effect, refilled every frame
+        self.white_overlay = pygame.Surface(self.texture.get_size(), pygame.SRCALPHA)
+
+        # Half the diagonal covers the texture at any rotation, render_owner_name widens it for the name
+        self.sprite_radius = math.hypot(width, height) / 2
+        self.cull_radius = self.sprite_radius
+
+    def spawn(self, x, y, owner_name=None, velocity=0, rotation=0):
+        """Put the TNT into the world at (x, y) and start its fuse."""
+        print("Spawning TNT")
+        stats.tnt_spawned += 1
+
+        self.velocity = velocity
+        self.rotation = rotation
+
+        self.body.position = (x, y)
+        self.body.velocity = (0, 0)
+        self.body.angular_velocity = 0
+        self.body.angle = math.radians(rotation)
         self.space.add(self.body, self.shape)
 
-        handler = space.add_collision_handler(3, 2)  # TNT & Block collision
-        handler.post_solve = self.on_collision
+        self.sound_manager.play_sound("tnt")
 
         self.detonated = False
         self.spawn_time = pygame.time.get_ticks()
 
-        # Owner name (nick from chat)
-        self.owner_name = owner_name
-        self.font = pygame.font.Font(None, 70)
+        # The same chatter often sends several TNTs in a row, keep their rendered name
+        if owner_name != self.owner_name:
+            self.owner_name = owner_name
+            self.render_owner_name()
+
+    def blink_alpha(self):
+        """Opacity of the pulsating white overlay right now."""
+        blink_period = 500  # 1 second cycle
+        current_time = pygame.time.get_ticks() % blink_period
+        brightness = (math.sin(current_time / blink_period * 2 * math.pi) + 1) / 2  # range 0-1
+        return int(brightness * 192)  # maximum 75% opacity
+
+    def render_owner_name(self):
+        """Render the owner name and its shadow once per owner."""
+        self.cull_radius = self.sprite_radius
+        if self.owner_name:
+            self.name_surface = self.font.render(self.owner_name, True, (255, 255, 255))
+            self.name_shadow = self.font.render(self.owner_name, True, (0, 0, 0))
+
+            # Far corner of the name (the shadow is one pixel further), long names reach past the sprite
+            name_width, name_height = self.name_surface.get_size()
+            self.cull_radius = max(self.sprite_radius, math.hypot(name_width / 2 + 1, NAME_OFFSET_Y + name_height / 2 + 1))
 
     def on_collision(self, arbiter, space, data):
         # Small random rotation on collision
@@ -72,26 +122,23 @@ class Tnt:
                         damage = int(100 * (1 - (distance / explosion_radius)))
                         block.hp -= damage
 
-        explosion = Explosion(self.body.position, self.texture_atlas, self.atlas_items, particle_count=20)
-        explosions.append(explosion)
+        explosion = Explosion(self.body.position, self.textures, particle_count=20)
+        explosions.add(explosion)
 
-    def update(self, tnt_list, explosions, camera):
+    def update(self, tnt_store, explosions, camera):
         if self.detonated:
             self.space.remove(self.body, self.shape)
-            if self in tnt_list:
-                tnt_list.remove(self)
+            tnt_store.remove(self.entity_id)
+            if self.pool is not None:
+                self.pool.release(self)
             return
 
-        # Limit falling speed (terminal velocity)
-        if self.body.velocity.y > 1000:
-            self.body.velocity = (self.body.velocity.x, 1000)
-
         current_time = pygame.time.get_ticks()
         if current_time - self.spawn_time >= 4000:
             self.explode(explosions)
             camera.shake(10, 10)  # Shake camera for 10 frames with intensity 10
 
-    def draw(self, screen, camera):
+    def draw(self, render_queue, camera):
         if self.detonated:
             return
 
@@ -100,44 +147,42 @@ class Tnt:
         rect = rotated_image.get_rect(center=(self.body.position.x, self.body.position.y))
         rect.y -= camera.offset_y
         rect.x -= camera.offset_x
-        screen.blit(rotated_image, rect)
+        render_queue.push("entities", rotated_image, rect)
 
         # Blinking effect: pulsating white overlay
-        blink_period = 500  # 1 second cycle
-        current_time = pygame.time.get_ticks() % blink_period
-        brightness = (math.sin(current_time / blink_period * 2 * math.pi) + 1) / 2  # range 0-1
-        alpha = int(brightness * 192)  # maximum 75% opacity
-
-        white_overlay = pygame.Surface(self.texture.get_size(), pygame.SRCALPHA)
-        white_overlay.fill((255, 255, 255, alpha))
+        self.white_overlay.fill((255, 255, 255, self.blink_alpha()))
 
-        rotated_overlay = pygame.transform.rotate(white_overlay, -math.degrees(self.body.angle))
+        rotated_overlay = pygame.transform.rotate(self.white_overlay, -math.degrees(self.body.angle))
         overlay_rect = rotated_overlay.get_rect(center=(self.body.position.x, self.body.position.y))
         overlay_rect.y -= camera.offset_y
         overlay_rect.x -= camera.offset_x
-        screen.blit(rotated_overlay, overlay_rect)
+        render_queue.push("entities", rotated_overlay, overlay_rect)
 
         # Draw owner name above TNT
         if self.owner_name:
-            text_surface = self.font.render(self.owner_name, True, (255, 255, 255))
-            text_rect = text_surface.get_rect(center=(self.body.position.x - camera.offset_x, self.body.position.y - 55 - camera.offset_y))
-            shadow = self.font.render(self.owner_name, True, (0, 0, 0))
-            shadow_rect = shadow.get_rect(center=(self.body.position.x + 1 - camera.offset_x, self.body.position.y - 54 - camera.offset_y))
-            screen.blit(shadow, shadow_rect)
-            screen.blit(text_surface, text_rect)
+            text_rect = self.name_surface.get_rect(center=(self.body.position.x - camera.offset_x, self.body.position.y - NAME_OFFSET_Y - camera.offset_y))
+            shadow_rect = self.name_shadow.get_rect(center=(self.body.position.x + 1 - camera.offset_x, self.body.position.y - NAME_OFFSET_Y + 1 - camera.offset_y))
+            render_queue.push("entities", self.name_shadow, shadow_rect)
+            render_queue.push("entities", self.name_surface, text_rect)
 
 class MegaTnt(Tnt):
-    def __init__(self, space, x, y, texture_atlas, atlas_items, sound_manager, owner_name=None, velocity=0, rotation=0, mass=100):
-        super().__init__(space, x, y, texture_atlas, atlas_items, sound_manager, owner_name, velocity, rotation, mass)
-        print("Spawning MegaTNT")
+    def __init__(self, space, textures, sound_manager, font, mass=100):
+        super().__init__(space, textures, sound_manager, font, mass)
         self.name = "mega_tnt"
         self.scale_multiplier = 2
 
-        rect = atlas_items["block"]["mega_tnt"]
-        self.texture = pygame.transform.scale_by(texture_atlas.subsurface(rect), self.scale_multiplier)
+        width, height = textures.get("block", "mega_tnt").get_size()
+        self.texture = textures.scaled("block", "mega_tnt", (width * self.scale_multiplier, height * self.scale_multiplier))
+        self.white_overlay = pygame.Surface(self.texture.get_size(), pygame.SRCALPHA)
 
         width, height = self.texture.get_size()
         self.shape.unsafe_set_vertices(pymunk.Poly.create_box(self.body, (width, height)).get_vertices())
+        self.sprite_radius = math.hypot(width, height) / 2
+        self.cull_radius = self.sprite_radius
+
+    def spawn(self, x, y, owner_name=None, velocity=0, rotation=0):
+        super().spawn(x, y, owner_name, velocity, rotation)
+        print("Spawning MegaTNT")
 
     def explode(self, explosions):
         explosion_radius = 3 * BLOCK_SIZE * self.scale_multiplier
@@ -157,26 +202,23 @@ class MegaTnt(Tnt):
                         damage = int(100 * self.scale_multiplier * (1 - (distance / explosion_radius)))
                         block.hp -= damage
 
-        explosion = Explosion(self.body.position, self.texture_atlas, self.atlas_items, particle_count=40)
-        explosions.append(explosion)
+        explosion = Explosion(self.body.position, self.textures, particle_count=40)
+        explosions.add(explosion)
 
-    def update(self, tnt_list, explosions, camera):
+    def update(self, tnt_store, explosions, camera):
         if self.detonated:
             self.space.remove(self.body, self.shape)
-            if self in tnt_list:
-                tnt_list.remove(self)
+            tnt_store.remove(self.entity_id)
+            if self.pool is not None:
+                self.pool.release(self)
             return
 
-        # Limit falling speed (terminal velocity)
-        if self.body.velocity.y > 1000:
-            self.body.velocity = (self.body.velocity.x, 1000)
-
         current_time = pygame.time.get_ticks()
         if current_time - self.spawn_time >= 4000:
             self.explode(explosions)
             camera.shake(15, 30)  # Shake camera for 15 frames with intensity 15
 
-    def draw(self, screen, camera):
+    def draw(self, render_queue, camera):
         if self.detonated:
             return
 
@@ -184,28 +226,62 @@ class MegaTnt(Tnt):
         rect = rotated_image.get_rect(center=(self.body.position.x, self.body.position.y))
         rect.y -= camera.offset_y
         rect.x -= camera.offset_x
-        screen.blit(rotated_image, rect)
+        render_queue.push("entities", rotated_image, rect)
 
         # Blinking effect: pulsating white overlay
-        blink_period = 500
-        current_time = pygame.time.get_ticks() % blink_period
-        brightness = (math.sin(current_time / blink_period * 2 * math.pi) + 1) / 2
-        alpha = int(brightness * 192)
-
-        white_overlay = pygame.Surface(self.texture.get_size(), pygame.SRCALPHA)
-        white_overlay.fill((255, 255, 255, alpha))
+        self.white_overlay.fill((255, 255, 255, self.blink_alpha()))
 
-        rotated_overlay = pygame.transform.rotate(white_overlay, -math.degrees(self.body.angle))
+        rotated_overlay = pygame.transform.rotate(self.white_overlay, -math.degrees(self.body.angle))
         overlay_rect = rotated_overlay.get_rect(center=(self.body.position.x, self.body.position.y))
         overlay_rect.y -= camera.offset_y
         overlay_rect.x -= camera.offset_x
-        screen.blit(rotated_overlay, overlay_rect)
+        render_queue.push("entities", rotated_overlay, overlay_rect)
 
         # Draw owner name above MegaTNT
         if self.owner_name:
-            text_surface = self.font.render(self.owner_name, True, (255, 255, 255))
-            text_rect = text_surface.get_rect(center=(self.body.position.x - camera.offset_x, self.body.position.y - 55 - camera.offset_y))
-            shadow = self.font.render(self.owner_name, True, (0, 0, 0))
-            shadow_rect = shadow.get_rect(center=(self.body.position.x + 1 - camera.offset_x, self.body.position.y - 54 - camera.offset_y))
-            screen.blit(shadow, shadow_rect)
-            screen.blit(text_surface, text_rect)
+            text_rect = self.name_surface.get_rect(center=(self.body.position.x - camera.offset_x, self.body.position.y - NAME_OFFSET_Y - camera.offset_y))
+            shadow_rect = self.name_shadow.get_rect(center=(self.body.position.x + 1 - camera.offset_x, self.body.position.y - NAME_OFFSET_Y + 1 - camera.offset_y))
+            render_queue.push("entities", self.name_shadow, shadow_rect)
+            render_queue.push("entities", self.name_surface, text_rect)
+
+class TntPool:
+    def __init__(self, space, textures, sound_manager, preallocate=None):
+        """
+        Keeps exploded TNTs to spawn them again, so a superchat doesn't build bodies, shapes and fonts mid frame.
+
+        :param preallocate: Dict of TNT class -> how many to build up front.
+        """
+        self.space = space
+        self.textures = textures
+        self.sound_manager = sound_manager
+        self.font = pygame.font.Font(None, 70)  # Loaded once for every TNT
+        self.free = {Tnt: [], MegaTnt: []}
+        self.sizes = {}  # TNT class -> hitbox (width, height)
+        self.created = 0
+
+        for tnt_class, amount in (preallocate or {}).items():
+            for _ in range(amount):
+                self.free[tnt_class].append(self.create(tnt_class))
+
+    def create(self, tnt_class):
+        tnt = tnt_class(self.space, self.textures, self.sound_manager, self.font)
+        tnt.pool = self
+        self.sizes[tnt_class] = tnt.texture.get_size()
+        self.created += 1
+        return tnt
+
+    def size(self, tnt_class):
+        """Hitbox size of a TNT class, building a spare TNT if none was built yet."""
+        if tnt_class not in self.sizes:
+            self.free[tnt_class].append(self.create(tnt_class))
+        return self.sizes[tnt_class]
+
+    def spawn(self, tnt_class, x, y, owner_name=None):
+        """Spawn a recycled TNT of the given class, building a new one only when none are free."""
+        free = self.free[tnt_class]
+        tnt = free.pop() if free else self.create(tnt_class)
+        tnt.spawn(x, y, owner_name)
+        return tnt
+
+    def release(self, tnt):
+        self.free[type(tnt)].append(tnt)
@@ -0,0 +1,85 @@
+import pygame
+from constants import BLOCK_SIZE, CHUNK_HEIGHT, CHUNK_PIXEL_WIDTH, CHUNK_PIXEL_HEIGHT
+
+KINDS = ("block", "tnt", "particle")
+
+class Visibility:
+    def __init__(self, simulation_margin=CHUNK_PIXEL_HEIGHT):
+        """
+        Decides what is on screen this frame and counts what was drawn or skipped.
+
+        :param simulation_margin: Pixels above and below the view where chunks are still generated and updated.
+        """
+        self.simulation_margin = simulation_margin
+        self.view = pygame.Rect(0, 0, 0, 0)
+        self.drawn = dict.fromkeys(KINDS, 0)
+        self.skipped = dict.fromkeys(KINDS, 0)
+
+        # Totals since the last metrics record
+        self.frames = 0
+        self.drawn_total = dict.fromkeys(KINDS, 0)
+        self.skipped_total = dict.fromkeys(KINDS, 0)
+
+    def update(self, camera):
+        """Start a frame, the camera must already be moved for this frame."""
+        for kind in KINDS:
+            self.drawn_total[kind] += self.drawn[kind]
+            self.skipped_total[kind] += self.skipped[kind]
+            self.drawn[kind] = 0
+            self.skipped[kind] = 0
+        self.frames += 1
+
+        self.view = camera.visible_rect()
+
+    def chunk_range(self):
+        """Chunk rows to simulate, start inclusive, end exclusive."""
+        start_chunk_y = (self.view.top - self.simulation_margin) // CHUNK_PIXEL_HEIGHT
+        end_chunk_y = (self.view.bottom + self.simulation_margin) // CHUNK_PIXEL_HEIGHT + 1
+        return start_chunk_y, end_chunk_y
+
+    def visible_rows(self, chunk_x, chunk_y):
+        """Block rows of a chunk that overlap the view, an empty range when none do."""
+        left = chunk_x * CHUNK_PIXEL_WIDTH
+        if left >= self.view.right or left + CHUNK_PIXEL_WIDTH <= self.view.left:
+            return range(0)
+
+        top = chunk_y * CHUNK_PIXEL_HEIGHT
+        first_row = max(0, (self.view.top - top) // BLOCK_SIZE)
+        end_row = min(CHUNK_HEIGHT, (self.view.bottom - top - 1) // BLOCK_SIZE + 1)
+        return range(first_row, max(first_row, end_row))
+
+    def count(self, kind, drawn, skipped=0):
+        self.drawn[kind] += drawn
+        self.skipped[kind] += skipped
+
+    def circle_visible(self, kind, x, y, radius):
+        """Whether something within radius of (x, y) may be on screen, counted as drawn or skipped."""
+        visible = (x + radius > self.view.left and x - radius < self.view.right and
+                   y + radius > self.view.top and y - radius < self.view.bottom)
+        if visible:
+            self.drawn[kind] += 1
+        else:
+            self.skipped[kind] += 1
+        return visible
+
+    def rect_visible(self, kind, x, y, width, height):
+        """Whether the rect with top left corner (x, y) is on screen, counted as drawn or skipped."""
+        visible = (x + width > self.view.left and x < self.view.right and
+                   y + height > self.view.top and y < self.view.bottom)
+        if visible:
+            self.drawn[kind] += 1
+        else:
+            self.skipped[kind] += 1
+        return visible
+
+    def take_interval(self):
+        """Average drawn and skipped per frame since the previous call, for the metrics log."""
+        frames = max(1, self.frames)
+        interval = {
+            "drawn_per_frame": {kind: round(self.drawn_total[kind] / frames, 1) for kind in KINDS},
+            "skipped_per_frame": {kind: round(self.skipped_total[kind] / frames, 1) for kind in KINDS},
+        }
+        self.frames = 0
+        self.drawn_total = dict.fromkeys(KINDS, 0)
+        self.skipped_total = dict.fromkeys(KINDS, 0)
+        return interval
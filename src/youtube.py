@@ -1,12 +1,31 @@
-from googleapiclient.discovery import build
 from config import config
 from datetime import datetime
 from pathlib import Path
 from dateutil import parser
+from quota import QuotaBudget, COST_SEARCH, COST_VIDEOS_LIST, COST_CHANNELS_LIST, COST_LIVE_CHAT_MESSAGES_LIST
 import os
 
-# Initialize YouTube API client
-youtube = build("youtube", "v3", developerKey=config["API_KEY"])
+class LazyYoutubeClient:
+    """Builds the YouTube API client on first use, so importing this module stays cheap."""
+
+    def __init__(self):
+        self.client = None
+
+    def __getattr__(self, name):
+        if self.client is None:
+            if config["YOUTUBE_API_STUB"]:
+                from youtube_stub import StubYoutube
+                self.client = StubYoutube()
+            else:
+                from googleapiclient.discovery import build
+                self.client = build("youtube", "v3", developerKey=config["API_KEY"])
+        return getattr(self.client, name)
+
+# YouTube API client, built on first call
+youtube = LazyYoutubeClient()
+
+# Quota units spent today, kept across restarts
+quota = QuotaBudget(config["YT_DAILY_QUOTA"], Path(__file__).parent.parent / "logs" / "quota.json")
 
 # This consumes a lot of quota (100 units per call)
 def get_live_streams(channel_id):
@@ -18,6 +37,7 @@ def get_live_streams(channel_id):
         type="video"
     )
     response = request.execute()
+    quota.spend(COST_SEARCH)
 
     live_streams = []
     for item in response.get("items", []):
@@ -34,6 +54,7 @@ def get_live_stream(livestream_id):
         id=livestream_id
     )
     response = request.execute()
+    quota.spend(COST_VIDEOS_LIST)
 
     if response.get("items"):
         return response["items"][0]
@@ -45,7 +66,8 @@ def get_live_chat_id(live_stream_id):
         part="liveStreamingDetails",
         id=live_stream_id
     ).execute()
-    
+    quota.spend(COST_VIDEOS_LIST)
+
     return response["items"][0]["liveStreamingDetails"]["activeLiveChatId"]
 
 def get_live_chat_messages(live_chat_id):
@@ -53,7 +75,8 @@ def get_live_chat_messages(live_chat_id):
         liveChatId=live_chat_id,
         part="snippet,authorDetails"
     ).execute()
-    
+    quota.spend(COST_LIVE_CHAT_MESSAGES_LIST, "chat")
+
     for item in response["items"]:
         author = item["authorDetails"]["displayName"]
         message = item["snippet"]["displayMessage"]
@@ -68,6 +91,7 @@ def get_new_live_chat_messages(live_chat_id):
         liveChatId=live_chat_id,
         part="snippet,authorDetails"
     ).execute()
+    quota.spend(COST_LIVE_CHAT_MESSAGES_LIST, "chat")
 
     # Define log directory
     log_dir = Path(__file__).parent.parent / "logs"
@@ -108,7 +132,8 @@ def get_new_live_chat_messages(live_chat_id):
                 "author": author,
                 "message": message,
                 "sc_details": item["snippet"].get("superChatDetails", None),
-                "ss_details": item["snippet"].get("superStickerDetails", None)
+                "ss_details": item["snippet"].get("superStickerDetails", None),
+                "is_member": item["authorDetails"].get("isChatSponsor", False)
             })
 
     return messages
@@ -120,8 +145,36 @@ def get_subscriber_count(channel_id):
         id=channel_id
     )
     response = request.execute()
+    quota.spend(COST_CHANNELS_LIST, "subscribers")
 
     if response["items"]:
         return int(response["items"][0]["statistics"]["subscriberCount"])
     else:
-        return None
\ No newline at end of file
+        return None
+
+def get_subscriber_count_if_changed(channel_id, etag=None):
+    """
+    Conditional version of get_subscriber_count.
+
+    :return: (count, etag). count is None when the API answered 304 Not Modified for the given etag.
+    """
+    request = youtube.channels().list(
+        part="statistics",
+        id=channel_id
+    )
+    if etag is not None:
+        request.headers["If-None-Match"] = etag
+
+    try:
+        response = request.execute()
+    except Exception as e:
+        if getattr(getattr(e, "resp", None), "status", None) == 304:
+            quota.spend(COST_CHANNELS_LIST, "subscribers")
+            return None, etag
+        raise
+    quota.spend(COST_CHANNELS_LIST, "subscribers")
+
+    if response["items"]:
+        return int(response["items"][0]["statistics"]["subscriberCount"]), response.get("etag")
+    else:
+        return None, response.get("etag")
\ No newline at end of file
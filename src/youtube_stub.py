@@ -0,0 +1,110 @@
+import random
+import time
+from datetime import datetime, timezone
+
+# Offline stand-in for the googleapiclient YouTube resource, enabled with "YOUTUBE_API_STUB": true.
+# Only the calls made by youtube.py are implemented.
+
+STUB_LIVE_CHAT_ID = "stub-live-chat"
+
+STUB_AUTHORS = ["Steve", "Alex", "Notch", "Herobrine", "Creeper", "Enderman", "Villager", "Zombie"]
+STUB_MESSAGES = ["tnt", "fast", "slow", "big", "wood", "stone", "iron", "gold", "diamond", "netherite", "hello", "gg"]
+
+class StubResponse:
+    def __init__(self, status):
+        self.status = status
+
+class StubHttpError(Exception):
+    """Mimics googleapiclient.errors.HttpError closely enough for status checks."""
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = StubResponse(status)
+
+class StubRequest:
+    def __init__(self, handler, kwargs):
+        self.handler = handler
+        self.kwargs = kwargs
+        self.headers = {}
+
+    def execute(self):
+        return self.handler(self.headers, **self.kwargs)
+
+class StubResource:
+    def __init__(self, handler):
+        self.handler = handler
+
+    def list(self, **kwargs):
+        return StubRequest(self.handler, kwargs)
+
+class StubYoutube:
+    def __init__(self, subscribers=1000, subscribers_per_minute=0.5, messages_per_second=0.5, superchat_chance=0.02, member_chance=0.1):
+        self.subscribers = subscribers
+        self.subscribers_per_minute = subscribers_per_minute
+        self.messages_per_second = messages_per_second
+        self.superchat_chance = superchat_chance
+        self.member_chance = member_chance
+
+        self.last_subscribers_check = time.monotonic()
+        self.last_chat_check = time.monotonic()
+        self.message_id = 0
+
+    def search(self):
+        return StubResource(self._search_list)
+
+    def videos(self):
+        return StubResource(self._videos_list)
+
+    def channels(self):
+        return StubResource(self._channels_list)
+
+    def liveChatMessages(self):
+        return StubResource(self._live_chat_messages_list)
+
+    def _search_list(self, headers, **kwargs):
+        return {"items": [{"id": {"videoId": "stub-video"}, "snippet": {"title": "Stub live stream"}}]}
+
+    def _videos_list(self, headers, id, **kwargs):
+        return {"items": [{
+            "id": id,
+            "snippet": {"title": "Stub live stream"},
+            "liveStreamingDetails": {"activeLiveChatId": STUB_LIVE_CHAT_ID},
+        }]}
+
+    def _channels_list(self, headers, **kwargs):
+        now = time.monotonic()
+        minutes = (now - self.last_subscribers_check) / 60
+        self.last_subscribers_check = now
+        if random.random() < minutes * self.subscribers_per_minute:
+            self.subscribers += 1
+
+        etag = f'"subscribers-{self.subscribers}"'
+        if headers.get("If-None-Match") == etag:
+            raise StubHttpError(304)
+
+        return {"etag": etag, "items": [{"statistics": {"subscriberCount": str(self.subscribers)}}]}
+
+    def _live_chat_messages_list(self, headers, **kwargs):
+        now = time.monotonic()
+        count = int((now - self.last_chat_check) * self.messages_per_second + random.random())
+        self.last_chat_check = now
+
+        items = []
+        for _ in range(count):
+            self.message_id += 1
+            snippet = {
+                "displayMessage": random.choice(STUB_MESSAGES),
+                "publishedAt": datetime.now(timezone.utc).isoformat(),
+            }
+            if random.random() < self.superchat_chance:
+                snippet["superChatDetails"] = {"amountDisplayString": "$5.00"}
+
+            items.append({
+                "id": f"stub-message-{self.message_id}",
+                "snippet": snippet,
+                "authorDetails": {
+                    "displayName": random.choice(STUB_AUTHORS),
+                    "isChatSponsor": random.random() < self.member_chance,
+                },
+            })
+
+        return {"items": items}
@@ -0,0 +1,24 @@
+import threading
+import time
+import snapshot
+from snapshot import SnapshotWriter
+
+def test_flush_wins_over_slow_background_write(tmp_path, monkeypatch):
+    background_started = threading.Event()
+
+    def pack_snapshot(state):
+        if state == "old":
+            background_started.set()
+            time.sleep(0.3)  # Still writing when the game closes
+        return state.encode()
+
+    monkeypatch.setattr(snapshot, "pack_snapshot", pack_snapshot)
+    path = tmp_path / "snapshot.bin"
+    writer = SnapshotWriter(str(path))
+
+    writer.save("old")
+    assert background_started.wait(1)
+    writer.flush("final")
+
+    time.sleep(0.5)  # Give a late background replace the chance to land
+    assert path.read_bytes() == b"final"
@@ -0,0 +1,46 @@
+import pymunk
+from constants import BLOCK_SIZE, CHUNK_WIDTH
+from spawn_placement import SpawnPlacer
+
+class FakePool:
+    def size(self, tnt_class):
+        return (BLOCK_SIZE, BLOCK_SIZE)
+
+    def spawn(self, tnt_class, x, y, owner_name=None):
+        return (x, y, owner_name)
+
+class FakeStore(list):
+    def add(self, entity):
+        self.append(entity)
+
+def packed_space():
+    """A space whose shaft is filled with one static box, so no spawn spot is ever free."""
+    space = pymunk.Space()
+    box = pymunk.Poly.create_box(space.static_body, (CHUNK_WIDTH * BLOCK_SIZE * 2, BLOCK_SIZE * 20))
+    space.add(box)
+    return space
+
+def test_pending_spawns_are_capped():
+    store = FakeStore()
+    placer = SpawnPlacer(packed_space(), FakePool(), store, max_pending=8)
+
+    # Superchat bursts keep coming while nothing can be placed
+    for _ in range(5):
+        for _ in range(10):
+            placer.request(object, "viewer")
+        placer.update(0, 0)
+
+    assert len(placer.pending) == 8
+    assert placer.dropped == 42
+    assert not store
+
+def test_pending_spawns_are_placed_when_there_is_room():
+    store = FakeStore()
+    placer = SpawnPlacer(pymunk.Space(), FakePool(), store, spawns_per_frame=5, max_pending=8)
+
+    for _ in range(8):
+        assert placer.request(object)
+    placer.update(CHUNK_WIDTH * BLOCK_SIZE / 2, 0)
+
+    assert len(store) == 5
+    assert len(placer.pending) == 3